@@ -5,7 +5,11 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from api.core.config import get_settings
 from api.core.logger import user_var
+from api.core.password_verifier import get_password_verifier
+from api.core.revocation import TokenDenyList
+from api.core.token_cache import VerifiedTokenCache
 import logging
+import threading
 import uuid
 
 from api.domain.auth.schemas import TokenData, User, UserInDB
@@ -49,6 +53,13 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
+BCRYPT_HASH_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+def _is_bcrypt_hash(value: str) -> bool:
+    return value.startswith(BCRYPT_HASH_PREFIXES) and len(value) == 60
+
+
 def _parse_users_from_env() -> dict:
     users_db = {}
     
@@ -71,16 +82,22 @@ def _parse_users_from_env() -> dict:
                 
                 username, password, full_name, email = parts[0], parts[1], parts[2], parts[3]
                 
-                hashed_password = get_password_hash(password)
-                
-                users_db[username] = {
+                user = {
                     "username": username,
                     "full_name": full_name,
                     "email": email,
-                    "hashed_password": hashed_password,
                     "disabled": False,
                 }
                 
+                # Senhas já em hash bcrypt são usadas diretamente; senhas em texto
+                # puro só são convertidas no primeiro uso (ver UserStore.get).
+                if _is_bcrypt_hash(password):
+                    user["hashed_password"] = password
+                else:
+                    user["plain_password"] = password
+                
+                users_db[username] = user
+                
                 logger.info(f"Usuário '{username}' carregado das variáveis de ambiente")
                 
             except Exception as e:
@@ -118,7 +135,62 @@ def _get_default_users() -> dict:
     }
 
 
-fake_users_db = _parse_users_from_env()
+class UserStore:
+    """Store de usuários carregado sob demanda, sem custo de bcrypt na importação."""
+
+    def __init__(self, loader=_parse_users_from_env):
+        self._loader = loader
+        self._users: Optional[dict] = None
+        self._models: dict = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._users is None:
+            with self._lock:
+                if self._users is None:
+                    self._users = self._loader()
+        return self._users
+
+    def get(self, username: str) -> Optional[dict]:
+        user_dict = self._load().get(username)
+        if user_dict is None or "hashed_password" in user_dict:
+            return user_dict
+
+        with self._lock:
+            if "plain_password" in user_dict:
+                user_dict["hashed_password"] = get_password_hash(user_dict.pop("plain_password"))
+        return user_dict
+
+    def get_model(self, username: str) -> Optional[UserInDB]:
+        # Instâncias imutáveis (UserInDB é frozen), construídas uma única vez por usuário.
+        user = self._models.get(username)
+        if user is None:
+            user_dict = self.get(username)
+            if user_dict is None:
+                return None
+            user = self._models.setdefault(username, UserInDB(**user_dict))
+        return user
+
+    def needs_hashing(self, username: str) -> bool:
+        user_dict = self._load().get(username)
+        return user_dict is not None and "hashed_password" not in user_dict
+
+    def reset(self) -> None:
+        with self._lock:
+            self._users = None
+            self._models = {}
+        token_cache.clear()
+
+
+users_store = UserStore()
+token_cache = VerifiedTokenCache(
+    max_entries=settings.token_cache_max_entries,
+    ttl_seconds=settings.token_cache_ttl_seconds,
+)
+deny_list = TokenDenyList(
+    max_entries=settings.token_denylist_max_entries,
+    error_rate=settings.token_denylist_error_rate,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -162,8 +234,14 @@ def get_password_hash(password: str) -> str:
         password = password_bytes[:72].decode('utf-8', errors='ignore')
     
     if USE_PASSLIB and pwd_context:
-        return pwd_context.hash(password)
-    elif USE_BCRYPT_DIRECT and bcrypt:
+        try:
+            return pwd_context.hash(password)
+        except Exception as e:
+            logger.warning(f"Passlib falhou, tentando bcrypt diretamente: {e}")
+            if not (USE_BCRYPT_DIRECT and bcrypt):
+                raise
+    
+    if USE_BCRYPT_DIRECT and bcrypt:
         salt = bcrypt.gensalt()
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
@@ -172,10 +250,7 @@ def get_password_hash(password: str) -> str:
 
 
 def get_user(username: str) -> Optional[UserInDB]:
-    if username in fake_users_db:
-        user_dict = fake_users_db[username]
-        return UserInDB(**user_dict)
-    return None
+    return users_store.get_model(username)
 
 
 def authenticate_user(username: str, password: str) -> Optional[UserInDB]:
@@ -187,6 +262,20 @@ def authenticate_user(username: str, password: str) -> Optional[UserInDB]:
     return user
 
 
+async def authenticate_user_async(username: str, password: str) -> Optional[UserInDB]:
+    verifier = get_password_verifier()
+
+    if users_store.needs_hashing(username):
+        user = await verifier.run(lambda: get_user(username))
+    else:
+        user = get_user(username)
+    if not user:
+        return None
+    if not await verifier.verify(username, password, user.hashed_password, verify_password):
+        return None
+    return user
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     
@@ -227,39 +316,60 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
-    credentials_exception = HTTPException(
+def revoke_token_payload(payload: dict) -> None:
+    deny_list.revoke(payload.get("jti"), payload.get("exp"))
+
+
+def is_token_revoked(payload: dict) -> bool:
+    return deny_list.is_revoked(payload.get("jti"))
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def user_from_token(token: str) -> User:
+    """Valida um access token (cache, assinatura, tipo e revogação) e retorna o usuário; 401 se inválido."""
+    cached = token_cache.get(token)
+    if cached is not None:
+        if deny_list.is_revoked(cached.jti):
+            raise _credentials_exception()
+        user_var.set(cached.user.username)
+        return cached.user
     
     try:
         payload = decode_token(token)
         token_type = payload.get("type")
         if token_type != "access":
-            raise credentials_exception
+            raise _credentials_exception()
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise _credentials_exception()
+        if is_token_revoked(payload):
+            raise _credentials_exception()
         token_data = TokenData(username=username)
     except JWTError as e:
         logger.error(f"JWT Error: {e}")
-        raise credentials_exception
-    
-    user = get_user(username=token_data.username)
-    if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     user = get_user(username=token_data.username)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
+    token_cache.put(token, user, exp=payload.get("exp"), jti=payload.get("jti"))
     user_var.set(user.username)
 
     return user
 
 
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+    return user_from_token(token)
+
+
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if current_user.disabled:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -0,0 +1,273 @@
+import gzip
+import hashlib
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.core.config import get_settings
+from api.core.metrics import timed_stage
+
+try:
+    import brotli
+    USE_BROTLI = True
+except ImportError:
+    brotli = None
+    USE_BROTLI = False
+
+try:
+    import zstandard
+    USE_ZSTD = True
+except ImportError:
+    zstandard = None
+    USE_ZSTD = False
+
+# Ordem de preferência quando o cliente aceita mais de uma com o mesmo q.
+ENCODINGS = tuple(
+    name for name, available in (("zstd", USE_ZSTD), ("br", USE_BROTLI), ("gzip", True)) if available
+)
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+# Corpos maiores que isso são comprimidos fora do event loop.
+THREADPOOL_MIN_BYTES = 1024 * 1024
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Melhor codificação suportada para o ``Accept-Encoding``; ``None`` para enviar sem compressão."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Comprime respostas com gzip, brotli ou zstd conforme o ``Accept-Encoding``.
+
+    Só respostas entregues em uma única mensagem são comprimidas; streaming e
+    respostas que já trazem ``Content-Encoding`` (ver ``snapshot_response``)
+    passam direto.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None, levels: Optional[Dict[str, int]] = None):
+        settings = get_settings()
+        self.app = app
+        self.minimum_size = settings.compression_minimum_size if minimum_size is None else minimum_size
+        self.levels = levels or settings.compression_levels
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Os headers só saem junto com o corpo, quando já se sabe se vai comprimir.
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            if message.get("more_body") or len(body) < self.minimum_size or not _is_compressible(headers):
+                await send(start)
+                start = None
+                await send(message)
+                return
+
+            level = self.levels.get(encoding, 6)
+            with timed_stage(f"compress_{encoding}"):
+                if len(body) >= THREADPOOL_MIN_BYTES:
+                    body = await run_in_threadpool(compress, body, encoding, level)
+                else:
+                    body = compress(body, encoding, level)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            start = None
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class SnapshotPayload:
+    """Corpo JSON de uma resposta constante por versão dos dados, com as variantes comprimidas."""
+
+    def __init__(self, version: Any, body: bytes):
+        self.version = version
+        self.body = body
+        self.etag = f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def has_encoding(self, encoding: Optional[str]) -> bool:
+        return encoding is None or encoding in self._encoded
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.body
+        body = self._encoded.get(encoding)
+        if body is None:
+            with self._lock:
+                body = self._encoded.get(encoding)
+                if body is None:
+                    level = get_settings().compression_static_levels.get(encoding, 9)
+                    with timed_stage(f"precompress_{encoding}"):
+                        body = self._encoded[encoding] = compress(self.body, encoding, level)
+        return body
+
+
+class SnapshotChanged(Exception):
+    """Os dados foram recarregados enquanto o corpo era montado."""
+
+
+class SnapshotPayloadCache:
+    def __init__(self):
+        self._entries: Dict[str, SnapshotPayload] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def peek(self, key: str, version: Any) -> Optional[SnapshotPayload]:
+        payload = self._entries.get(key)
+        return payload if payload is not None and payload.version == version else None
+
+    def get(self, key: str, version: Any, build: Callable[[], bytes]) -> SnapshotPayload:
+        payload = self.peek(key, version)
+        if payload is not None:
+            return payload
+
+        # Lock por chave: montar um export grande não segura as demais rotas.
+        with self._lock_for(key):
+            payload = self._entries.get(key)
+            if payload is None or payload.version != version:
+                payload = self._entries[key] = SnapshotPayload(version, build())
+        return payload
+
+
+_payload_cache = SnapshotPayloadCache()
+
+
+def get_payload_cache() -> SnapshotPayloadCache:
+    return _payload_cache
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def _encode(model: Any, content: Any) -> bytes:
+    adapter = _adapter(model)
+    with timed_stage("response_validation"):
+        value = adapter.validate_python(content)
+    with timed_stage("model_dump"):
+        return adapter.dump_json(value)
+
+
+# Tentativas de montar um corpo sem que um reload aconteça no meio.
+PAYLOAD_BUILD_ATTEMPTS = 3
+
+
+def _snapshot_payload(key: str, db: Any, model: Any, produce: Callable[[], Any]) -> SnapshotPayload:
+    cache = get_payload_cache()
+    for _ in range(PAYLOAD_BUILD_ATTEMPTS):
+        version = db.data_version
+
+        def build() -> bytes:
+            body = _encode(model, produce())
+            # Versão igual antes e depois: nenhum reload no meio, os bytes são dessa versão.
+            if db.data_version != version:
+                raise SnapshotChanged()
+            return body
+
+        try:
+            return cache.get(key, version, build)
+        except SnapshotChanged:
+            continue
+    # Reloads em sequência: responde sem guardar no cache.
+    return SnapshotPayload(db.data_version, _encode(model, produce()))
+
+
+async def snapshot_response(
+    request: Request, key: str, db: Any, model: Any, produce: Callable[[], Any]
+) -> Response:
+    """Resposta de uma rota cujo conteúdo só muda com um novo snapshot dos dados.
+
+    Serialização e compressão acontecem uma vez por versão (e por codificação),
+    fora do event loop; as requisições seguintes só escolhem os bytes prontos.
+    O ETag permite ao cliente revalidar com ``If-None-Match`` sem receber o
+    corpo de novo. ``db`` expõe ``data_version``, conferida antes e depois de
+    ``produce`` para que a versão do cache e os dados sejam do mesmo snapshot.
+    """
+    payload = get_payload_cache().peek(key, db.data_version)
+    if payload is None:
+        payload = await run_in_threadpool(_snapshot_payload, key, db, model, produce)
+    headers = {"ETag": payload.etag, "Vary": "Accept-Encoding"}
+
+    if payload.etag in {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}:
+        return Response(status_code=304, headers=headers)
+
+    settings = get_settings()
+    encoding = None
+    if settings.compression_enabled and len(payload.body) >= settings.compression_minimum_size:
+        encoding = negotiate(request.headers.get("accept-encoding", ""))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    if payload.has_encoding(encoding):
+        body = payload.encoded(encoding)
+    else:
+        body = await run_in_threadpool(payload.encoded, encoding)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -14,10 +15,80 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
     
+    password_verify_workers: int = 2
+    password_verify_max_queue: int = 32
+    password_cache_ttl_seconds: float = 60.0
+    password_cache_max_entries: int = 1024
+    token_cache_max_entries: int = 4096
+    token_cache_ttl_seconds: float = 300.0
+    token_denylist_max_entries: int = 100_000
+    token_denylist_error_rate: float = 0.001
+    
+    rate_limit_enabled: bool = True
+    rate_limit_requests: int = 120
+    rate_limit_window_seconds: float = 60.0
+    rate_limit_route_costs: Dict[str, int] = {
+        "/ml/training-data": 10,
+        "/auth/login": 5,
+        "/books/search": 3,
+        "/books/search/batch": 10,
+        "/books/batch": 3,
+        "/ml/more-like-this": 3,
+    }
+    rate_limit_exempt_paths: List[str] = ["/health", "/metrics", "/docs", "/redoc", "/openapi.json"]
+    # Proxies reversos confiáveis à frente da API; 0 usa o IP do socket e ignora X-Forwarded-For.
+    rate_limit_trusted_proxy_hops: int = 0
+    rate_limit_max_keys: int = 100_000
+    rate_limit_redis_url: Optional[str] = None
+    
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_levels: Dict[str, int] = {"gzip": 6, "br": 4, "zstd": 3}
+    # Respostas pré-comprimidas pagam a compressão uma vez por versão dos dados.
+    compression_static_levels: Dict[str, int] = {"gzip": 9, "br": 9, "zstd": 12}
+    
     auth_users: str = "admin:secret:Admin User:admin@booksapi.com,testuser:secret:Test User:test@booksapi.com"
     
     data_path: str = "data/books.csv"
+    # Intervalo para detectar DATA_PATH trocado por outro worker (ex.: scraping); 0 desativa.
+    data_watch_interval_seconds: float = 5.0
+    batch_max_ids: int = 1000
+    batch_max_queries: int = 50
+    similar_books_weights: Dict[str, float] = {"title": 0.6, "category": 0.2, "price": 0.1, "rating": 0.1}
+    # A partir desse tamanho de catálogo as recomendações usam o índice aproximado (IVF).
+    similar_books_ann_min_rows: int = 100_000
+    similar_books_ann_probes: int = 16
+    more_like_this_max_books: int = 50
     scraping_url: str = "https://books.toscrape.com"
+    scraping_worker_niceness: int = 10
+    scraping_job_history: int = 20
+    scraping_cancel_grace_seconds: float = 10.0
+    facet_price_buckets: List[float] = [10.0, 20.0, 30.0, 40.0, 50.0]
+    
+    log_queue_size: int = 10_000
+    log_batch_size: int = 256
+    log_rotate_max_bytes: int = 50 * 1024 * 1024
+    log_rotate_interval_hours: float = 24.0
+    log_backup_count: int = 7
+    access_log_sample_rate: float = 1.0
+    access_log_route_sample_rates: Dict[str, float] = {"/health": 0.01, "/metrics": 0.0}
+    access_log_status_sample_rates: Dict[str, float] = {"4xx": 1.0}
+    access_log_slow_ms: float = 1000.0
+    
+    profiling_header_enabled: bool = False
+    profiling_interval_ms: float = 5.0
+    profiling_max_seconds: int = 60
+    profiling_store_max_entries: int = 50
+    
+    tracing_enabled: bool = False
+    tracing_exporter: str = "file"
+    tracing_file_path: str = "logs/traces.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318"
+    tracing_service_name: str = "books-api"
+    tracing_sample_rate: float = 1.0
+    tracing_queue_size: int = 10_000
+    tracing_batch_size: int = 512
+    tracing_flush_interval_seconds: float = 1.0
     
     environment: str = "development"
     
@@ -6,6 +6,7 @@ from api.domain.categories.service import CategoriesService
 from api.domain.ml.service import MLService
 from api.domain.scraping.service import ScrapingService
 from api.domain.stats.service import StatsService
+from api.infra.scraping.jobs import ScrapeJobManager, get_job_manager
 from api.infra.storage.database import BooksDatabase, get_database
 
 
@@ -31,10 +32,15 @@ def get_ml_service(
     return MLService(db)
 
 
+def get_scrape_job_manager() -> ScrapeJobManager:
+    return get_job_manager()
+
+
 def get_scraping_service(
     db: BooksDatabase = Depends(get_books_database),
+    jobs: ScrapeJobManager = Depends(get_scrape_job_manager),
 ) -> ScrapingService:
-    return ScrapingService(db)
+    return ScrapingService(db, jobs)
 
 
 def get_auth_service() -> AuthService:
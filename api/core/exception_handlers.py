@@ -7,6 +7,7 @@ from api.domain.common.exceptions import (
     DataNotAvailableError,
     NotFoundError,
     InvalidInputError,
+    ServiceBusyError,
     AuthError,
     ForbiddenError,
 )
@@ -27,6 +28,14 @@ def register_exception_handlers(app: FastAPI) -> None:
     async def handle_invalid_input(_: Request, exc: InvalidInputError):
         return JSONResponse(status_code=400, content={"error": "invalid_input", "message": str(exc)})
 
+    @app.exception_handler(ServiceBusyError)
+    async def handle_service_busy(_: Request, exc: ServiceBusyError):
+        return JSONResponse(
+            status_code=503,
+            content={"error": "service_busy", "message": str(exc)},
+            headers={"Retry-After": "1"},
+        )
+
     @app.exception_handler(ForbiddenError)
     async def handle_forbidden(_: Request, exc: ForbiddenError):
         return JSONResponse(status_code=403, content={"error": "forbidden", "message": str(exc)})
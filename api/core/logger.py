@@ -1,26 +1,45 @@
+import atexit
 import contextvars
+import copy
 import logging
+import queue
+import random
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, RotatingFileHandler
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from pythonjsonlogger import jsonlogger
 from datetime import datetime
 
+from prometheus_client import Counter, Gauge
+
+from api.core.config import get_settings
+from api.core.paths import matches_route, strip_prefix
+
 
 request_id_var = contextvars.ContextVar("request_id", default=None)
 user_var = contextvars.ContextVar("user", default=None)
 
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "Log records dropped because the logging queue was full", ["level"]
+)
+LOG_QUEUE_DEPTH = Gauge("log_queue_depth", "Log records waiting to be written")
+
+
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
     def add_fields(self, log_record, record, message_dict):
         super(CustomJsonFormatter, self).add_fields(log_record, record, message_dict)
-        
+
         if not log_record.get('timestamp'):
-            log_record['timestamp'] = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-        
+            log_record['timestamp'] = datetime.utcfromtimestamp(record.created).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
         if log_record.get('level'):
             log_record['level'] = log_record['level'].upper()
         else:
             log_record['level'] = record.levelname
-    
+
 
 class ContextFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
@@ -29,41 +48,224 @@ class ContextFilter(logging.Filter):
         return True
 
 
+class BoundedQueueHandler(QueueHandler):
+    """Enfileira registros sem bloquear; com a fila cheia o registro é descartado e contado."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(level=record.levelname).inc()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Só resolve a mensagem e o traceback; a formatação fica para o listener.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class BatchingQueueListener:
+    """Thread própria que drena a fila em lotes e faz um único flush por handler a cada lote."""
+
+    _sentinel = object()
+
+    def __init__(self, log_queue, *handlers, batch_size: int = 256, respect_handler_level: bool = True):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.respect_handler_level = respect_handler_level
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            # put bloqueante: com a fila cheia, o sentinela entra assim que o listener abrir espaço.
+            self.queue.put(self._sentinel)
+            thread.join()
+
+    def handle(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if not self.respect_handler_level or record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _next_batch(self) -> list:
+        batch = [self.queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            stop = False
+            for record in self._next_batch():
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+
+            for handler in self.handlers:
+                handler.flush()
+            if stop:
+                return
+
+
+class BatchedStreamHandler(logging.StreamHandler):
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """Rotaciona ao atingir ``maxBytes`` ou a cada ``interval_seconds``, o que vier primeiro."""
+
+    def __init__(self, filename, max_bytes: int, interval_seconds: float, backup_count: int, encoding: str = "utf-8"):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.interval_seconds = interval_seconds
+        path = Path(self.baseFilename)
+        started = path.stat().st_mtime if path.exists() else time.time()
+        self.rollover_at = started + interval_seconds
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.interval_seconds > 0 and time.time() >= self.rollover_at:
+            return True
+        # Usa o tamanho já escrito em vez de formatar o registro duas vezes.
+        return bool(self.maxBytes and self.stream is not None and self.stream.tell() >= self.maxBytes)
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self.rollover_at = time.time() + self.interval_seconds
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class AccessLogSampler:
+    """Decide quais requisições entram no access log.
+
+    Erros 5xx e requisições lentas são sempre registrados; as demais são
+    amostradas pela taxa da rota (se configurada) ou da classe de status.
+    """
+
+    def __init__(
+        self,
+        default_rate: float = 1.0,
+        route_rates: Optional[Dict[str, float]] = None,
+        status_rates: Optional[Dict[str, float]] = None,
+        slow_ms: float = 1000.0,
+        path_prefix: str = "",
+    ):
+        self.default_rate = default_rate
+        self.route_rates: List[Tuple[str, float]] = sorted(
+            (route_rates or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.status_rates = status_rates or {}
+        self.slow_ms = slow_ms
+        self.path_prefix = path_prefix
+
+    def rate_for(self, path: str, status_code: int, duration_ms: float) -> float:
+        if status_code >= 500 or duration_ms >= self.slow_ms:
+            return 1.0
+        status_class = f"{status_code // 100}xx"
+        if status_code < 400:
+            path = strip_prefix(path, self.path_prefix)
+            for route, rate in self.route_rates:
+                if matches_route(path, route):
+                    return rate
+        return self.status_rates.get(status_class, self.default_rate)
+
+    def sample(self, path: str, status_code: int, duration_ms: float) -> Optional[float]:
+        """Retorna a taxa aplicada se a requisição deve ser registrada, ou None."""
+        rate = self.rate_for(path, status_code, duration_ms)
+        if rate >= 1.0 or (rate > 0.0 and random.random() < rate):
+            return rate
+        return None
+
+
+_listener: Optional[BatchingQueueListener] = None
+
+
+def get_output_handlers() -> List[logging.Handler]:
+    return list(_listener.handlers) if _listener else []
+
+
+def shutdown_logging() -> None:
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
 def setup_logging(log_level: str = "INFO"):
+    global _listener
+    settings = get_settings()
+
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
-    
+
     log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    
+
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
-    
+
+    shutdown_logging()
     root_logger.handlers.clear()
-    
-    console_handler = logging.StreamHandler(sys.stdout)
+
+    console_handler = BatchedStreamHandler(sys.stdout)
     console_handler.setLevel(getattr(logging, log_level.upper()))
     console_formatter = logging.Formatter(log_format)
     console_handler.setFormatter(console_formatter)
-    console_handler.addFilter(ContextFilter())
-    root_logger.addHandler(console_handler)
-    
-    file_handler = logging.FileHandler(
-        log_dir / f'api_{datetime.now().strftime("%Y%m%d")}.log', 
-        encoding="utf-8"
+
+    file_handler = SizeAndTimeRotatingFileHandler(
+        log_dir / "api.log",
+        max_bytes=settings.log_rotate_max_bytes,
+        interval_seconds=settings.log_rotate_interval_hours * 3600,
+        backup_count=settings.log_backup_count,
     )
     file_handler.setLevel(logging.DEBUG)
     json_formatter = CustomJsonFormatter("%(timestamp)s %(level)s %(name)s %(message)s %(request_id)s %(user)s")
 
     file_handler.setFormatter(json_formatter)
-    file_handler.addFilter(ContextFilter())
-    root_logger.addHandler(file_handler)
-    
-    logging.getLogger("uvicorn").setLevel(logging.INFO)
-    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
-    
-    logging.info("Logging system configured")
 
+    # O contexto (request_id, user) é capturado na thread que gera o log, antes de enfileirar.
+    log_queue = queue.Queue(maxsize=settings.log_queue_size)
+    queue_handler = BoundedQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    root_logger.addHandler(queue_handler)
+    LOG_QUEUE_DEPTH.set_function(log_queue.qsize)
+
+    _listener = BatchingQueueListener(
+        log_queue, console_handler, file_handler, batch_size=settings.log_batch_size
+    )
+    _listener.start()
 
+    logging.getLogger("uvicorn").setLevel(logging.INFO)
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 
+    logging.info("Logging system configured")
 
 
+atexit.register(shutdown_logging)
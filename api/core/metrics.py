@@ -0,0 +1,140 @@
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from prometheus_client import Gauge, Histogram
+from pydantic import TypeAdapter, ValidationError
+
+from api.core.tracing import get_tracer, start_span
+
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+DB_OPERATION_SECONDS = Histogram(
+    "books_db_operation_seconds", "Time spent in BooksDatabase operations",
+    ["operation"], buckets=LATENCY_BUCKETS,
+)
+SERIALIZATION_SECONDS = Histogram(
+    "serialization_stage_seconds", "Time spent in each response serialization stage",
+    ["stage"], buckets=LATENCY_BUCKETS,
+)
+
+SNAPSHOT_ROWS = Gauge("books_snapshot_rows", "Rows in the loaded books snapshot")
+SNAPSHOT_MEMORY_BYTES = Gauge("books_snapshot_memory_bytes", "Memory used by the loaded books snapshot")
+SNAPSHOT_VERSION = Gauge("books_data_version", "Content digest of the loaded books snapshot (changes when the data does)")
+SNAPSHOT_AGE_SECONDS = Gauge("books_data_version_age_seconds", "Seconds since the books snapshot was loaded")
+INDEX_BUILD_SECONDS = Gauge(
+    "books_index_build_seconds", "Time spent building each snapshot index on the last load", ["index"]
+)
+
+
+def timed_operation(operation: str) -> Callable:
+    histogram = DB_OPERATION_SECONDS.labels(operation=operation)
+    tracer = get_tracer()
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        if not tracer.enabled:
+            return wrapper
+
+        @functools.wraps(fn)
+        def traced_wrapper(*args, **kwargs):
+            with tracer.start_span(f"db.{operation}"):
+                return wrapper(*args, **kwargs)
+        return traced_wrapper
+
+    return decorator
+
+
+@contextmanager
+def timed_stage(stage: str):
+    start = time.perf_counter()
+    try:
+        with start_span(f"serialize.{stage}"):
+            yield
+    finally:
+        SERIALIZATION_SECONDS.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def timed_index_build(index: str):
+    start = time.perf_counter()
+    yield
+    INDEX_BUILD_SECONDS.labels(index=index).set(time.perf_counter() - start)
+
+
+def record_snapshot(rows: int, memory_bytes: int, version: int, loaded_at: float) -> None:
+    SNAPSHOT_ROWS.set(rows)
+    SNAPSHOT_MEMORY_BYTES.set(memory_bytes)
+    SNAPSHOT_VERSION.set(version)
+    SNAPSHOT_AGE_SECONDS.set_function(lambda: time.time() - loaded_at)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse que mede o encode das rotas sem ``response_model``."""
+
+    def render(self, content) -> bytes:
+        with timed_stage("json_encode"):
+            return super().render(content)
+
+
+class TimedRoute(APIRoute):
+    """APIRoute que valida e serializa o ``response_model`` medindo cada estágio.
+
+    O endpoint é envolvido para validar o retorno com um ``TypeAdapter`` do
+    modelo (``response_validation``) e gerar o JSON direto dele
+    (``model_dump``), devolvendo uma ``Response`` pronta, que o FastAPI repassa
+    sem serializar de novo. Endpoints que já devolvem uma ``Response`` e rotas
+    sem ``response_model`` (medidas pelo ``TimedJSONResponse``) passam direto.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, self._timed_endpoint(endpoint), **kwargs)
+        self.response_adapter = TypeAdapter(self.response_model) if self.response_field is not None else None
+
+    def _timed_endpoint(self, endpoint: Callable) -> Callable:
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                return self._serialize(await endpoint(*args, **kwargs))
+        else:
+            @functools.wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                return self._serialize(endpoint(*args, **kwargs))
+        return wrapper
+
+    def _serialize(self, content: Any) -> Any:
+        adapter = self.response_adapter
+        if adapter is None or isinstance(content, Response):
+            return content
+        with timed_stage("response_validation"):
+            try:
+                value = adapter.validate_python(content, from_attributes=True)
+            except ValidationError as e:
+                errors = [{**error, "loc": ("response", *error["loc"])} for error in e.errors(include_url=False)]
+                raise ResponseValidationError(errors=errors, body=content)
+        with timed_stage("model_dump"):
+            body = adapter.dump_json(
+                value,
+                include=self.response_model_include,
+                exclude=self.response_model_exclude,
+                by_alias=self.response_model_by_alias,
+                exclude_unset=self.response_model_exclude_unset,
+                exclude_defaults=self.response_model_exclude_defaults,
+                exclude_none=self.response_model_exclude_none,
+            )
+        return Response(content=body, status_code=self.status_code or 200, media_type="application/json")
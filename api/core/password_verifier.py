@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from api.core.config import get_settings
+from api.domain.common.exceptions import ServiceBusyError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+VERIFY_IN_FLIGHT = Gauge(
+    "auth_password_verify_in_flight", "Password verifications running on the executor"
+)
+VERIFY_QUEUED = Gauge(
+    "auth_password_verify_queued", "Password verifications waiting for an executor slot"
+)
+VERIFY_QUEUE_WAIT = Histogram(
+    "auth_password_verify_queue_wait_seconds", "Time spent waiting for an executor slot",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+VERIFY_DURATION = Histogram(
+    "auth_password_verify_seconds", "Time spent running bcrypt verification",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+VERIFY_REJECTED = Counter(
+    "auth_password_verify_rejected_total", "Verifications rejected because the queue was full"
+)
+VERIFY_CACHE = Counter(
+    "auth_password_verify_cache_total", "Verified-credential cache lookups", ["result"]
+)
+
+
+class PasswordVerifier:
+    """Executa bcrypt fora do event loop, com limite de concorrência e cache de credenciais."""
+
+    def __init__(
+        self,
+        secret_key: str,
+        max_workers: int = 2,
+        max_queue: int = 32,
+        cache_ttl_seconds: float = 60.0,
+        cache_max_entries: int = 1024,
+    ):
+        self._secret = secret_key.encode("utf-8")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = cache_max_entries
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._cache: "OrderedDict[bytes, float]" = OrderedDict()
+
+    def _cache_key(self, username: str, plain_password: str, hashed_password: str) -> bytes:
+        # Chave derivada com HMAC: o cache nunca guarda a senha nem um hash reversível offline.
+        message = "\0".join((username, hashed_password, plain_password)).encode("utf-8")
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def _cache_hit(self, key: bytes) -> bool:
+        expires_at = self._cache.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            self._cache.pop(key, None)
+            return False
+        self._cache.move_to_end(key)
+        return True
+
+    def _cache_store(self, key: bytes) -> None:
+        self._cache[key] = time.monotonic() + self.cache_ttl_seconds
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def _track(self, fn: Callable[[], T], submitted_at: float) -> T:
+        with self._lock:
+            self._running += 1
+            VERIFY_QUEUED.set(self._pending - self._running)
+            VERIFY_IN_FLIGHT.set(self._running)
+        VERIFY_QUEUE_WAIT.observe(time.perf_counter() - submitted_at)
+
+        start = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            VERIFY_DURATION.observe(time.perf_counter() - start)
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                VERIFY_QUEUED.set(self._pending - self._running)
+                VERIFY_IN_FLIGHT.set(self._running)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="password-verify"
+                    )
+        return self._executor
+
+    async def run(self, fn: Callable[[], T]) -> T:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                VERIFY_REJECTED.inc()
+                raise ServiceBusyError("Too many concurrent login attempts, try again shortly")
+            self._pending += 1
+            VERIFY_QUEUED.set(self._pending - self._running)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self._track, fn, time.perf_counter())
+
+    async def verify(
+        self,
+        username: str,
+        plain_password: str,
+        hashed_password: str,
+        verify_fn: Callable[[str, str], bool],
+    ) -> bool:
+        key = self._cache_key(username, plain_password, hashed_password)
+        if self._cache_hit(key):
+            VERIFY_CACHE.labels(result="hit").inc()
+            return True
+        VERIFY_CACHE.labels(result="miss").inc()
+
+        verified = await self.run(lambda: verify_fn(plain_password, hashed_password))
+        if verified:
+            self._cache_store(key)
+        return verified
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": self._running,
+                "queued": self._pending - self._running,
+                "cached_credentials": len(self._cache),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_verifier_instance: Optional[PasswordVerifier] = None
+
+
+def get_password_verifier() -> PasswordVerifier:
+    global _verifier_instance
+    if _verifier_instance is None:
+        settings = get_settings()
+        _verifier_instance = PasswordVerifier(
+            secret_key=settings.secret_key,
+            max_workers=settings.password_verify_workers,
+            max_queue=settings.password_verify_max_queue,
+            cache_ttl_seconds=settings.password_cache_ttl_seconds,
+            cache_max_entries=settings.password_cache_max_entries,
+        )
+    return _verifier_instance
@@ -0,0 +1,12 @@
+def strip_prefix(path: str, prefix: str) -> str:
+    """Caminho sem o prefixo da API (``/api/v1``), como as rotas são configuradas."""
+    prefix = prefix.rstrip("/")
+    if prefix and (path == prefix or path.startswith(prefix + "/")):
+        return path[len(prefix):] or "/"
+    return path
+
+
+def matches_route(path: str, route: str) -> bool:
+    # Rota exata ou prefixo por segmento: "/books/search" cobre "/books/search/x", mas não "/books/searchx".
+    route = route.rstrip("/")
+    return path == route or path.startswith(route + "/")
@@ -0,0 +1,232 @@
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.core.auth import user_from_token
+from api.core.config import get_settings
+from api.core.logger import request_id_var
+
+# Funções em que uma thread ociosa fica bloqueada (event loop esperando I/O, workers esperando tarefa).
+IDLE_LEAVES = frozenset({"select", "poll", "wait", "_wait_for_tstate_lock", "_worker"})
+
+_label_cache: Dict[object, str] = {}
+
+
+def _frame_label(code) -> str:
+    label = _label_cache.get(code)
+    if label is None:
+        filename = code.co_filename
+        cwd = os.getcwd()
+        if filename.startswith(cwd):
+            filename = os.path.relpath(filename, cwd)
+        else:
+            filename = os.path.basename(filename)
+        label = _label_cache[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+    return label
+
+
+class SamplingProfiler:
+    """Amostra as pilhas de todas as threads em intervalos fixos a partir de uma thread própria.
+
+    O custo fica na thread do profiler (uma leitura de ``sys._current_frames`` por
+    amostra); o código perfilado não é instrumentado. As amostras são do
+    processo inteiro: tudo o que rodou no event loop e no threadpool durante a
+    coleta entra no perfil, não só a requisição que o disparou.
+    """
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self, own_id: int) -> None:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if not self.include_idle and frame.f_code.co_name in IDLE_LEAVES:
+                continue
+
+            labels: List[str] = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.reverse()
+            self.stacks[";".join(labels)] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self._sample(own_id)
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.started_at is not None:
+            self.duration = time.perf_counter() - self.started_at
+        return self
+
+    def collapsed(self) -> str:
+        """Saída no formato de pilhas colapsadas (flamegraph.pl, speedscope, inferno)."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "samples": self.samples,
+            "unique_stacks": len(self.stacks),
+            "duration_seconds": round(self.duration, 3),
+            "interval_ms": self.interval * 1000,
+        }
+
+
+class ProfileStore:
+    """Guarda os perfis por requisição (X-Profile) mais recentes, indexados por um id gerado no servidor."""
+
+    def __init__(self, max_entries: int = 50):
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        profile_id: str,
+        request_id: Optional[str],
+        path: str,
+        profiler: SamplingProfiler,
+        overlapping_requests: int = 0,
+    ) -> None:
+        entry = {
+            "profile_id": profile_id,
+            "request_id": request_id,
+            "path": path,
+            "overlapping_requests": overlapping_requests,
+            **profiler.summary(),
+            "collapsed": profiler.collapsed(),
+        }
+        with self._lock:
+            self._profiles[profile_id] = entry
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, object]]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, object]]:
+        with self._lock:
+            return [
+                {key: value for key, value in entry.items() if key != "collapsed"}
+                for entry in reversed(self._profiles.values())
+            ]
+
+
+_profiling_lock = threading.Lock()
+profile_store = ProfileStore(max_entries=get_settings().profiling_store_max_entries)
+
+
+def acquire_profiling_slot() -> bool:
+    # Um profiler por vez no processo: amostras simultâneas se misturariam.
+    return _profiling_lock.acquire(blocking=False)
+
+
+def release_profiling_slot() -> None:
+    _profiling_lock.release()
+
+
+class RequestProfilerMiddleware:
+    """Perfila uma requisição quando ela traz ``X-Profile: 1`` (se habilitado nas settings).
+
+    Só vale para chamadas autenticadas com um usuário ativo (o mesmo acesso das
+    rotas ``/admin``); para os demais o header é ignorado. A resposta recebe
+    ``X-Profile-Id``, um id gerado aqui, e o perfil fica em
+    ``GET /admin/profiles/{id}``. Com outro profiler em execução o header é
+    ignorado.
+
+    O perfil é do processo inteiro durante a requisição; ``overlapping_requests``
+    conta as outras requisições em andamento nesse intervalo, cujas pilhas
+    também aparecem nele.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        settings = get_settings()
+        self.enabled = settings.profiling_header_enabled
+        self.interval = settings.profiling_interval_ms / 1000
+        # Contadores só tocados pelo event loop.
+        self.in_flight = 0
+        self.overlapping: Optional[int] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        if self.overlapping is not None:
+            self.overlapping += 1
+        try:
+            if _wants_profile(scope) and _is_authorized(scope) and acquire_profiling_slot():
+                await self._profile(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode("latin-1"))]
+            await send(message)
+
+        self.overlapping = self.in_flight - 1
+        profiler = SamplingProfiler(interval=self.interval).start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            overlapping, self.overlapping = self.overlapping, None
+            release_profiling_slot()
+            profile_store.add(profile_id, request_id_var.get(), scope["path"], profiler, overlapping)
+
+
+def _wants_profile(scope: Scope) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name == b"x-profile":
+            return value.strip().lower() in (b"1", b"true", b"yes")
+    return False
+
+
+def _is_authorized(scope: Scope) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token.strip():
+                return False
+            try:
+                user = user_from_token(token.strip())
+            except HTTPException:
+                return False
+            return not user.disabled
+    return False
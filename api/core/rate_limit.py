@@ -0,0 +1,262 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from prometheus_client import Counter
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.core.auth import token_cache
+from api.core.config import get_settings
+from api.core.logger import user_var
+from api.core.paths import matches_route, strip_prefix
+
+try:
+    import redis.asyncio as aioredis
+    USE_REDIS = True
+except ImportError:
+    aioredis = None
+    USE_REDIS = False
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITED = Counter(
+    "rate_limit_rejected_total", "Requests rejected by the rate limiter", ["route"]
+)
+
+
+class RateLimitDecision(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+def _sliding_estimate(previous: float, current: float, elapsed: float, window: float) -> float:
+    return previous * (1.0 - elapsed / window) + current
+
+
+def _retry_after(previous: float, current: float, cost: int, limit: int, elapsed: float, window: float) -> float:
+    # Tempo até o peso da janela anterior cair o suficiente para caber ``cost``.
+    room = limit - current - cost
+    if room >= 0 and previous > 0:
+        return max(window * (1.0 - room / previous) - elapsed, 0.0)
+    return window - elapsed
+
+
+class _Counter:
+    __slots__ = ("window", "previous", "current")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.previous = 0
+        self.current = 0
+
+
+class MemoryRateLimitBackend:
+    """Contadores de janela deslizante em memória: três inteiros por cliente."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._counters: "OrderedDict[str, _Counter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, cost: int, limit: int, window: float) -> RateLimitDecision:
+        now = time.time()
+        window_idx = int(now // window)
+        elapsed = now - window_idx * window
+
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = _Counter(window_idx)
+                while len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(key)
+
+            if counter.window != window_idx:
+                counter.previous = counter.current if counter.window == window_idx - 1 else 0
+                counter.current = 0
+                counter.window = window_idx
+
+            estimate = _sliding_estimate(counter.previous, counter.current, elapsed, window)
+            if estimate + cost > limit:
+                retry = _retry_after(counter.previous, counter.current, cost, limit, elapsed, window)
+                return RateLimitDecision(False, max(int(limit - estimate), 0), retry)
+
+            counter.current += cost
+            return RateLimitDecision(True, int(limit - estimate - cost), 0.0)
+
+
+class RedisRateLimitBackend:
+    """Mesma janela deslizante, com contadores compartilhados entre instâncias via Redis."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit"):
+        if not USE_REDIS:
+            raise RuntimeError("Backend Redis requer o pacote redis. Execute: pip install redis")
+        self.prefix = prefix
+        self._client = aioredis.from_url(url)
+
+    async def hit(self, key: str, cost: int, limit: int, window: float) -> RateLimitDecision:
+        now = time.time()
+        window_idx = int(now // window)
+        elapsed = now - window_idx * window
+        current_key = f"{self.prefix}:{key}:{window_idx}"
+        previous_key = f"{self.prefix}:{key}:{window_idx - 1}"
+
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incrby(current_key, cost)
+            pipe.expire(current_key, math.ceil(window * 2))
+            pipe.get(previous_key)
+            current, _, previous = await pipe.execute()
+
+        previous = int(previous or 0)
+        estimate = _sliding_estimate(previous, current - cost, elapsed, window)
+        if estimate + cost > limit:
+            # Pedido rejeitado não consome cota.
+            await self._client.decrby(current_key, cost)
+            retry = _retry_after(previous, current - cost, cost, limit, elapsed, window)
+            return RateLimitDecision(False, max(int(limit - estimate), 0), retry)
+        return RateLimitDecision(True, int(limit - estimate - cost), 0.0)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        backend,
+        limit: int,
+        window_seconds: float,
+        route_costs: Dict[str, int],
+        exempt_paths: Iterable[str] = (),
+        trusted_proxy_hops: int = 0,
+        path_prefix: str = "",
+    ):
+        self.backend = backend
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.route_costs = sorted(route_costs.items(), key=lambda item: len(item[0]), reverse=True)
+        self.exempt_paths = tuple(exempt_paths)
+        self.trusted_proxy_hops = trusted_proxy_hops
+        self.path_prefix = path_prefix.rstrip("/")
+
+    def route_path(self, path: str) -> str:
+        return strip_prefix(path, self.path_prefix)
+
+    def cost_for(self, path: str) -> Tuple[str, int]:
+        path = self.route_path(path)
+        for route, cost in self.route_costs:
+            if matches_route(path, route):
+                return route, cost
+        return "default", 1
+
+    def is_exempt(self, path: str) -> bool:
+        path = self.route_path(path)
+        return any(matches_route(path, exempt) for exempt in self.exempt_paths)
+
+    def client_ip(self, scope: Scope) -> str:
+        # Sem proxy confiável configurado o X-Forwarded-For é do cliente e é ignorado.
+        if self.trusted_proxy_hops > 0:
+            for name, value in scope.get("headers", ()):
+                if name == b"x-forwarded-for":
+                    # Cada proxy confiável acrescenta um salto; os da esquerda são controlados pelo cliente.
+                    hops = [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+                    if hops:
+                        return hops[-min(self.trusted_proxy_hops, len(hops))]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def client_key(self, scope: Scope) -> str:
+        username = user_var.get()
+        if username is None:
+            username = _username_from_token(scope)
+        if username:
+            return f"user:{username}"
+        return f"ip:{self.client_ip(scope)}"
+
+    async def check(self, scope: Scope) -> Tuple[str, RateLimitDecision]:
+        route, cost = self.cost_for(scope["path"])
+        try:
+            decision = await self.backend.hit(self.client_key(scope), cost, self.limit, self.window_seconds)
+        except Exception as e:
+            # Falha no backend compartilhado não pode derrubar a API: deixa passar.
+            logger.warning(f"Rate limit backend unavailable: {e}")
+            decision = RateLimitDecision(True, self.limit, 0.0)
+        return route, decision
+
+
+def _username_from_token(scope: Scope) -> Optional[str]:
+    # O middleware roda antes das dependências de auth; só tokens já validados
+    # (presentes no cache) identificam o usuário, os demais caem no IP.
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                cached = token_cache.peek(token)
+                return cached.user.username if cached else None
+    return None
+
+
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp, limiter: Optional["RateLimiter"] = None):
+        self.app = app
+        self.limiter = limiter or get_rate_limiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.limiter is None or self.limiter.is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        route, decision = await self.limiter.check(scope)
+        if not decision.allowed:
+            RATE_LIMITED.labels(route=route).inc()
+            retry_after = max(math.ceil(decision.retry_after), 1)
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "error": "rate_limited",
+                    "message": f"Too many requests, retry in {retry_after}s",
+                },
+                headers={
+                    "Retry-After": str(retry_after),
+                    "X-RateLimit-Limit": str(self.limiter.limit),
+                    "X-RateLimit-Remaining": str(decision.remaining),
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+_limiter_instance: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    global _limiter_instance
+    settings = get_settings()
+    if not settings.rate_limit_enabled:
+        return None
+
+    if _limiter_instance is None:
+        backend = None
+        if settings.rate_limit_redis_url:
+            try:
+                backend = RedisRateLimitBackend(settings.rate_limit_redis_url)
+            except RuntimeError as e:
+                logger.warning(f"{e}. Using in-memory rate limiting.")
+        if backend is None:
+            backend = MemoryRateLimitBackend(max_keys=settings.rate_limit_max_keys)
+
+        _limiter_instance = RateLimiter(
+            backend=backend,
+            limit=settings.rate_limit_requests,
+            window_seconds=settings.rate_limit_window_seconds,
+            route_costs=settings.rate_limit_route_costs,
+            exempt_paths=settings.rate_limit_exempt_paths,
+            trusted_proxy_hops=settings.rate_limit_trusted_proxy_hops,
+            path_prefix=f"/api/{settings.api_version}",
+        )
+    return _limiter_instance
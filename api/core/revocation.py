@@ -0,0 +1,128 @@
+import hashlib
+import heapq
+import logging
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class TokenDenyList:
+    """Lista de jtis revogados: Bloom filter na frente de um conjunto exato.
+
+    O caminho comum (token não revogado) é respondido só pelo Bloom filter.
+    Entradas expiram no ``exp`` do token, e o filtro é reconstruído a partir
+    do conjunto exato quando muitas entradas já expiraram. Um jti revogado
+    nunca é descartado antes do seu ``exp``: se a lista enche só com tokens
+    ainda válidos, a capacidade dobra (com alerta no log) em vez de despejar
+    alguém — ``max_entries`` deve cobrir TTL do token x taxa de revogação.
+    """
+
+    def __init__(self, max_entries: int = 100_000, error_rate: float = 0.001):
+        self.max_entries = max_entries
+        self.error_rate = error_rate
+
+        self._lock = threading.Lock()
+        self._expires: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._bloom = BloomFilter(max_entries, error_rate)
+        self._stale = 0
+
+    def revoke(self, jti: Optional[str], exp: Optional[float]) -> None:
+        if not jti:
+            return
+        exp = float(exp) if exp is not None else time.time()
+        if exp <= time.time():
+            return
+
+        with self._lock:
+            self._purge_expired()
+            current = self._expires.get(jti)
+            if current is not None and current >= exp:
+                return
+            if current is None and len(self._expires) >= self.max_entries:
+                self._grow()
+
+            self._expires[jti] = exp
+            heapq.heappush(self._heap, (exp, jti))
+            self._bloom.add(jti)
+
+    def _grow(self) -> None:
+        # Todas as entradas ainda estão dentro do prazo: despejar uma revalidaria um token revogado.
+        self.max_entries *= 2
+        logger.error(
+            f"Token deny-list full of live revocations; growing capacity to {self.max_entries}. "
+            "Raise TOKEN_DENYLIST_MAX_ENTRIES to cover token TTL x revocation rate."
+        )
+        self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> None:
+        self._bloom = BloomFilter(self.max_entries, self.error_rate)
+        for jti in self._expires:
+            self._bloom.add(jti)
+        self._stale = 0
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti or jti not in self._bloom:
+            return False
+        with self._lock:
+            exp = self._expires.get(jti)
+        return exp is not None and exp > time.time()
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            exp, jti = heapq.heappop(self._heap)
+            # Tuplas de um jti revogado de novo com exp maior ficam para trás no heap: são ignoradas.
+            if self._expires.get(jti) == exp:
+                del self._expires[jti]
+                self._stale += 1
+
+        if len(self._heap) > 2 * len(self._expires) + 64:
+            self._heap = [(exp, jti) for jti, exp in self._expires.items()]
+            heapq.heapify(self._heap)
+
+        # Bloom filters não suportam remoção: reconstrói quando metade dos bits é de entradas mortas.
+        if self._stale and self._stale >= len(self._expires):
+            self._rebuild_bloom()
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "revoked": len(self._expires),
+                "max_entries": self.max_entries,
+                "bloom_bytes": self._bloom.nbytes,
+                "bloom_hashes": self._bloom.hash_count,
+            }
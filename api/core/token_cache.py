@@ -0,0 +1,79 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from prometheus_client import Counter
+
+from api.domain.auth.schemas import UserInDB
+
+TOKEN_CACHE = Counter(
+    "auth_token_cache_total", "Verified-token cache lookups", ["result"]
+)
+
+
+class CachedToken(NamedTuple):
+    user: UserInDB
+    jti: Optional[str]
+    expires_at: float
+
+
+class VerifiedTokenCache:
+    """LRU de tokens JWT já validados, indexado pelo digest do token.
+
+    A entrada nunca vive além do ``exp`` do próprio token, então um hit é
+    equivalente a decodificar e validar a assinatura novamente.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, CachedToken]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                TOKEN_CACHE.labels(result="miss").inc()
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                TOKEN_CACHE.labels(result="expired").inc()
+                return None
+            self._entries.move_to_end(key)
+        TOKEN_CACHE.labels(result="hit").inc()
+        return entry
+
+    def peek(self, token: str) -> Optional[CachedToken]:
+        entry = self._entries.get(self._digest(token))
+        if entry is None or entry.expires_at <= time.time():
+            return None
+        return entry
+
+    def put(self, token: str, user: UserInDB, exp: Optional[float], jti: Optional[str] = None) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= time.time():
+            return
+
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = CachedToken(user=user, jti=jti, expires_at=expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,385 @@
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from prometheus_client import Counter
+
+from api.core.config import get_settings
+from api.core.logger import request_id_var
+
+logger = logging.getLogger(__name__)
+
+SPANS_DROPPED = Counter("tracing_spans_dropped_total", "Spans dropped because the export queue was full")
+SPANS_EXPORT_FAILED = Counter("tracing_spans_export_failed_total", "Spans lost because the exporter failed")
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "kind",
+        "start_ns", "end_ns", "attributes", "status", "status_message",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int, attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, exc: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, exc: BaseException) -> None:
+        pass
+
+    traceparent = None
+
+
+NOOP_SPAN = _NoopSpan()
+_NOOP_CONTEXT = nullcontext(NOOP_SPAN)
+# Marca um trace não amostrado: os filhos também não geram spans.
+_UNSAMPLED = object()
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_json(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """Monta um ExportTraceServiceRequest no mapeamento JSON do OTLP."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{
+                "scope": {"name": "api.core.tracing"},
+                "spans": [
+                    {
+                        "traceId": span.trace_id,
+                        "spanId": span.span_id,
+                        **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                        "name": span.name,
+                        "kind": span.kind,
+                        "startTimeUnixNano": str(span.start_ns),
+                        "endTimeUnixNano": str(span.end_ns),
+                        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                        "status": {"code": span.status, **({"message": span.status_message} if span.status_message else {})},
+                    }
+                    for span in spans
+                ],
+            }],
+        }],
+    }
+
+
+class FileSpanExporter:
+    """Uma requisição OTLP/JSON por linha (mesmo formato do file exporter do OpenTelemetry Collector)."""
+
+    def __init__(self, path: str, service_name: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.service_name = service_name
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(to_otlp_json(spans, self.service_name), separators=(",", ":")) + "\n")
+
+
+class OTLPHttpSpanExporter:
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def export(self, spans: List[Span]) -> None:
+        response = self._session.post(
+            self.url,
+            data=json.dumps(to_otlp_json(spans, self.service_name)),
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+
+
+class BatchSpanProcessor:
+    """Fila limitada + thread de exportação; o caminho da requisição só faz ``put_nowait``."""
+
+    def __init__(self, exporter, max_queue: int = 10_000, batch_size: int = 512, flush_interval: float = 1.0):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            SPANS_DROPPED.inc()
+
+    def _drain(self, first: Optional[Span] = None) -> List[Span]:
+        batch = [first] if first is not None else []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _export(self, batch: List[Span]) -> None:
+        if not batch:
+            return
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            SPANS_EXPORT_FAILED.inc(len(batch))
+            logger.warning(f"Span export failed: {e}")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            self._export(self._drain(first))
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval + 1)
+        while not self._queue.empty():
+            self._export(self._drain())
+
+
+def parse_traceparent(value: Optional[str]):
+    # W3C: 00-<trace-id 32 hex>-<parent-id 16 hex>-<flags>
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+class Tracer:
+    def __init__(self, processor: Optional[BatchSpanProcessor] = None, sample_rate: float = 1.0):
+        self.processor = processor
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None
+
+    def start_span(self, name: str, kind: int = SPAN_KIND_INTERNAL, traceparent: Optional[str] = None, **attributes):
+        if self.processor is None:
+            return _NOOP_CONTEXT
+        return self._span(name, kind, traceparent, attributes)
+
+    @contextmanager
+    def _span(self, name: str, kind: int, traceparent: Optional[str], attributes: Dict[str, Any]):
+        parent = _current_span.get()
+        remote = parse_traceparent(traceparent)
+
+        if remote is not None:
+            trace_id, parent_id, sampled = remote
+        elif parent is _UNSAMPLED:
+            sampled = False
+        elif isinstance(parent, Span):
+            trace_id, parent_id, sampled = parent.trace_id, parent.span_id, True
+        else:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+            sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+        if not sampled:
+            token = _current_span.set(_UNSAMPLED)
+            try:
+                yield NOOP_SPAN
+            finally:
+                _current_span.reset(token)
+            return
+
+        span = Span(name, trace_id, parent_id, kind, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.set_error(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self.processor.submit(span)
+
+    def shutdown(self) -> None:
+        if self.processor is not None:
+            self.processor.shutdown()
+
+
+_tracer_instance: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    global _tracer_instance
+    if _tracer_instance is None:
+        settings = get_settings()
+        processor = None
+        if settings.tracing_enabled:
+            if settings.tracing_exporter == "otlp":
+                exporter = OTLPHttpSpanExporter(settings.tracing_otlp_endpoint, settings.tracing_service_name)
+            else:
+                exporter = FileSpanExporter(settings.tracing_file_path, settings.tracing_service_name)
+            processor = BatchSpanProcessor(
+                exporter,
+                max_queue=settings.tracing_queue_size,
+                batch_size=settings.tracing_batch_size,
+                flush_interval=settings.tracing_flush_interval_seconds,
+            )
+            logger.info(f"Tracing enabled (exporter={settings.tracing_exporter}, pid={os.getpid()})")
+        _tracer_instance = Tracer(processor, sample_rate=settings.tracing_sample_rate)
+    return _tracer_instance
+
+
+def start_span(name: str, **attributes):
+    return get_tracer().start_span(name, **attributes)
+
+
+def current_traceparent() -> Optional[str]:
+    span = _current_span.get()
+    return span.traceparent if isinstance(span, Span) else None
+
+
+def traced(name: str) -> Callable:
+    """Envolve a função em um span. Com tracing desabilitado a função é retornada intacta."""
+
+    def decorator(fn: Callable) -> Callable:
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.start_span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def traced_methods(prefix: str) -> Callable:
+    """Decorador de classe: um span ``<prefix>.<método>`` para cada método público."""
+
+    def decorator(cls):
+        if not get_tracer().enabled:
+            return cls
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not callable(value):
+                continue
+            if inspect.iscoroutinefunction(value):
+                setattr(cls, attr, _traced_async(f"{prefix}.{attr}", value))
+            else:
+                setattr(cls, attr, traced(f"{prefix}.{attr}")(value))
+        return cls
+
+    return decorator
+
+
+def _traced_async(name: str, fn: Callable) -> Callable:
+    tracer = get_tracer()
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with tracer.start_span(name):
+            return await fn(*args, **kwargs)
+    return wrapper
+
+
+class TracingMiddleware:
+    """Span raiz de cada requisição HTTP; aceita ``traceparent`` (W3C) de quem chamou."""
+
+    def __init__(self, app):
+        self.app = app
+        self.tracer = get_tracer()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if not self.tracer.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for header, value in scope.get("headers", ()):
+            if header == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        with self.tracer.start_span(
+            f"{scope['method']} {scope['path']}",
+            kind=SPAN_KIND_SERVER,
+            traceparent=traceparent,
+            **{"http.method": scope["method"], "http.target": scope["path"]},
+        ) as span:
+            async def send_with_status(message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500 and isinstance(span, Span):
+                        span.status = STATUS_ERROR
+                await send(message)
+
+            span.set_attribute("request.id", request_id_var.get())
+            await self.app(scope, receive, send_with_status)
+
+            route = scope.get("route")
+            if route is not None and hasattr(route, "path") and isinstance(span, Span):
+                span.name = f"{scope['method']} {route.path}"
+                span.set_attribute("http.route", route.path)
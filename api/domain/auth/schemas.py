@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
@@ -14,6 +14,10 @@ class RefreshRequest(BaseModel):
     refresh_token: str = Field(..., description="Refresh token JWT")
 
 
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = Field(None, description="Refresh token JWT a ser revogado junto com o access token")
+
+
 class TokenData(BaseModel):
     username: Optional[str] = None
 
@@ -27,3 +31,5 @@ class User(BaseModel):
 
 class UserInDB(User):
     hashed_password: str
+
+    model_config = ConfigDict(frozen=True)
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 
-from api.core.auth import authenticate_user, create_access_token, create_refresh_token, decode_token, get_user
+from api.core.auth import (
+    authenticate_user_async,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    get_user,
+    is_token_revoked,
+    revoke_token_payload,
+)
 from api.core.config import get_settings
+from api.core.tracing import traced_methods
 from api.domain.common.exceptions import InvalidCredentialsError
 
 settings = get_settings()
 
 
+@traced_methods("service.auth")
 class AuthService:
-    def login(self, username: str, password: str) -> Dict[str, Any]:
-        user = authenticate_user(username, password)
+    async def login(self, username: str, password: str) -> Dict[str, Any]:
+        user = await authenticate_user_async(username, password)
         if not user:
             raise InvalidCredentialsError("Incorrect username or password")
 
@@ -45,10 +55,16 @@ class AuthService:
         if not username:
             raise InvalidCredentialsError("Invalid refresh token payload")
 
+        if is_token_revoked(payload):
+            raise InvalidCredentialsError("Refresh token has been revoked")
+
         user = get_user(username)
         if not user or user.disabled:
             raise InvalidCredentialsError("User not found or inactive")
 
+        # Rotação: cada refresh token só pode ser usado uma vez.
+        revoke_token_payload(payload)
+
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
         new_access_token = create_access_token(
             data={"sub": username},
@@ -65,3 +81,30 @@ class AuthService:
             "refresh_expires_in": settings.refresh_token_expire_days * 24 * 60,
         }
 
+
+    def logout(self, access_token: str, refresh_token: Optional[str] = None) -> Dict[str, Any]:
+        # O token pode ter passado pelo cache de tokens verificados e expirado depois.
+        try:
+            access_payload = decode_token(access_token)
+        except Exception:
+            raise InvalidCredentialsError("Invalid access token")
+
+        # Os dois tokens são validados antes de revogar qualquer um deles.
+        refresh_payload = None
+        if refresh_token:
+            try:
+                refresh_payload = decode_token(refresh_token)
+            except Exception:
+                raise InvalidCredentialsError("Invalid refresh token")
+
+            if refresh_payload.get("type") != "refresh" or refresh_payload.get("sub") != access_payload.get("sub"):
+                raise InvalidCredentialsError("Invalid refresh token")
+
+        revoke_token_payload(access_payload)
+        if refresh_payload is not None:
+            revoke_token_payload(refresh_payload)
+
+        return {
+            "status": "success",
+            "message": "Tokens revoked",
+        }
@@ -1,5 +1,8 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List
+from functools import lru_cache
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, create_model
+from typing import Annotated, Any, Dict, List, Optional, Tuple, Type, get_args, get_origin
+
+BookId = Annotated[int, Field(ge=1, le=2**63 - 1)]
 
 
 class Book(BaseModel):
@@ -23,3 +26,93 @@ class BookList(BaseModel):
     page: int = Field(default=1, description="Página atual")
     page_size: int = Field(default=50, description="Tamanho da página")
     books: List[Book] = Field(..., description="Lista de livros")
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor para a próxima página (ausente na última página)"
+    )
+
+
+class SearchFacets(BaseModel):
+    category: Dict[str, int] = Field(..., description="Livros do resultado por categoria (maiores primeiro)")
+    rating: Dict[str, int] = Field(..., description="Livros do resultado por rating")
+    stock: Dict[str, int] = Field(..., description="Livros do resultado em estoque / fora de estoque")
+    price: Dict[str, int] = Field(..., description="Livros do resultado por faixa de preço")
+
+
+class BookSearchResult(BookList):
+    facets: Optional[SearchFacets] = Field(
+        default=None, description="Contagens por facet do resultado completo (quando facets=true)"
+    )
+
+
+class BookBatchRequest(BaseModel):
+    ids: List[BookId] = Field(..., min_length=1, description="IDs dos livros (ids repetidos são considerados uma vez)")
+
+
+class BookBatchResult(BaseModel):
+    books: List[Book] = Field(..., description="Livros encontrados, na ordem dos ids da requisição")
+    missing: List[int] = Field(..., description="IDs sem livro correspondente")
+
+
+class BookSearchQuery(BaseModel):
+    title: Optional[str] = Field(None, description="Filtro por título (busca parcial)")
+    category: Optional[str] = Field(None, description="Filtro por categoria")
+    min_price: Optional[float] = Field(None, ge=0, description="Preço mínimo")
+    max_price: Optional[float] = Field(None, ge=0, description="Preço máximo")
+    min_rating: Optional[int] = Field(None, ge=0, le=5, description="Rating mínimo")
+    in_stock: Optional[bool] = Field(None, description="Filtro por disponibilidade")
+    page: int = Field(1, ge=1, description="Número da página")
+    page_size: int = Field(50, ge=1, le=100, description="Tamanho da página")
+    cursor: Optional[str] = Field(None, description="Cursor opaco (next_cursor da página anterior)")
+    sort: Optional[str] = Field(None, description="Ordenação, no mesmo formato de GET /books/search")
+    facets: bool = Field(False, description="Inclui contagens por facet")
+    fuzzy: bool = Field(False, description="Busca aproximada no título")
+
+
+class BookSearchBatchRequest(BaseModel):
+    queries: List[BookSearchQuery] = Field(..., min_length=1, description="Buscas a executar")
+
+
+class BookSearchBatchResult(BaseModel):
+    results: List[BookSearchResult] = Field(..., description="Resultado de cada busca, na ordem da requisição")
+
+
+def parse_fields(spec: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Converte ``"title,id,price"`` nos campos de ``Book`` em ordem canônica; ``None`` sem projeção."""
+    requested = {part.strip() for part in (spec or "").split(",") if part.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(Book.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Allowed fields: {', '.join(Book.model_fields)}")
+    # Ordem fixa: a mesma projeção pedida em outra ordem reaproveita o modelo gerado.
+    return tuple(name for name in Book.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def projected_model(model: Any, fields: Tuple[str, ...]) -> Any:
+    """Versão de ``model`` cujos livros têm apenas ``fields``; gerada uma vez por projeção."""
+    suffix = "_".join(fields)
+    if model is Book:
+        return create_model(
+            f"Book_{suffix}",
+            __config__=Book.model_config,
+            **{name: (Book.model_fields[name].annotation, Book.model_fields[name]) for name in fields},
+        )
+    if get_origin(model) is list:
+        return List[projected_model(get_args(model)[0], fields)]
+    if model is BookSearchBatchResult:
+        return create_model(
+            f"{model.__name__}_{suffix}",
+            __base__=model,
+            results=(List[projected_model(BookSearchResult, fields)], model.model_fields["results"]),
+        )
+    return create_model(
+        f"{model.__name__}_{suffix}",
+        __base__=model,
+        books=(List[projected_model(Book, fields)], model.model_fields["books"]),
+    )
+
+
+@lru_cache(maxsize=256)
+def projected_adapter(model: Any, fields: Tuple[str, ...]) -> TypeAdapter:
+    return TypeAdapter(projected_model(model, fields))
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+from api.core.config import get_settings
+from api.core.tracing import traced_methods
 from api.domain.common.exceptions import DataNotAvailableError, InvalidInputError, NotFoundError
 from api.infra.storage.database import BooksDatabase
+from api.infra.storage.indexes import (
+    RELEVANCE_SORT,
+    Cursor,
+    decode_cursor,
+    encode_cursor,
+    parse_sort,
+    sort_name,
+)
 
+settings = get_settings()
 
+
+@traced_methods("service.books")
 class BooksService:
     def __init__(self, db: BooksDatabase):
         self.db = db
@@ -19,29 +32,107 @@ class BooksService:
         if min_price > max_price:
             raise InvalidInputError("Minimum price cannot be greater than maximum price")
 
-
-    def get_all_books(self, page: int, page_size: int) -> Dict[str, Any]:
-        self._ensure_available()
-
-        skip = (page - 1) * page_size
-        books = self.db.get_all_books(skip=skip, limit=page_size)
-
-        return {
-            "total": self.db.total_books,
+    def _sort_name(self, sort: Optional[str], ranked: bool = False) -> str:
+        if ranked and not sort:
+            return RELEVANCE_SORT
+        if sort == RELEVANCE_SORT:
+            if not ranked:
+                raise InvalidInputError("Sorting by relevance requires fuzzy search")
+            return RELEVANCE_SORT
+        try:
+            return sort_name(parse_sort(sort))
+        except ValueError as e:
+            raise InvalidInputError(str(e))
+
+    def _decode_cursor(self, cursor: Optional[str], sort: str) -> Optional[Cursor]:
+        if not cursor:
+            return None
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise InvalidInputError("Invalid pagination cursor")
+        if after.sort != sort:
+            raise InvalidInputError("Cursor was issued for a different sort order")
+        return after
+
+    def _fetch_page(
+        self,
+        query,
+        page: int,
+        page_size: int,
+        cursor: Optional[str],
+        sort: Optional[str],
+        ranked: bool = False,
+        **filters,
+    ) -> Dict[str, Any]:
+        sort = self._sort_name(sort, ranked)
+        after = self._decode_cursor(cursor, sort)
+        skip = (page - 1) * page_size if after is None else 0
+
+        try:
+            result = query(skip=skip, limit=page_size, after=after, sort=sort, **filters)
+        except ValueError:
+            # Só o cursor vindo do cliente pode gerar ValueError na busca do índice.
+            if after is None:
+                raise
+            raise InvalidInputError("Invalid pagination cursor")
+
+        next_cursor = result["next_cursor"]
+        response = {
+            "total": result["total"],
             "page": page,
             "page_size": page_size,
-            "books": books,
+            "books": result["books"],
+            "next_cursor": encode_cursor(next_cursor) if next_cursor else None,
         }
+        if "facets" in result:
+            response["facets"] = result["facets"]
+        return response
+
+    def get_all_books(
+        self,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        self._ensure_available()
+        return self._fetch_page(self.db.get_all_books, page, page_size, cursor, sort, columns=fields)
 
-    def get_book_by_id(self, book_id: int) -> Dict[str, Any]:
+    def get_book_by_id(self, book_id: int, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         self._ensure_available()
 
-        book = self.db.get_book_by_id(book_id)
+        book = self.db.get_book_by_id(book_id, columns=fields)
         if not book:
             raise NotFoundError(f"Book with ID {book_id} not found")
 
         return book
 
+    def get_books_by_ids(self, book_ids: List[int], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        self._ensure_available()
+        if len(book_ids) > settings.batch_max_ids:
+            raise InvalidInputError(f"Batch lookup accepts at most {settings.batch_max_ids} ids")
+
+        return self.db.get_books_by_ids(list(dict.fromkeys(book_ids)), columns=fields)
+
+    def search_books_batch(
+        self, queries: List[Dict[str, Any]], fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        self._ensure_available()
+        if len(queries) > settings.batch_max_queries:
+            raise InvalidInputError(f"Batch search accepts at most {settings.batch_max_queries} queries")
+
+        # Uma busca de lote: mesmo snapshot para todas as consultas e filtros repetidos calculados uma vez.
+        search = self.db.batch_search()
+        results = []
+        for position, query in enumerate(queries):
+            try:
+                results.append(self._search(search, **query, fields=fields))
+            except InvalidInputError as e:
+                raise InvalidInputError(f"Query {position}: {e}")
+        return {"results": results}
+
     def search_books(
         self,
         title: Optional[str],
@@ -52,71 +143,96 @@ class BooksService:
         in_stock: Optional[bool],
         page: int,
         page_size: int,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        facets: bool = False,
+        fuzzy: bool = False,
+        fields: Optional[Sequence[str]] = None,
     ) -> Dict[str, Any]:
         self._ensure_available()
-        if min_price and max_price:
-            self._valid_min_max_price(min_price, max_price)
-
-        skip = (page - 1) * page_size
-
-        books = self.db.search_books(
+        return self._search(
+            self.db.search_books,
             title=title,
             category=category,
             min_price=min_price,
             max_price=max_price,
             min_rating=min_rating,
             in_stock=in_stock,
-            skip=skip,
-            limit=page_size,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            sort=sort,
+            facets=facets,
+            fuzzy=fuzzy,
+            fields=fields,
         )
 
-        all_results = self.db.search_books(
+    def _search(
+        self,
+        query,
+        title: Optional[str],
+        category: Optional[str],
+        min_price: Optional[float],
+        max_price: Optional[float],
+        min_rating: Optional[int],
+        in_stock: Optional[bool],
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        facets: bool = False,
+        fuzzy: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        if min_price and max_price:
+            self._valid_min_max_price(min_price, max_price)
+        if fuzzy and not (title and title.strip()):
+            raise InvalidInputError("Fuzzy search requires a title")
+
+        return self._fetch_page(
+            query,
+            page,
+            page_size,
+            cursor,
+            sort,
+            ranked=fuzzy,
             title=title,
             category=category,
             min_price=min_price,
             max_price=max_price,
             min_rating=min_rating,
             in_stock=in_stock,
-            skip=0,
-            limit=999999,
+            facets=facets,
+            price_buckets=settings.facet_price_buckets,
+            fuzzy=fuzzy,
+            columns=fields,
         )
 
-        return {
-            "total": len(all_results),
-            "page": page,
-            "page_size": page_size,
-            "books": books,
-        }
-
-    def get_top_rated_books(self, limit: int) -> List[Dict[str, Any]]:
+    def get_top_rated_books(self, limit: int, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         self._ensure_available()
-        return self.db.get_top_rated_books(limit=limit)
+        return self.db.get_top_rated_books(limit=limit, columns=fields)
 
     def get_books_by_price_range(
-        self, min_price: float, max_price: float, page: int, page_size: int
+        self,
+        min_price: float,
+        max_price: float,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> Dict[str, Any]:
         self._ensure_available()
 
         self._valid_min_max_price(min_price, max_price)
 
-        skip = (page - 1) * page_size
-        books = self.db.get_books_by_price_range(
+        return self._fetch_page(
+            self.db.get_books_by_price_range,
+            page,
+            page_size,
+            cursor,
+            sort,
             min_price=min_price,
             max_price=max_price,
-            skip=skip,
-            limit=page_size,
+            columns=fields,
         )
-
-        all_books = self.db.get_books_by_price_range(
-            min_price=min_price,
-            max_price=max_price,
-            skip=0,
-            limit=999999,
-        )
-
-        return {
-            "total": len(all_books),
-            "page": page,
-            "page_size": page_size,
-            "books": books,
-        }
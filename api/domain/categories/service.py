@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
+from api.core.tracing import traced_methods
 from api.domain.common.exceptions import DataNotAvailableError
 from api.infra.storage.database import BooksDatabase
 
 
+@traced_methods("service.categories")
 class CategoriesService:
     def __init__(self, db: BooksDatabase):
         self.db = db
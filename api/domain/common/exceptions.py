@@ -24,6 +24,10 @@ class InvalidInputError(DomainError):
     pass
 
 
+class ServiceBusyError(DomainError):
+    pass
+
+
 class AuthError(DomainError):
     pass
 
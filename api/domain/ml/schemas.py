@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
 
+from api.domain.books.schemas import BookId
+
 
 class MLFeatures(BaseModel):
     id: int
@@ -15,6 +17,38 @@ class MLFeatures(BaseModel):
     category_encoded: int = Field(..., description="Categoria codificada")
 
 
+class SimilarBook(BaseModel):
+    id: int
+    title: str
+    price: float
+    rating: int
+    category: str
+    in_stock: bool
+
+    similarity: float = Field(..., description="Similaridade com o livro consultado (maior é mais parecido)")
+
+
+class SimilarBooks(BaseModel):
+    book_id: int = Field(..., description="ID do livro consultado")
+    k: int = Field(..., description="Número de vizinhos pedidos")
+    approximate: bool = Field(False, description="Se os vizinhos vieram do índice aproximado")
+    results: List[SimilarBook] = Field(..., description="Livros mais parecidos, do mais para o menos parecido")
+
+
+class MoreLikeThisRequest(BaseModel):
+    book_ids: List[BookId] = Field(..., min_length=1, description="Livros de referência (ids repetidos são considerados uma vez)")
+    k: int = Field(10, ge=1, le=100, description="Número de livros similares")
+    exact: bool = Field(False, description="Força a busca exata sobre o catálogo inteiro")
+
+
+class MoreLikeThisResult(BaseModel):
+    book_ids: List[int] = Field(..., description="Livros de referência encontrados")
+    missing: List[int] = Field(..., description="IDs sem livro correspondente")
+    k: int = Field(..., description="Número de vizinhos pedidos")
+    approximate: bool = Field(False, description="Se os vizinhos vieram do índice aproximado")
+    results: List[SimilarBook] = Field(..., description="Livros mais parecidos com o conjunto, do mais para o menos parecido")
+
+
 class MLTrainingData(BaseModel):
     features: List[MLFeatures]
     metadata: dict = Field(..., description="Metadados do dataset")
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
-from api.domain.common.exceptions import DataNotAvailableError
+from api.core.config import get_settings
+from api.core.tracing import traced_methods
+from api.domain.common.exceptions import DataNotAvailableError, InvalidInputError, NotFoundError
+from api.infra.ml.similarity import DEFAULT_WEIGHTS
 from api.infra.storage.database import BooksDatabase
 import logging
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
+@traced_methods("service.ml")
 class MLService:
     def __init__(self, db: BooksDatabase):
         self.db = db
@@ -44,6 +49,41 @@ class MLService:
             "metadata": metadata,
         }
 
+    def _probes(self, exact: bool) -> Optional[int]:
+        # Em catálogos pequenos a busca exata já é rápida e não vale montar o índice aproximado;
+        # o índice só existe para os pesos padrão.
+        too_small = len(self.db.df) < settings.similar_books_ann_min_rows
+        if exact or too_small or settings.similar_books_weights != DEFAULT_WEIGHTS:
+            return None
+        return settings.similar_books_ann_probes
+
+    def get_similar_books(self, book_id: int, k: int, exact: bool = False) -> Dict[str, Any]:
+        self._ensure_available()
+
+        probes = self._probes(exact)
+        results = self.db.get_similar_books(book_id, k=k, weights=settings.similar_books_weights, probes=probes)
+        if results is None:
+            raise NotFoundError(f"Book with ID {book_id} not found")
+
+        return {"book_id": book_id, "k": k, "approximate": probes is not None, "results": results}
+
+    def get_more_like_this(self, book_ids: List[int], k: int, exact: bool = False) -> Dict[str, Any]:
+        self._ensure_available()
+        book_ids = list(dict.fromkeys(book_ids))
+        if len(book_ids) > settings.more_like_this_max_books:
+            raise InvalidInputError(f"More like this accepts at most {settings.more_like_this_max_books} books")
+
+        probes = self._probes(exact)
+        results, missing = self.db.get_more_like_this(
+            book_ids, k=k, weights=settings.similar_books_weights, probes=probes
+        )
+        if len(missing) == len(book_ids):
+            raise NotFoundError("None of the requested books were found")
+
+        not_found = set(missing)
+        found = [book_id for book_id in book_ids if book_id not in not_found]
+        return {"book_ids": found, "missing": missing, "k": k, "approximate": probes is not None, "results": results}
+
     def submit_predictions(self, predictions):
         logger.info(f"[MOCKADO] Received {len(predictions)} predictions")
         logger.debug("Este endpoint está mockado. Implementação real de ML será adicionada futuramente.")
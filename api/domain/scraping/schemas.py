@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class ScrapeJobStatus(BaseModel):
+    job_id: str = Field(..., description="ID do job de scraping")
+    status: str = Field(..., description="Status do job (running, completed, failed, cancelled)")
+    triggered_by: Optional[str] = Field(None, description="Usuário que iniciou o job")
+    created_at: datetime = Field(..., description="Data de criação do job")
+    started_at: Optional[datetime] = Field(None, description="Início da execução")
+    finished_at: Optional[datetime] = Field(None, description="Fim da execução")
+    pages_fetched: int = Field(..., description="Páginas extraídas até o momento")
+    books_found: int = Field(..., description="Livros encontrados até o momento")
+    categories_done: int = Field(..., description="Categorias concluídas")
+    categories_total: int = Field(..., description="Total de categorias")
+    pages_per_second: float = Field(..., description="Velocidade em páginas por segundo")
+    elapsed_seconds: float = Field(..., description="Tempo decorrido em segundos")
+    eta_seconds: Optional[float] = Field(None, description="Tempo estimado restante em segundos")
+    cancel_requested: bool = Field(..., description="Se o cancelamento foi solicitado")
+    error: Optional[str] = Field(None, description="Mensagem de erro, se houver")
@@ -1,31 +1,40 @@
 from __future__ import annotations
 
 import logging
-from fastapi import BackgroundTasks
+from typing import Any, Dict, List, Optional, Tuple
 
-from api.infra.scraping.scraper import BooksScraper
+from api.core.tracing import traced_methods
+from api.domain.common.exceptions import NotFoundError
+from api.infra.scraping.jobs import ScrapeJobManager
 from api.infra.storage.database import BooksDatabase
 
 logger = logging.getLogger(__name__)
 
 
+@traced_methods("service.scraping")
 class ScrapingService:
-    def __init__(self, db: BooksDatabase):
+    def __init__(self, db: BooksDatabase, jobs: ScrapeJobManager):
         self.db = db
-
-    def _run_scraping_task(self) -> None:
-        logger.info("Starting scraping task...")
-        scraper = BooksScraper()
-
-        df_books = scraper.scrape_all_books()
-        scraper.save_to_csv(df_books, "data/books.csv")
-
-        self.db.reload_data()
-
-        logger.info("Scraping task completed successfully")
-
-    def trigger_scraping(self, background_tasks: BackgroundTasks) -> None:
-        background_tasks.add_task(self._run_scraping_task)
+        self.jobs = jobs
+
+    def trigger_scraping(self, triggered_by: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        job, created = self.jobs.start(triggered_by=triggered_by, on_complete=self.db.reload_data)
+        return job.to_dict(), created
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        job = self.jobs.get(job_id)
+        if not job:
+            raise NotFoundError(f"Scraping job {job_id} not found")
+        return job.to_dict()
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        return [job.to_dict() for job in self.jobs.list_jobs()]
+
+    def cancel_job(self, job_id: str) -> Dict[str, Any]:
+        job = self.jobs.cancel(job_id)
+        if not job:
+            raise NotFoundError(f"Scraping job {job_id} not found")
+        return job.to_dict()
 
     def reload_data(self) -> int:
         self.db.reload_data()
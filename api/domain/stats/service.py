@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from api.core.tracing import traced_methods
 from api.domain.common.exceptions import DataNotAvailableError
 from api.infra.storage.database import BooksDatabase
 
 
+@traced_methods("service.stats")
 class StatsService:
     def __init__(self, db: BooksDatabase):
         self.db = db
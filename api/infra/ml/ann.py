@@ -0,0 +1,215 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api.infra.ml.similarity import DEFAULT_WEIGHTS, SimilarityIndex, top_k
+
+# Dimensões da projeção aleatória do TF-IDF; acima de MAX_CATEGORY_DIMS categorias, elas também são projetadas.
+TEXT_DIMS = 128
+MAX_CATEGORY_DIMS = 64
+# Células (linha x palavra) do bloco denso usado para projetar os títulos.
+EMBEDDING_BLOCK_CELLS = 1 << 17
+# Listas por raiz do catálogo, amostra de treino por lista e iterações do k-means.
+LISTS_PER_SQRT_ROW = 2
+TRAINING_ROWS_PER_LIST = 20
+KMEANS_ITERATIONS = 6
+DEFAULT_PROBES = 16
+
+
+class ContentEmbedding:
+    """Vetores densos de conteúdo cujo produto interno aproxima o score do ``SimilarityIndex``.
+
+    O TF-IDF do título é projetado em ``TEXT_DIMS`` dimensões por uma matriz
+    gaussiana (Johnson-Lindenstrauss), a categoria vira one-hot e preço e rating
+    viram pontos no quarto de círculo (o cosseno entre dois cai com a
+    distância); cada bloco é escalado pela raiz do seu peso. Os vetores saem
+    centralizados na média do catálogo e são calculados sob demanda, nunca
+    materializados para o catálogo inteiro.
+    """
+
+    def __init__(self, similarity: SimilarityIndex, weights: Dict[str, float] = DEFAULT_WEIGHTS, seed: int = 42):
+        self.similarity = similarity
+        self.scales = {name: np.sqrt(weights.get(name, 0.0)) for name in ("title", "category", "price", "rating")}
+
+        rng = np.random.default_rng(seed)
+        n_words = int(similarity.row_words.max()) + 1 if len(similarity.row_words) else 0
+        n_categories = int(similarity.category.max()) + 1 if len(similarity.category) else 0
+        projection = rng.standard_normal((n_words + 1, TEXT_DIMS)) / np.sqrt(TEXT_DIMS)
+        # Última linha zerada: preenchimento dos títulos mais curtos do bloco.
+        projection[-1] = 0.0
+        self.text_projection = projection.astype(np.float32)
+
+        if n_categories <= MAX_CATEGORY_DIMS:
+            # One-hot: categorias diferentes ficam ortogonais, como no score exato.
+            categories = np.eye(max(n_categories, 1))
+        else:
+            categories = rng.standard_normal((n_categories, MAX_CATEGORY_DIMS))
+        self.category_vectors = (categories / np.linalg.norm(categories, axis=1, keepdims=True)).astype(np.float32)
+
+        self.center = np.zeros(self.dims, dtype=np.float32)
+        self.center = self._mean()
+
+    @property
+    def dims(self) -> int:
+        return TEXT_DIMS + self.category_vectors.shape[1] + 4
+
+    @property
+    def nbytes(self) -> int:
+        return self.text_projection.nbytes + self.category_vectors.nbytes + self.center.nbytes
+
+    def _combine(self, text, category, price, rating) -> np.ndarray:
+        scales = self.scales
+        vectors = np.hstack(
+            [scales["title"] * text, scales["category"] * category, scales["price"] * price, scales["rating"] * rating]
+        )
+        return (vectors - self.center).astype(np.float32)
+
+    def _mean(self) -> np.ndarray:
+        # A média é linear nas postings: dispensa materializar todos os vetores.
+        index = self.similarity
+        n_rows = max(len(index), 1)
+        word_mass = np.bincount(index.row_words, weights=index.row_weights, minlength=len(self.text_projection))
+        category_mass = np.bincount(index.category, minlength=len(self.category_vectors))
+        return self._combine(
+            (word_mass @ self.text_projection)[None] / n_rows,
+            (category_mass @ self.category_vectors)[None] / n_rows,
+            _angles(index.price).mean(axis=0, keepdims=True),
+            _angles(index.rating).mean(axis=0, keepdims=True),
+        )[0]
+
+    def _text(self, rows: np.ndarray) -> np.ndarray:
+        index = self.similarity
+        starts = index.row_offsets[rows]
+        lengths = index.row_offsets[rows + 1] - starts
+        text = np.zeros((len(rows), TEXT_DIMS), dtype=np.float32)
+        width = int(lengths.max()) if len(rows) else 0
+        if width == 0:
+            return text
+
+        # Títulos do bloco alinhados em uma matriz linha x palavra: gather + soma densa,
+        # bem mais rápido que espalhar as postings com add.at/reduceat.
+        padding = len(self.text_projection) - 1
+        step = max(EMBEDDING_BLOCK_CELLS // width, 1)
+        columns = np.arange(width)
+        for block in range(0, len(rows), step):
+            block_starts, block_lengths = starts[block:block + step], lengths[block:block + step]
+            valid = columns < block_lengths[:, None]
+            positions = np.where(valid, block_starts[:, None] + columns, 0)
+            words = np.where(valid, index.row_words[positions], padding)
+            weights = np.where(valid, index.row_weights[positions], 0.0).astype(np.float32)
+            text[block:block + step] = np.einsum("rw,rwd->rd", weights, self.text_projection[words])
+        return text
+
+    def embed(self, rows: Sequence[int]) -> np.ndarray:
+        index = self.similarity
+        rows = np.asarray(rows, dtype=np.int64)
+        return self._combine(
+            self._text(rows),
+            self.category_vectors[index.category[rows]],
+            _angles(index.price[rows]),
+            _angles(index.rating[rows]),
+        )
+
+
+class ANNIndex:
+    """Vizinhos aproximados por partição (IVF) dos vetores de ``ContentEmbedding``.
+
+    O k-means é treinado em uma amostra e o catálogo inteiro é atribuído ao
+    centróide mais próximo; as linhas ficam ordenadas por lista (CSR), então o
+    índice guarda só a permutação e os centróides. A consulta calcula o vetor do
+    perfil (média dos livros de origem), sonda as ``probes`` listas mais
+    próximas e reordena só esses candidatos com o score exato. Com ~2·√n listas,
+    cada consulta pontua O(√n) livros em vez do catálogo inteiro.
+    """
+
+    def __init__(
+        self,
+        similarity: SimilarityIndex,
+        weights: Dict[str, float] = DEFAULT_WEIGHTS,
+        lists: Optional[int] = None,
+        probes: int = DEFAULT_PROBES,
+        seed: int = 42,
+    ):
+        n_rows = len(similarity)
+        self.similarity = similarity
+        self.weights = dict(weights)
+        self.embedding = ContentEmbedding(similarity, weights, seed)
+        self.lists = max(min(lists or int(LISTS_PER_SQRT_ROW * np.sqrt(n_rows)), n_rows), 1)
+        self.probes = probes
+
+        rng = np.random.default_rng(seed)
+        sample_size = min(n_rows, self.lists * TRAINING_ROWS_PER_LIST)
+        sample = self.embedding.embed(np.sort(rng.choice(n_rows, sample_size, replace=False)))
+        self.centroids = self._train(sample, rng)
+
+        assignments = np.empty(n_rows, dtype=np.int32)
+        step = 16_384
+        for start in range(0, n_rows, step):
+            rows = np.arange(start, min(start + step, n_rows))
+            assignments[rows] = self._nearest(self.embedding.embed(rows))
+        self.order = np.argsort(assignments, kind="stable").astype(np.int32)
+        self.offsets = np.searchsorted(assignments[self.order], np.arange(self.lists + 1))
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @property
+    def nbytes(self) -> int:
+        return self.order.nbytes + self.offsets.nbytes + self.centroids.nbytes + self.embedding.nbytes
+
+    def _nearest(self, vectors: np.ndarray, centroids: Optional[np.ndarray] = None) -> np.ndarray:
+        centroids = self.centroids if centroids is None else centroids
+        # argmin ||x - c||² = argmax x·c - ||c||²/2
+        return np.argmax(vectors @ centroids.T - 0.5 * np.einsum("cd,cd->c", centroids, centroids), axis=1)
+
+    def _train(self, sample: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        centroids = sample[rng.choice(len(sample), self.lists, replace=False)].copy()
+        dims = sample.shape[1]
+        for _ in range(KMEANS_ITERATIONS):
+            assigned = self._nearest(sample, centroids)
+            counts = np.bincount(assigned, minlength=self.lists)
+            cells = (assigned[:, None] * dims + np.arange(dims)).ravel()
+            sums = np.bincount(cells, weights=sample.ravel(), minlength=self.lists * dims).reshape(self.lists, dims)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            # Lista vazia recomeça de um ponto qualquer da amostra.
+            centroids[~filled] = sample[rng.choice(len(sample), int((~filled).sum()))]
+        return centroids.astype(np.float32)
+
+    def candidates(self, rows: Sequence[int], probes: Optional[int] = None) -> np.ndarray:
+        """Linhas das listas mais próximas do perfil de ``rows``."""
+        probes = min(probes or self.probes, self.lists)
+        profile = self.embedding.embed(rows).mean(axis=0)
+        distances = 0.5 * np.einsum("cd,cd->c", self.centroids, self.centroids) - self.centroids @ profile
+        nearest = np.argpartition(distances, probes - 1)[:probes]
+        return np.concatenate([self.order[self.offsets[lst]:self.offsets[lst + 1]] for lst in nearest]).astype(np.int64)
+
+    def similar(
+        self,
+        rows: Sequence[int],
+        k: int,
+        weights: Dict[str, float] = DEFAULT_WEIGHTS,
+        probes: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Mesmo contrato de ``SimilarityIndex.similar``, pontuando só os candidatos das listas sondadas.
+
+        Os vetores (e as listas) foram montados para os pesos do índice; com
+        outros pesos o recall deixaria de ser o medido, então a busca é exata.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if dict(weights) != self.weights:
+            return self.similarity.similar(rows, k, weights)
+        candidates = self.candidates(rows, probes)
+        candidates = candidates[~np.isin(candidates, rows)]
+        if len(candidates) < k:
+            # Listas pequenas demais para o k pedido: cai para a busca exata.
+            return self.similarity.similar(rows, k, weights)
+
+        scores = np.mean([self.similarity.scores_for(int(row), candidates, weights) for row in rows], axis=0)
+        return top_k(candidates, scores, k)
+
+
+def _angles(values: np.ndarray) -> np.ndarray:
+    """Valores em [0, 1] como pontos do quarto de círculo."""
+    radians = values.astype(np.float64) * (np.pi / 2)
+    return np.column_stack([np.cos(radians), np.sin(radians)])
@@ -0,0 +1,23 @@
+import pandas as pd
+
+FEATURE_COLUMNS = [
+    'id', 'title', 'price', 'rating', 'category',
+    'in_stock', 'price_normalized', 'rating_normalized', 'category_encoded'
+]
+
+
+def ml_feature_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Features de ``/ml/features``: preço min-max, rating / 5 e categoria codificada por ordem de aparição."""
+    df_ml = df.copy()
+    
+    price_min = df_ml['price'].min()
+    price_max = df_ml['price'].max()
+    df_ml['price_normalized'] = (df_ml['price'] - price_min) / (price_max - price_min)
+    
+    df_ml['rating_normalized'] = df_ml['rating'] / 5.0
+    
+    categories = df_ml['category'].unique()
+    category_map = {cat: idx for idx, cat in enumerate(categories)}
+    df_ml['category_encoded'] = df_ml['category'].map(category_map)
+    
+    return df_ml[FEATURE_COLUMNS]
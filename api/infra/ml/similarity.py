@@ -0,0 +1,127 @@
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from api.infra.ml.features import ml_feature_frame
+from api.infra.storage.fuzzy import FuzzyTitleIndex
+
+DEFAULT_WEIGHTS = {"title": 0.6, "category": 0.2, "price": 0.1, "rating": 0.1}
+
+
+class SimilarityIndex:
+    """Livros parecidos por conteúdo: TF-IDF dos títulos combinado com as features de ``/ml/features``.
+
+    Tudo que não depende da consulta é montado uma vez por snapshot: pesos
+    TF-IDF já normalizados por livro (sobre as postings do índice de títulos,
+    sem tokenizar de novo), a transposta livro → palavras e as features densas.
+    Uma consulta soma as postings das palavras do livro (produto escalar
+    esparso contra todo o catálogo), combina com as distâncias de preço, rating
+    e categoria em uma passada vetorizada e extrai o top-k com ``argpartition``.
+    """
+
+    def __init__(self, df: pd.DataFrame, titles: FuzzyTitleIndex):
+        n_rows = len(df)
+        lengths = np.diff(titles.offsets)
+        post_words = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+        post_rows = titles.post_rows
+
+        # Mesma suavização do TfidfVectorizer; títulos quase não repetem palavras, então o TF é binário.
+        idf = np.log((1 + n_rows) / (1 + lengths)) + 1.0
+        norms = np.sqrt(np.bincount(post_rows, weights=idf[post_words] ** 2, minlength=n_rows))
+        norms[norms == 0] = 1.0
+
+        self.post_rows = post_rows
+        self.offsets = titles.offsets
+        self.post_weights = (idf[post_words] / norms[post_rows]).astype(np.float32)
+
+        order = np.argsort(post_rows, kind="stable")
+        self.row_words = post_words[order]
+        self.row_weights = self.post_weights[order]
+        self.row_offsets = np.searchsorted(post_rows[order], np.arange(n_rows + 1))
+
+        features = ml_feature_frame(df)
+        self.price = np.nan_to_num(features["price_normalized"].to_numpy(dtype=np.float32))
+        self.rating = np.nan_to_num(features["rating_normalized"].to_numpy(dtype=np.float32))
+        self.category = features["category_encoded"].to_numpy(dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @property
+    def nbytes(self) -> int:
+        # post_rows e offsets pertencem ao índice de títulos.
+        return (
+            self.post_weights.nbytes
+            + self.row_words.nbytes
+            + self.row_weights.nbytes
+            + self.row_offsets.nbytes
+            + self.price.nbytes
+            + self.rating.nbytes
+            + self.category.nbytes
+        )
+
+    def row_words_of(self, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Palavras (ids crescentes) e pesos TF-IDF normalizados do título de ``row``."""
+        start, end = self.row_offsets[row], self.row_offsets[row + 1]
+        return self.row_words[start:end], self.row_weights[start:end]
+
+    def title_scores(self, row: int) -> np.ndarray:
+        """Cosseno TF-IDF entre o título de ``row`` e todos os títulos."""
+        words, word_weights = self.row_words_of(row)
+        spans = [slice(self.offsets[word], self.offsets[word + 1]) for word in words]
+        if not spans:
+            return np.zeros(len(self), dtype=np.float64)
+
+        rows = np.concatenate([self.post_rows[span] for span in spans])
+        contributions = np.concatenate([self.post_weights[span] * weight for span, weight in zip(spans, word_weights)])
+        return np.bincount(rows, weights=contributions, minlength=len(self))
+
+    def title_scores_for(self, row: int, candidates: np.ndarray) -> np.ndarray:
+        """Cosseno TF-IDF entre ``row`` e apenas as linhas em ``candidates``, percorrendo os títulos delas."""
+        words, word_weights = self.row_words_of(row)
+        starts = self.row_offsets[candidates]
+        lengths = self.row_offsets[candidates + 1] - starts
+        if not len(words) or not lengths.sum():
+            return np.zeros(len(candidates), dtype=np.float64)
+
+        owners = np.repeat(np.arange(len(candidates)), lengths)
+        positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+        candidate_words = self.row_words[positions]
+        found = np.minimum(np.searchsorted(words, candidate_words), len(words) - 1)
+        matches = words[found] == candidate_words
+        contributions = np.where(matches, self.row_weights[positions] * word_weights[found], 0.0)
+        return np.bincount(owners, weights=contributions, minlength=len(candidates))
+
+    def _feature_scores(self, row: int, title: np.ndarray, rows, weights: Dict[str, float]) -> np.ndarray:
+        scores = weights.get("title", 0.0) * title
+        scores += weights.get("price", 0.0) * (1.0 - np.abs(self.price[rows] - self.price[row]))
+        scores += weights.get("rating", 0.0) * (1.0 - np.abs(self.rating[rows] - self.rating[row]))
+        scores += weights.get("category", 0.0) * (self.category[rows] == self.category[row])
+        return scores
+
+    def scores(self, row: int, weights: Dict[str, float] = DEFAULT_WEIGHTS) -> np.ndarray:
+        return self._feature_scores(row, self.title_scores(row), slice(None), weights)
+
+    def scores_for(self, row: int, candidates: np.ndarray, weights: Dict[str, float] = DEFAULT_WEIGHTS) -> np.ndarray:
+        return self._feature_scores(row, self.title_scores_for(row, candidates), candidates, weights)
+
+    def similar(
+        self, rows: Sequence[int], k: int, weights: Dict[str, float] = DEFAULT_WEIGHTS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """As ``k`` linhas mais parecidas com ``rows`` (score médio, excluindo elas), da mais para a menos parecida."""
+        rows = np.asarray(rows, dtype=np.int64)
+        scores = np.mean([self.scores(int(row), weights) for row in rows], axis=0)
+        scores[rows] = -np.inf
+        return top_k(np.arange(len(self)), scores, k)
+
+
+def top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """As ``k`` maiores notas (ignorando ``-inf``), ordenadas por nota decrescente e linha."""
+    k = min(k, int(np.count_nonzero(np.isfinite(scores))))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.lexsort((rows[top], -scores[top]))]
+    return rows[top], scores[top]
@@ -0,0 +1,534 @@
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from api.core.config import get_settings
+from api.core.tracing import current_traceparent, get_tracer
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    # Sem flock (Windows) o single-flight vale apenas dentro do processo.
+    fcntl = None
+    HAS_FCNTL = False
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (PENDING, RUNNING)
+JOB_DATETIME_FIELDS = ("created_at", "started_at", "finished_at")
+
+
+def _scrape_worker(
+    base_url: str,
+    output_path: str,
+    niceness: int,
+    events,
+    cancel_event,
+    traceparent: Optional[str] = None,
+) -> None:
+    # Executa em processo separado (spawn): nada do estado da API é herdado.
+    from api.infra.scraping.scraper import BooksScraper, ScrapingCancelledError
+
+    if niceness and hasattr(os, "nice"):
+        try:
+            os.nice(niceness)
+        except OSError:
+            pass
+
+    events.put({"type": "started", "pid": os.getpid()})
+
+    # O span do job continua o trace da requisição que disparou o scraping.
+    tracer = get_tracer()
+    try:
+        with tracer.start_span("scraper.job", traceparent=traceparent, base_url=base_url):
+            scraper = BooksScraper(base_url)
+            df_books = scraper.scrape_all_books(
+                progress_callback=lambda progress: events.put({"type": "progress", **progress}),
+                should_stop=cancel_event.is_set,
+            )
+
+            if df_books.empty:
+                events.put({"type": "failed", "error": "Nenhum livro extraído"})
+                return
+
+            # Escreve em arquivo temporário e troca atomicamente para que a API
+            # nunca leia um arquivo parcialmente escrito; o formato segue a
+            # extensão do destino, a mesma usada pelo loader.
+            tmp_path = f"{output_path}.tmp"
+            scraper.save(df_books, tmp_path, fmt="parquet" if Path(output_path).suffix == ".parquet" else "csv")
+            os.replace(tmp_path, output_path)
+
+        events.put({"type": "completed", "books_found": len(df_books)})
+    except ScrapingCancelledError:
+        events.put({"type": "cancelled"})
+    except Exception as e:
+        events.put({"type": "failed", "error": str(e)})
+    finally:
+        tracer.shutdown()
+
+
+class ScrapeLock:
+    """Lock de arquivo (``flock``) ao lado do arquivo de dados: um scraping por vez entre processos.
+
+    Vale para todos os workers do uvicorn e instâncias que compartilham o
+    mesmo DATA_PATH. O sistema libera o lock se o processo dono morrer. O
+    arquivo guarda o job em execução, para que os demais processos o reportem.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file = None
+
+    def acquire(self, holder: Dict[str, any]) -> bool:
+        if not HAS_FCNTL:
+            return True
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.path, "a+", encoding="utf-8")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        lock_file.truncate(0)
+        json.dump(holder, lock_file)
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        lock_file, self._file = self._file, None
+        if lock_file is not None:
+            lock_file.truncate(0)
+            lock_file.close()
+
+    def holder(self) -> Dict[str, any]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8") or "{}")
+        except (OSError, ValueError):
+            return {}
+
+    def is_held(self) -> bool:
+        """Se algum processo (inclusive este) detém o lock; sem flock, presume que sim."""
+        if self._file is not None or not HAS_FCNTL:
+            return True
+        try:
+            with open(self.path, "a+", encoding="utf-8") as probe:
+                fcntl.flock(probe.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except OSError:
+            return True
+        return False
+
+
+@dataclass
+class ScrapeJob:
+    id: str
+    triggered_by: Optional[str]
+    status: str = PENDING
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    pages_fetched: int = 0
+    books_found: int = 0
+    categories_done: int = 0
+    categories_total: int = 0
+    cancel_requested: bool = False
+    error: Optional[str] = None
+    pid: Optional[int] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if not self.started_at:
+            return 0.0
+        end = self.finished_at or datetime.utcnow()
+        return max((end - self.started_at).total_seconds(), 0.0)
+
+    @property
+    def pages_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.pages_fetched / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        if not self.is_active:
+            return 0.0 if self.status == COMPLETED else None
+        if self.categories_done == 0 or self.categories_total == 0:
+            return None
+        remaining = self.categories_total - self.categories_done
+        return self.elapsed_seconds / self.categories_done * remaining
+
+    def to_dict(self) -> Dict[str, any]:
+        eta = self.eta_seconds
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "triggered_by": self.triggered_by,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "pages_fetched": self.pages_fetched,
+            "books_found": self.books_found,
+            "categories_done": self.categories_done,
+            "categories_total": self.categories_total,
+            "pages_per_second": round(self.pages_per_second, 3),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "cancel_requested": self.cancel_requested,
+            "error": self.error,
+        }
+
+    def to_state(self) -> Dict[str, any]:
+        state = asdict(self)
+        for name in JOB_DATETIME_FIELDS:
+            if state[name] is not None:
+                state[name] = state[name].isoformat()
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, any]) -> "ScrapeJob":
+        state = dict(state)
+        for name in JOB_DATETIME_FIELDS:
+            if state.get(name):
+                state[name] = datetime.fromisoformat(state[name])
+        return cls(**state)
+
+
+class SharedJobState:
+    """Último job gravado ao lado do arquivo de dados, legível por qualquer processo.
+
+    O processo dono do ``ScrapeLock`` grava o job a cada evento (troca atômica);
+    os demais o consultam em ``get``/``list_jobs`` e pedem o cancelamento
+    gravando o id do job em ``<arquivo>.cancel``, verificado pelo monitor do dono.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.cancel_path = Path(f"{path}.cancel")
+
+    def write(self, job: ScrapeJob) -> None:
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(job.to_state()), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o estado do job {job.id}: {e}")
+
+    def read(self) -> Optional[ScrapeJob]:
+        try:
+            return ScrapeJob.from_state(json.loads(self.path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def request_cancel(self, job_id: str) -> None:
+        self.cancel_path.write_text(job_id, encoding="utf-8")
+
+    def cancel_requested(self, job_id: str) -> bool:
+        try:
+            return self.cancel_path.read_text(encoding="utf-8") == job_id
+        except OSError:
+            return False
+
+    def clear_cancel(self) -> None:
+        self.cancel_path.unlink(missing_ok=True)
+
+
+class ScrapeJobManager:
+    """Executa scrapings em um processo separado, um de cada vez (single-flight).
+
+    Dentro do processo o job ativo é reaproveitado; entre processos, o
+    ``ScrapeLock`` ao lado de ``output_path`` impede um segundo scraping e o
+    ``SharedJobState`` permite consultar e cancelar o job a partir de qualquer
+    worker.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        output_path: str,
+        niceness: int = 10,
+        history_size: int = 20,
+        cancel_grace_seconds: float = 10.0,
+    ):
+        self.base_url = base_url
+        self.output_path = output_path
+        self.niceness = niceness
+        self.history_size = history_size
+        self.cancel_grace_seconds = cancel_grace_seconds
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ScrapeJob]" = OrderedDict()
+        self._active_id: Optional[str] = None
+        self._cancel_events: Dict[str, any] = {}
+        self._processes: Dict[str, multiprocessing.process.BaseProcess] = {}
+        self._file_lock = ScrapeLock(f"{output_path}.lock")
+        self._shared = SharedJobState(f"{output_path}.job.json")
+
+    def start(
+        self,
+        triggered_by: Optional[str] = None,
+        on_complete: Optional[Callable[[], None]] = None,
+    ) -> Tuple[ScrapeJob, bool]:
+        with self._lock:
+            active = self._jobs.get(self._active_id) if self._active_id else None
+            if active and active.is_active:
+                logger.info(f"Scraping já em execução (job {active.id}), reaproveitando")
+                return active, False
+
+            job = ScrapeJob(id=uuid.uuid4().hex, triggered_by=triggered_by)
+            holder = {
+                "job_id": job.id,
+                "triggered_by": triggered_by,
+                "pid": os.getpid(),
+                "started_at": job.created_at.isoformat(),
+            }
+            if not self._file_lock.acquire(holder):
+                running = self._running_elsewhere()
+                logger.info(f"Scraping já em execução em outro processo (job {running.id}), reaproveitando")
+                return running, False
+
+            events = self._ctx.Queue()
+            cancel_event = self._ctx.Event()
+
+            Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+            process = self._ctx.Process(
+                target=_scrape_worker,
+                args=(self.base_url, self.output_path, self.niceness, events, cancel_event, current_traceparent()),
+                name=f"scrape-{job.id[:8]}",
+                daemon=True,
+            )
+
+            self._jobs[job.id] = job
+            self._active_id = job.id
+            self._cancel_events[job.id] = cancel_event
+            self._processes[job.id] = process
+            self._trim_history()
+
+            self._shared.clear_cancel()
+            try:
+                process.start()
+            except Exception as e:
+                self._active_id = None
+                job.status = FAILED
+                job.error = str(e)
+                self._shared.write(job)
+                self._file_lock.release()
+                raise
+            job.started_at = datetime.utcnow()
+            job.status = RUNNING
+            self._shared.write(job)
+
+        threading.Thread(
+            target=self._monitor,
+            args=(job, process, events, on_complete),
+            name=f"scrape-monitor-{job.id[:8]}",
+            daemon=True,
+        ).start()
+
+        logger.info(f"Job de scraping {job.id} iniciado (pid {process.pid})")
+        return job, True
+
+    def _running_elsewhere(self) -> ScrapeJob:
+        holder = self._file_lock.holder()
+        shared = self._shared_job()
+        if shared and shared.id == holder.get("job_id"):
+            return shared
+
+        # O dono acabou de pegar o lock e ainda não gravou o estado do job.
+        started_at = holder.get("started_at")
+        return ScrapeJob(
+            id=holder.get("job_id") or "unknown",
+            triggered_by=holder.get("triggered_by"),
+            status=RUNNING,
+            created_at=datetime.fromisoformat(started_at) if started_at else datetime.utcnow(),
+            started_at=datetime.fromisoformat(started_at) if started_at else None,
+            pid=holder.get("pid"),
+        )
+
+    def _shared_job(self) -> Optional[ScrapeJob]:
+        """Último job gravado por qualquer processo; ativo sem dono do lock, o processo dono morreu."""
+        job = self._shared.read()
+        if job and job.is_active and not self._file_lock.is_held():
+            job.status = FAILED
+            job.error = "Processo que executava o scraping foi encerrado"
+        return job
+
+    def get(self, job_id: str) -> Optional[ScrapeJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job:
+            return job
+        shared = self._shared_job()
+        return shared if shared and shared.id == job_id else None
+
+    def list_jobs(self) -> List[ScrapeJob]:
+        with self._lock:
+            jobs = list(reversed(self._jobs.values()))
+        shared = self._shared_job()
+        if shared and all(job.id != shared.id for job in jobs):
+            jobs.insert(0, shared)
+        return jobs
+
+    def cancel(self, job_id: str) -> Optional[ScrapeJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            requested = bool(job and job.is_active)
+            if requested:
+                job.cancel_requested = True
+                self._cancel_events[job_id].set()
+                self._shared.write(job)
+        if requested:
+            logger.info(f"Cancelamento solicitado para o job {job_id}")
+        if job:
+            return job
+
+        # Job de outro processo: o monitor do dono lê o pedido e cancela.
+        shared = self._shared_job()
+        if not shared or shared.id != job_id:
+            return None
+        if shared.is_active:
+            self._shared.request_cancel(job_id)
+            shared.cancel_requested = True
+            logger.info(f"Cancelamento solicitado para o job {job_id} em outro processo")
+        return shared
+
+    def shutdown(self) -> None:
+        with self._lock:
+            active_ids = [job.id for job in self._jobs.values() if job.is_active]
+        for job_id in active_ids:
+            self.cancel(job_id)
+            process = self._processes.get(job_id)
+            if process:
+                process.join(self.cancel_grace_seconds)
+                if process.is_alive():
+                    process.terminate()
+
+    def _trim_history(self) -> None:
+        while len(self._jobs) > self.history_size:
+            oldest_id = next(iter(self._jobs))
+            if self._jobs[oldest_id].is_active:
+                break
+            self._jobs.pop(oldest_id)
+            self._cancel_events.pop(oldest_id, None)
+            self._processes.pop(oldest_id, None)
+
+    def _apply_event(self, job: ScrapeJob, event: Dict[str, any]) -> Optional[Dict[str, any]]:
+        event_type = event.get("type")
+        if event_type in (COMPLETED, CANCELLED, FAILED):
+            # O status final só é publicado em _finish, depois do reload dos dados.
+            return event
+
+        with self._lock:
+            if event_type == "started":
+                job.pid = event.get("pid")
+            elif event_type == "progress":
+                job.pages_fetched = event["pages_fetched"]
+                job.books_found = event["books_found"]
+                job.categories_done = event["categories_done"]
+                job.categories_total = event["categories_total"]
+            self._shared.write(job)
+        return None
+
+    def _monitor(self, job: ScrapeJob, process, events, on_complete) -> None:
+        outcome = None
+        cancel_deadline = None
+
+        while True:
+            if not job.cancel_requested and self._shared.cancel_requested(job.id):
+                self.cancel(job.id)
+
+            try:
+                outcome = self._apply_event(job, events.get(timeout=0.5)) or outcome
+                continue
+            except queue.Empty:
+                pass
+
+            if not process.is_alive():
+                break
+
+            if job.cancel_requested:
+                cancel_deadline = cancel_deadline or time.monotonic() + self.cancel_grace_seconds
+                if time.monotonic() > cancel_deadline:
+                    logger.warning(f"Job {job.id} não respondeu ao cancelamento, encerrando processo")
+                    process.terminate()
+
+        process.join()
+
+        while True:
+            try:
+                outcome = self._apply_event(job, events.get_nowait()) or outcome
+            except queue.Empty:
+                break
+
+        self._finish(job, process, outcome, on_complete)
+
+    def _finish(self, job: ScrapeJob, process, outcome: Optional[Dict[str, any]], on_complete) -> None:
+        status = outcome["type"] if outcome else (CANCELLED if job.cancel_requested else FAILED)
+        error = outcome.get("error") if outcome else None
+        if not outcome and status == FAILED:
+            error = f"Processo de scraping encerrado (exit code {process.exitcode})"
+
+        if status == COMPLETED and on_complete:
+            try:
+                on_complete()
+            except Exception as e:
+                status = FAILED
+                error = f"Erro ao recarregar dados após scraping: {e}"
+                logger.error(error)
+
+        with self._lock:
+            if status == COMPLETED:
+                job.books_found = outcome.get("books_found", job.books_found)
+            job.status = status
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            if self._active_id == job.id:
+                self._active_id = None
+                # Estado final gravado antes de liberar o lock: quem o pegar em seguida não vê um job órfão.
+                self._shared.write(job)
+                self._shared.clear_cancel()
+                self._file_lock.release()
+
+        logger.info(
+            f"Job de scraping {job.id} finalizado: {job.status} "
+            f"({job.pages_fetched} páginas, {job.books_found} livros, {job.elapsed_seconds:.1f}s)"
+        )
+
+
+_manager_instance: Optional[ScrapeJobManager] = None
+
+
+def get_job_manager() -> ScrapeJobManager:
+    global _manager_instance
+    if _manager_instance is None:
+        settings = get_settings()
+        _manager_instance = ScrapeJobManager(
+            base_url=settings.scraping_url,
+            output_path=settings.data_path,
+            niceness=settings.scraping_worker_niceness,
+            history_size=settings.scraping_job_history,
+            cancel_grace_seconds=settings.scraping_cancel_grace_seconds,
+        )
+    return _manager_instance
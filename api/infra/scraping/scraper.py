@@ -3,10 +3,12 @@ from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import logging
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 from pathlib import Path
 import re
 
+from api.core.tracing import SPAN_KIND_CLIENT, start_span
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -14,6 +16,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class ScrapingCancelledError(Exception):
+    pass
+
+
 class BooksScraper:
     BASE_URL = "https://books.toscrape.com"
     RATING_MAP = {
@@ -24,13 +30,23 @@ class BooksScraper:
         'Five': 5
     }
     
-    def __init__(self, base_url: str = None):
+    def __init__(self, base_url: str = None, page_delay: float = 0.3, category_delay: float = 0.5):
         self.base_url = base_url or self.BASE_URL
+        self.page_delay = page_delay
+        self.category_delay = category_delay
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         
+    def _fetch_soup(self, url: str) -> BeautifulSoup:
+        with start_span("scraper.fetch", kind=SPAN_KIND_CLIENT, **{"http.url": url}) as span:
+            response = self.session.get(url, timeout=10)
+            span.set_attribute("http.status_code", response.status_code)
+            response.raise_for_status()
+        with start_span("scraper.parse", **{"http.response_size": len(response.content)}):
+            return BeautifulSoup(response.content, 'lxml')
+    
     def _extract_rating(self, book_element) -> int:
         star_rating = book_element.find('p', class_='star-rating')
         if star_rating:
@@ -63,9 +79,7 @@ class BooksScraper:
     
     def scrape_book_details(self, book_url: str) -> Dict[str, any]:
         try:
-            response = self.session.get(book_url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
+            soup = self._fetch_soup(book_url)
             
             product_info = {}
             table = soup.find('table', class_='table-striped')
@@ -99,10 +113,7 @@ class BooksScraper:
     def scrape_page(self, page_url: str) -> List[Dict[str, any]]:
         try:
             logger.info(f"Extraindo página: {page_url}")
-            response = self.session.get(page_url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'lxml')
+            soup = self._fetch_soup(page_url)
             books = self._extract_books_from_soup(soup)
             
             logger.info(f"Total de livros extraídos da página: {len(books)}")
@@ -113,6 +124,10 @@ class BooksScraper:
             return []
     
     def _extract_books_from_soup(self, soup: BeautifulSoup) -> List[Dict[str, any]]:
+        with start_span("scraper.extract"):
+            return self._extract_books(soup)
+    
+    def _extract_books(self, soup: BeautifulSoup) -> List[Dict[str, any]]:
         books = []
         book_elements = soup.find_all('article', class_='product_pod')
         
@@ -161,18 +176,25 @@ class BooksScraper:
         
         return books
     
-    def scrape_category(self, category_url: str, category_name: str) -> List[Dict[str, any]]:
+    def scrape_category(
+        self,
+        category_url: str,
+        category_name: str,
+        on_page: Optional[Callable[[int], None]] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> List[Dict[str, any]]:
         all_books = []
         current_url = category_url
         page_num = 1
         
         while current_url:
+            if should_stop and should_stop():
+                raise ScrapingCancelledError(f"Scraping cancelado na categoria '{category_name}'")
+            
             logger.info(f"Extraindo categoria '{category_name}' - Página {page_num}")
             
             try:
-                response = self.session.get(current_url, timeout=10)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'lxml')
+                soup = self._fetch_soup(current_url)
                 
                 books = self._extract_books_from_soup(soup)
                 
@@ -182,6 +204,9 @@ class BooksScraper:
                 all_books.extend(books)
                 logger.info(f"✓ {len(books)} livros extraídos desta página")
                 
+                if on_page:
+                    on_page(len(books))
+                
                 next_button = soup.find('li', class_='next')
                 if next_button:
                     next_link = next_button.find('a')
@@ -190,7 +215,8 @@ class BooksScraper:
                         base_category_url = current_url.rsplit('/', 1)[0]
                         current_url = f"{base_category_url}/{next_relative_url}"
                         page_num += 1
-                        time.sleep(0.3)
+                        if self.page_delay:
+                            time.sleep(self.page_delay)
                     else:
                         current_url = None
                 else:
@@ -208,10 +234,7 @@ class BooksScraper:
         
         try:
             logger.info("Obtendo lista de categorias...")
-            response = self.session.get(f"{self.base_url}/index.html", timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'lxml')
+            soup = self._fetch_soup(f"{self.base_url}/index.html")
             category_list = soup.find('ul', class_='nav-list')
             
             if category_list:
@@ -234,7 +257,12 @@ class BooksScraper:
         
         return categories
     
-    def scrape_all_books(self, use_cache: bool = True) -> pd.DataFrame:
+    def scrape_all_books(
+        self,
+        use_cache: bool = True,
+        progress_callback: Optional[Callable[[Dict[str, any]], None]] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> pd.DataFrame:
         logger.info("🚀 Iniciando scraping completo do site (MODO OTIMIZADO)...")
         logger.info("Otimizações ativas:")
         logger.info("  ✓ Eliminação de requisições HTTP duplicadas")
@@ -246,7 +274,23 @@ class BooksScraper:
         categories = self.get_all_categories()
         
         start_time = time.time()
-        total_requests = 0
+        progress = {
+            'pages_fetched': 0,
+            'books_found': 0,
+            'categories_done': 0,
+            'categories_total': len(categories),
+        }
+        
+        def _report():
+            if progress_callback:
+                progress_callback(dict(progress))
+        
+        def _on_page(books_in_page: int):
+            progress['pages_fetched'] += 1
+            progress['books_found'] += books_in_page
+            _report()
+        
+        _report()
         
         for idx, category in enumerate(categories, 1):
             category_start = time.time()
@@ -255,13 +299,23 @@ class BooksScraper:
             logger.info(f"Categoria {idx}/{len(categories)}: {category['name']}")
             logger.info(f"{'='*60}")
             
-            books = self.scrape_category(category['url'], category['name'])
+            with start_span("scraper.category", category=category['name']):
+                books = self.scrape_category(
+                    category['url'],
+                    category['name'],
+                    on_page=_on_page,
+                    should_stop=should_stop,
+                )
             all_books.extend(books)
             
+            progress['categories_done'] = idx
+            _report()
+            
             category_time = time.time() - category_start
             logger.info(f"⏱️  Tempo da categoria: {category_time:.2f}s")
             
-            time.sleep(0.5)
+            if self.category_delay:
+                time.sleep(self.category_delay)
         
         df = pd.DataFrame(all_books)
         
@@ -281,6 +335,26 @@ class BooksScraper:
         
         return df
     
+    def save(self, df: pd.DataFrame, filepath: str, fmt: Optional[str] = None):
+        """Salva no formato pedido ou, sem ``fmt``, no da extensão (``.parquet``; qualquer outra vira CSV), como o loader lê."""
+        fmt = fmt or ("parquet" if Path(filepath).suffix == ".parquet" else "csv")
+        if fmt == "parquet":
+            self.save_to_parquet(df, filepath)
+        elif fmt == "csv":
+            self.save_to_csv(df, filepath)
+        else:
+            raise ValueError(f"Formato não suportado: {fmt}")
+
+    def save_to_parquet(self, df: pd.DataFrame, filepath: str):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Formato parquet requer pyarrow. Execute: pip install pyarrow")
+
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(filepath, index=False)
+        logger.info(f"Dados salvos com sucesso em: {filepath}")
+
     def save_to_csv(self, df: pd.DataFrame, filepath: str):
         try:
             Path(filepath).parent.mkdir(parents=True, exist_ok=True)
@@ -1,31 +1,181 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Any, BinaryIO, Callable, Optional, List, Dict, Sequence, Tuple
 import logging
+import time
+
+from api.core.metrics import record_snapshot, timed_index_build, timed_operation, timed_stage
+from api.infra.ml.features import ml_feature_frame
+from api.infra.ml.similarity import DEFAULT_WEIGHTS
+from api.infra.storage.indexes import (
+    DEFAULT_SORT,
+    PRICE_SORT,
+    RELEVANCE_SORT,
+    BooksSnapshot,
+    Cursor,
+    bits_contain,
+    popcount,
+    unpack_bits,
+)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PRICE_BUCKETS = (10.0, 20.0, 30.0, 40.0, 50.0)
+SIMILAR_BOOK_COLUMNS = ("id", "title", "price", "rating", "category", "in_stock")
+
+
+def _to_records(df: pd.DataFrame) -> List[Dict]:
+    with timed_stage("to_dict"):
+        return df.to_dict('records')
+
+
+def _take(df: pd.DataFrame, rows, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Linhas da página já restritas às colunas pedidas, antes de qualquer ``to_dict``."""
+    if columns is None:
+        return df.iloc[rows]
+    return df.iloc[rows, df.columns.get_indexer(columns)]
+
+
+def content_version(f: BinaryIO) -> int:
+    """Versão derivada do conteúdo do arquivo: os mesmos dados geram a mesma versão em qualquer worker ou réplica.
+
+    Cabe em 48 bits, então segue exata em JSON (cursores) e no gauge do Prometheus.
+    Lê ``f`` inteiro e o devolve posicionado no início.
+    """
+    digest = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=6))
+    f.seek(0)
+    return int.from_bytes(digest.digest(), "big")
+
+
+_MISSING = object()
+
+
+def _memoized(memo: Optional[Dict[Tuple, Any]], key: Tuple, compute: Callable[[], Any]) -> Any:
+    """``compute()`` uma única vez por chave dentro de um lote de buscas; sem lote, sempre calcula."""
+    if memo is None:
+        return compute()
+    value = memo.get(key, _MISSING)
+    if value is _MISSING:
+        value = memo[key] = compute()
+    return value
+
+
+def _file_key(stat: os.stat_result) -> Tuple[int, int, int]:
+    # os.replace troca o inode; edições no lugar mudam tamanho ou mtime.
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
 
 class BooksDatabase:
     def __init__(self, data_path: str = "data/books.csv"):
         self.data_path = Path(data_path)
         self._df: Optional[pd.DataFrame] = None
+        self._snapshot: Optional[BooksSnapshot] = None
+        self.data_version = 0
+        self._loaded_at = time.time()
+        self._file_key: Optional[Tuple[int, int, int]] = None
+        self._reload_lock = threading.Lock()
+        self._watch_stop: Optional[threading.Event] = None
+        self._watcher: Optional[threading.Thread] = None
         self._load_data()
     
     def _load_data(self):
+        version = 0
+        snapshot = None
+        file_key = None
         try:
             if self.data_path.exists():
-                self._df = pd.read_csv(self.data_path)
-                logger.info(f"Dados carregados com sucesso: {len(self._df)} livros")
+                # Versão e dados lidos do mesmo arquivo aberto: uma troca via os.replace no meio não os separa.
+                with open(self.data_path, "rb") as f:
+                    file_key = _file_key(os.fstat(f.fileno()))
+                    with timed_index_build("version"):
+                        version = content_version(f)
+                    with timed_index_build("load"):
+                        if self.data_path.suffix == ".parquet":
+                            import pyarrow.parquet as pq
+
+                            # Colunas em um único chunk: o take das páginas por índice
+                            # fica ~20x mais lento em ChunkedArrays com vários chunks.
+                            df = pq.read_table(f).combine_chunks().to_pandas()
+                        else:
+                            df = pd.read_csv(f)
+                if df.empty:
+                    version = 0
+                else:
+                    snapshot = BooksSnapshot(df, version)
+                logger.info(f"Dados carregados com sucesso: {len(df)} livros")
             else:
                 logger.warning(f"Arquivo de dados não encontrado: {self.data_path}")
-                self._df = pd.DataFrame()
+                df = pd.DataFrame()
         except Exception as e:
             logger.error(f"Erro ao carregar dados: {e}")
-            self._df = pd.DataFrame()
+            df = pd.DataFrame()
+
+        # DataFrame e índices são publicados juntos, só depois de prontos.
+        self._snapshot = snapshot
+        self._df = df
+        self.data_version = version
+        self._file_key = file_key
+        self._loaded_at = time.time()
+        record_snapshot(
+            rows=len(df),
+            memory_bytes=int(df.memory_usage(deep=True).sum()) + (snapshot.index_nbytes if snapshot else 0),
+            version=version,
+            loaded_at=self._loaded_at,
+        )
     
     def reload_data(self):
-        self._load_data()
+        with self._reload_lock:
+            self._load_data()
+
+    def reload_if_changed(self) -> bool:
+        """Recarrega se o arquivo mudou desde a última carga (ex.: scraping concluído por outro worker).
+
+        Arquivo com os mesmos metadados não é lido; com metadados novos, só recarrega se a versão de conteúdo mudou.
+        """
+        with self._reload_lock:
+            try:
+                with open(self.data_path, "rb") as f:
+                    file_key = _file_key(os.fstat(f.fileno()))
+                    if file_key == self._file_key:
+                        return False
+                    if content_version(f) == self.data_version:
+                        self._file_key = file_key
+                        return False
+            except FileNotFoundError:
+                if self._file_key is None:
+                    return False
+
+            logger.info(f"Arquivo de dados alterado, recarregando: {self.data_path}")
+            self._load_data()
+            return True
+
+    def watch(self, interval_seconds: float) -> None:
+        """Verifica o arquivo a cada ``interval_seconds`` em uma thread daemon (0 desativa)."""
+        if interval_seconds <= 0 or self._watcher is not None:
+            return
+
+        stop = self._watch_stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval_seconds):
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    logger.error(f"Erro ao verificar arquivo de dados: {e}")
+
+        self._watcher = threading.Thread(target=run, name="data-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            self._watch_stop.set()
+            watcher.join()
     
     @property
     def df(self) -> pd.DataFrame:
@@ -33,6 +183,10 @@ class BooksDatabase:
             self._load_data()
         return self._df
     
+    @property
+    def data_age_seconds(self) -> float:
+        return time.time() - self._loaded_at
+
     @property
     def total_books(self) -> int:
         if not self.is_available():
@@ -41,24 +195,126 @@ class BooksDatabase:
     
     def is_available(self) -> bool:
         return self._df is not None and not self._df.empty
+
+    def _page(
+        self,
+        snapshot: BooksSnapshot,
+        skip: int,
+        limit: int,
+        after: Optional[Cursor],
+        sort: str,
+        mask: Optional[np.ndarray] = None,
+        rows: Optional[np.ndarray] = None,
+        span: Optional[Tuple[int, int]] = None,
+        total: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """Monta a página a partir de uma seleção: máscara booleana, linhas candidatas ou faixa contígua do índice."""
+        index = snapshot.sort_index(sort)
+        start = 0
+        if after is not None:
+            start, skip = snapshot.position_after(index, after), 0
+
+        if rows is not None and len(rows) * 4 > len(snapshot):
+            # Seleções grandes saem mais baratas varrendo a permutação com máscara.
+            mask = np.zeros(len(snapshot), dtype=bool)
+            mask[rows] = True
+            rows = None
+
+        if span is not None:
+            page_rows, has_more = index.page_span(span[0], span[1], start, skip, limit)
+            total = span[1] - span[0]
+        elif rows is not None:
+            page_rows, has_more = index.page_rows(rows, start, skip, limit)
+            total = len(rows)
+        else:
+            page_rows, has_more = index.page(mask, start, skip, limit)
+            if total is None:
+                total = len(snapshot) if mask is None else int(np.count_nonzero(mask))
+
+        return {
+            "books": _to_records(_take(snapshot.df, page_rows, columns)),
+            "total": total,
+            "next_cursor": snapshot.cursor_for(index, page_rows[-1]) if has_more else None,
+        }
+
+    def _page_ranked(
+        self,
+        snapshot: BooksSnapshot,
+        rows: np.ndarray,
+        scores: np.ndarray,
+        skip: int,
+        limit: int,
+        after: Optional[Cursor],
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """Página da busca aproximada por relevância: score decrescente, id crescente; o score é a chave do cursor."""
+        ids = snapshot.ids[rows]
+        order = np.lexsort((ids, -scores))
+        rows, scores, ids = rows[order], scores[order], ids[order]
+
+        start = 0
+        if after is not None:
+            try:
+                (score,) = after.key
+                score = float(score)
+            except (TypeError, ValueError) as e:
+                raise ValueError("Invalid cursor key") from e
+            # Tudo que vem antes do cursor em (-score, id) forma um prefixo da ordem.
+            start, skip = int(np.count_nonzero((scores > score) | ((scores == score) & (ids <= after.id)))), 0
+
+        first = start + skip
+        page_rows = rows[first:first + limit]
+        has_more = len(page_rows) > 0 and first + limit < len(rows)
+        last = first + len(page_rows) - 1
+        return {
+            "books": _to_records(_take(snapshot.df, page_rows, columns)),
+            "total": len(rows),
+            "next_cursor": Cursor(
+                version=snapshot.version, sort=RELEVANCE_SORT, key=(float(scores[last]),), id=int(ids[last])
+            ) if has_more else None,
+        }
+
+    @timed_operation("get_all_books")
+    def get_all_books(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        sort: str = DEFAULT_SORT,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"books": [], "total": 0, "next_cursor": None}
+
+        return self._page(snapshot, skip, limit, after, sort, columns=columns)
     
-    def get_all_books(self, skip: int = 0, limit: int = 100) -> List[Dict]:
-        if not self.is_available():
-            return []
-        
-        df_paginated = self.df.iloc[skip:skip + limit]
-        return df_paginated.to_dict('records')
-    
-    def get_book_by_id(self, book_id: int) -> Optional[Dict]:
-        if not self.is_available():
+    @timed_operation("get_book_by_id")
+    def get_book_by_id(self, book_id: int, columns: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        snapshot = self._snapshot
+        if snapshot is None:
             return None
         
-        book = self.df[self.df['id'] == book_id]
-        if book.empty:
+        row = snapshot.row_for_id(book_id)
+        if row is None:
             return None
         
-        return book.iloc[0].to_dict()
+        with timed_stage("to_dict"):
+            return _take(snapshot.df, row, columns).to_dict()
     
+    @timed_operation("get_books_by_ids")
+    def get_books_by_ids(self, book_ids: Sequence[int], columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"books": [], "missing": list(book_ids)}
+
+        ids = np.asarray(book_ids, dtype=np.int64)
+        rows = snapshot.rows_for_ids(ids)
+        found = rows >= 0
+        return {"books": _to_records(_take(snapshot.df, rows[found], columns)), "missing": ids[~found].tolist()}
+
+    @timed_operation("search_books")
     def search_books(
         self,
         title: Optional[str] = None,
@@ -68,69 +324,190 @@ class BooksDatabase:
         min_rating: Optional[int] = None,
         in_stock: Optional[bool] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Dict]:
-        if not self.is_available():
-            return []
-        
-        df_filtered = self.df.copy()
-        
-        if title:
-            df_filtered = df_filtered[
-                df_filtered['title'].str.contains(title, case=False, na=False)
-            ]
-        
-        if category:
-            df_filtered = df_filtered[
-                df_filtered['category'].str.contains(category, case=False, na=False)
-            ]
-        
-        if min_price is not None:
-            df_filtered = df_filtered[df_filtered['price'] >= min_price]
-        
-        if max_price is not None:
-            df_filtered = df_filtered[df_filtered['price'] <= max_price]
-        
-        if min_rating is not None:
-            df_filtered = df_filtered[df_filtered['rating'] >= min_rating]
-        
-        if in_stock is not None:
-            df_filtered = df_filtered[df_filtered['in_stock'] == in_stock]
-        
-        df_paginated = df_filtered.iloc[skip:skip + limit]
-        return df_paginated.to_dict('records')
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        sort: str = DEFAULT_SORT,
+        facets: bool = False,
+        price_buckets: Sequence[float] = DEFAULT_PRICE_BUCKETS,
+        fuzzy: bool = False,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        return self._search(
+            self._snapshot, None, title=title, category=category, min_price=min_price, max_price=max_price,
+            min_rating=min_rating, in_stock=in_stock, skip=skip, limit=limit, after=after, sort=sort,
+            facets=facets, price_buckets=price_buckets, fuzzy=fuzzy, columns=columns,
+        )
+
+    def batch_search(self) -> Callable[..., Dict[str, Any]]:
+        """Busca com a mesma assinatura de ``search_books`` para um lote de consultas.
+
+        Todas as consultas do lote usam o mesmo snapshot, e cada filtro distinto
+        (categorias, bitmaps, fatias de preço, busca aproximada e a seleção
+        completa) é calculado uma única vez: consultas que só mudam página, ordem,
+        cursor ou facets reaproveitam a seleção inteira. Não é uma avaliação
+        vetorizada do lote: combinações de filtros diferentes ainda são resolvidas
+        uma a uma.
+        """
+        snapshot = self._snapshot
+        memo: Dict[Tuple, Any] = {}
+
+        @timed_operation("search_books")
+        def search(**query) -> Dict[str, Any]:
+            return self._search(snapshot, memo, **query)
+
+        return search
+
+    def _search(
+        self,
+        snapshot: Optional[BooksSnapshot],
+        memo: Optional[Dict[Tuple, Any]],
+        title: Optional[str] = None,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_rating: Optional[int] = None,
+        in_stock: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        sort: str = DEFAULT_SORT,
+        facets: bool = False,
+        price_buckets: Sequence[float] = DEFAULT_PRICE_BUCKETS,
+        fuzzy: bool = False,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        if snapshot is None:
+            return {"books": [], "total": 0, "next_cursor": None}
+
+        rows, mask, total, scores = _memoized(
+            memo,
+            ("selection", title, category, min_price, max_price, min_rating, in_stock, fuzzy),
+            lambda: self._select(snapshot, memo, title, category, min_price, max_price, min_rating, in_stock, fuzzy),
+        )
+
+        if sort == RELEVANCE_SORT and scores is not None:
+            result = self._page_ranked(snapshot, rows, scores, skip, limit, after, columns=columns)
+        else:
+            result = self._page(snapshot, skip, limit, after, sort, mask=mask, rows=rows, total=total, columns=columns)
+        if facets:
+            # Mesma seleção da página: as contagens não refazem nenhum filtro.
+            result["facets"] = snapshot.facet_counts(rows if rows is not None else mask, price_buckets)
+        return result
+
+    def _select(
+        self,
+        snapshot: BooksSnapshot,
+        memo: Optional[Dict[Tuple, Any]],
+        title: Optional[str],
+        category: Optional[str],
+        min_price: Optional[float],
+        max_price: Optional[float],
+        min_rating: Optional[int],
+        in_stock: Optional[bool],
+        fuzzy: bool,
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[int], Optional[np.ndarray]]:
+        """Seleção dos filtros: linhas candidatas ou máscara, total já conhecido e scores da busca aproximada.
+
+        Os arrays devolvidos podem ser compartilhados entre consultas de um lote e não são alterados depois.
+        """
+        df = snapshot.df
+        has_price = min_price is not None or max_price is not None
+        categories = (
+            _memoized(memo, ("categories", category), lambda: snapshot.match_categories(category)) if category else None
+        )
+
+        # Categoria, rating e estoque viram um AND de bitmaps. Com faixa de preço a
+        # categoria já limita as fatias do índice de preço e fica fora do bitmap.
+        bits = _memoized(
+            memo,
+            ("bits", None if has_price else category, min_rating, in_stock),
+            lambda: snapshot.filter_bits(
+                categories=None if has_price else categories,
+                min_rating=min_rating,
+                in_stock=in_stock,
+            ),
+        )
+
+        rows = mask = total = None
+        if has_price:
+            rows = _memoized(
+                memo,
+                ("price", min_price, max_price, category),
+                lambda: snapshot.price_index.rows_in_range(min_price, max_price, categories),
+            )
+            if bits is not None:
+                rows = rows[bits_contain(bits, rows)]
+        elif bits is not None:
+            total = popcount(bits)
+            if total * 4 <= len(snapshot):
+                rows = np.flatnonzero(unpack_bits(bits, len(snapshot)))
+            else:
+                mask = unpack_bits(bits, len(snapshot))
+
+        scores = None
+        if title and fuzzy:
+            # A busca aproximada devolve as próprias linhas; os demais filtros só as restringem.
+            hits, scores = _memoized(memo, ("fuzzy", title), lambda: snapshot.fuzzy_index().search(title))
+            if rows is not None:
+                keep = np.isin(hits, rows)
+            elif mask is not None:
+                keep = mask[hits]
+            else:
+                keep = slice(None)
+            rows, scores, mask, total = hits[keep], scores[keep], None, None
+        elif title:
+            # Só o título exige comparar strings, e apenas nas linhas já selecionadas.
+            if rows is not None:
+                rows = rows[df['title'].iloc[rows].str.contains(title, case=False, na=False).to_numpy()]
+            else:
+                matches = df['title'].str.contains(title, case=False, na=False).to_numpy()
+                mask = matches if mask is None else mask & matches
+            total = None
+
+        return rows, mask, total, scores
     
+    @timed_operation("get_all_categories")
     def get_all_categories(self) -> List[Dict[str, any]]:
         if not self.is_available():
             return []
         
         categories = self.df.groupby('category').size().reset_index(name='total_books')
-        return categories.to_dict('records')
+        return _to_records(categories)
     
-    def get_top_rated_books(self, limit: int = 10) -> List[Dict]:
-        if not self.is_available():
+    @timed_operation("get_top_rated_books")
+    def get_top_rated_books(self, limit: int = 10, columns: Optional[Sequence[str]] = None) -> List[Dict]:
+        snapshot = self._snapshot
+        if snapshot is None:
             return []
         
-        df_sorted = self.df.sort_values(['rating', 'title'], ascending=[False, True])
-        return df_sorted.head(limit).to_dict('records')
+        rows = snapshot.sort_index("-rating,title").perm[:limit]
+        return _to_records(_take(snapshot.df, rows, columns))
     
+    @timed_operation("get_books_by_price_range")
     def get_books_by_price_range(
         self,
         min_price: float,
         max_price: float,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Dict]:
-        if not self.is_available():
-            return []
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        sort: str = DEFAULT_SORT,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"books": [], "total": 0, "next_cursor": None}
         
-        df_filtered = self.df[
-            (self.df['price'] >= min_price) & (self.df['price'] <= max_price)
-        ]
+        price_index = snapshot.price_index
+        if sort == PRICE_SORT:
+            # Na ordem por preço a faixa é um trecho contíguo do próprio índice.
+            span = price_index.bounds(min_price, max_price)
+            return self._page(snapshot, skip, limit, after, sort, span=span, columns=columns)
         
-        df_paginated = df_filtered.iloc[skip:skip + limit]
-        return df_paginated.to_dict('records')
+        rows = price_index.rows_in_range(min_price, max_price)
+        return self._page(snapshot, skip, limit, after, sort, rows=rows, columns=columns)
     
+    @timed_operation("get_stats_overview")
     def get_stats_overview(self) -> Dict[str, any]:
         if not self.is_available():
             return {}
@@ -152,6 +529,7 @@ class BooksDatabase:
         
         return stats
     
+    @timed_operation("get_category_stats")
     def get_category_stats(self) -> List[Dict[str, any]]:
         if not self.is_available():
             return []
@@ -177,28 +555,62 @@ class BooksDatabase:
         
         return stats_list
     
+    @timed_operation("get_ml_features")
     def get_ml_features(self) -> List[Dict[str, any]]:
         if not self.is_available():
             return []
         
-        df_ml = self.df.copy()
-        
-        price_min = df_ml['price'].min()
-        price_max = df_ml['price'].max()
-        df_ml['price_normalized'] = (df_ml['price'] - price_min) / (price_max - price_min)
+        features = ml_feature_frame(self.df)
         
-        df_ml['rating_normalized'] = df_ml['rating'] / 5.0
-        
-        categories = df_ml['category'].unique()
-        category_map = {cat: idx for idx, cat in enumerate(categories)}
-        df_ml['category_encoded'] = df_ml['category'].map(category_map)
-        
-        features = df_ml[[
-            'id', 'title', 'price', 'rating', 'category',
-            'in_stock', 'price_normalized', 'rating_normalized', 'category_encoded'
-        ]]
-        
-        return features.to_dict('records')
+        return _to_records(features)
+
+    def _similar_records(
+        self, snapshot: BooksSnapshot, rows: Sequence[int], k: int, weights: Dict[str, float], probes: Optional[int]
+    ) -> List[Dict]:
+        # ``probes`` liga o índice aproximado (listas sondadas); ``None`` percorre o catálogo inteiro.
+        if probes is not None:
+            rows, scores = snapshot.ann_index().similar(rows, k, weights, probes)
+        else:
+            rows, scores = snapshot.similarity_index().similar(rows, k, weights)
+        books = _to_records(_take(snapshot.df, rows, SIMILAR_BOOK_COLUMNS))
+        for book, score in zip(books, scores.tolist()):
+            book["similarity"] = round(score, 4)
+        return books
+
+    @timed_operation("get_similar_books")
+    def get_similar_books(
+        self, book_id: int, k: int = 10, weights: Dict[str, float] = DEFAULT_WEIGHTS, probes: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+
+        row = snapshot.row_for_id(book_id)
+        if row is None:
+            return None
+
+        return self._similar_records(snapshot, [row], k, weights, probes)
+
+    @timed_operation("get_more_like_this")
+    def get_more_like_this(
+        self,
+        book_ids: Sequence[int],
+        k: int = 10,
+        weights: Dict[str, float] = DEFAULT_WEIGHTS,
+        probes: Optional[int] = None,
+    ) -> Tuple[List[Dict], List[int]]:
+        """Livros parecidos com o conjunto ``book_ids`` (score médio) e os ids não encontrados."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return [], list(book_ids)
+
+        ids = np.asarray(book_ids, dtype=np.int64)
+        rows = snapshot.rows_for_ids(ids)
+        found = rows >= 0
+        missing = ids[~found].tolist()
+        if not found.any():
+            return [], missing
+        return self._similar_records(snapshot, rows[found], k, weights, probes), missing
 
 
 _db_instance: Optional[BooksDatabase] = None
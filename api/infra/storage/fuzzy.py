@@ -0,0 +1,164 @@
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = r"[^\W_]+"
+# Palavras candidatas (maior sobreposição de trigramas) verificadas por distância de edição.
+MAX_CANDIDATE_WORDS = 64
+
+
+def tokenize(text: str) -> List[str]:
+    return list(dict.fromkeys(re.findall(TOKEN_PATTERN, text.lower())))
+
+
+def trigrams(word: str) -> set:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def transpositions(word: str) -> List[str]:
+    return [word[:i] + word[i + 1] + word[i] + word[i + 2:] for i in range(len(word) - 1) if word[i] != word[i + 1]]
+
+
+def max_edits(word: str) -> int:
+    """Erros tolerados por palavra: nenhum em palavras curtas ("of", "a"), até 2 nas longas."""
+    if len(word) <= 2:
+        return 0
+    if len(word) <= 5:
+        return 1
+    return 2
+
+
+def bounded_edit_distance(a: str, b: str, bound: int) -> int:
+    """Distância de edição com transposição (OSA), interrompida ao passar de ``bound``."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > bound:
+            return bound + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyTitleIndex:
+    """Busca tolerante a erros de digitação nos títulos.
+
+    Os trigramas são indexados sobre o vocabulário (palavras distintas dos
+    títulos), que cresce muito mais devagar que o catálogo; cada palavra aponta
+    para as linhas onde aparece (postings em CSR). Uma consulta gera candidatas
+    por sobreposição de trigramas, confirma com distância de edição limitada e
+    só então expande para linhas, exigindo que todas as palavras da consulta
+    casem com alguma palavra do título.
+    """
+
+    def __init__(self, titles: pd.Series):
+        titles = titles.reset_index(drop=True)
+        tokens = titles.fillna("").str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+        word_ids, vocabulary = pd.factorize(tokens.to_numpy())
+
+        n_rows = max(len(titles), 1)
+        # Pares (palavra, linha) únicos e ordenados: postings de cada palavra já saem ordenados.
+        pairs = np.unique(word_ids.astype(np.int64) * n_rows + tokens.index.to_numpy(dtype=np.int64))
+        post_words = pairs // n_rows
+        self.post_rows = pairs % n_rows
+        self.offsets = np.searchsorted(post_words, np.arange(len(vocabulary) + 1))
+
+        self.vocabulary: List[str] = [str(word) for word in vocabulary]
+        self.word_ids: Dict[str, int] = {word: idx for idx, word in enumerate(self.vocabulary)}
+        self.word_lengths = np.fromiter((len(word) for word in self.vocabulary), dtype=np.int32)
+
+        grams: Dict[str, List[int]] = {}
+        for idx, word in enumerate(self.vocabulary):
+            for gram in trigrams(word):
+                grams.setdefault(gram, []).append(idx)
+        self.trigram_words = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in grams.items()}
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.post_rows.nbytes
+            + self.offsets.nbytes
+            + self.word_lengths.nbytes
+            + sum(ids.nbytes for ids in self.trigram_words.values())
+        )
+
+    def similar_words(self, word: str) -> List[Tuple[int, float]]:
+        """Palavras do vocabulário a até ``max_edits`` edições, com similaridade 1 - d/len."""
+        bound = max_edits(word)
+        if bound == 0:
+            exact = self.word_ids.get(word)
+            return [(exact, 1.0)] if exact is not None else []
+
+        candidates = set()
+        grams = trigrams(word)
+        postings = [self.trigram_words[gram] for gram in grams if gram in self.trigram_words]
+        if postings:
+            ids, shared = np.unique(np.concatenate(postings), return_counts=True)
+            # Cada edição destrói no máximo 3 trigramas (q-gram lemma).
+            keep = (shared >= max(len(grams) - 3 * bound, 1)) & (np.abs(self.word_lengths[ids] - len(word)) <= bound)
+            ids, shared = ids[keep], shared[keep]
+            candidates.update(ids[np.argsort(-shared, kind="stable")[:MAX_CANDIDATE_WORDS]].tolist())
+
+        # Letras trocadas de lugar destroem até 4 trigramas e escapam do filtro acima,
+        # mas cada variante é só uma consulta exata ao vocabulário.
+        for variant in transpositions(word):
+            idx = self.word_ids.get(variant)
+            if idx is not None:
+                candidates.add(idx)
+
+        matches = []
+        for idx in sorted(candidates):
+            candidate = self.vocabulary[idx]
+            distance = bounded_edit_distance(word, candidate, bound)
+            if distance <= bound:
+                matches.append((idx, 1.0 - distance / max(len(word), len(candidate))))
+        return matches
+
+    def _rows_for(self, matches: List[Tuple[int, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        parts = [self.post_rows[self.offsets[idx]:self.offsets[idx + 1]] for idx, _ in matches]
+        if len(parts) == 1:
+            return parts[0], np.full(len(parts[0]), matches[0][1])
+
+        rows = np.concatenate(parts)
+        scores = np.concatenate([np.full(len(part), score) for part, (_, score) in zip(parts, matches)])
+        # Linha com mais de uma palavra parecida fica com a melhor similaridade.
+        order = np.lexsort((-scores, rows))
+        rows, scores = rows[order], scores[order]
+        first = np.concatenate(([True], rows[1:] != rows[:-1]))
+        return rows[first], scores[first]
+
+    def search(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Linhas (ordenadas) cujo título casa com todas as palavras da consulta e o score médio."""
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+        words = tokenize(query)
+        if not words:
+            return empty
+
+        rows = scores = None
+        for word in words:
+            matches = self.similar_words(word)
+            if not matches:
+                return empty
+            word_rows, word_scores = self._rows_for(matches)
+            if rows is None:
+                rows, scores = word_rows, word_scores
+            else:
+                rows, left, right = np.intersect1d(rows, word_rows, assume_unique=True, return_indices=True)
+                scores = scores[left] + word_scores[right]
+            if not len(rows):
+                return empty
+        return rows, scores / len(words)
@@ -0,0 +1,531 @@
+import base64
+import bisect
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from api.core.metrics import timed_index_build
+from api.infra.ml.ann import ANNIndex
+from api.infra.ml.similarity import DEFAULT_WEIGHTS, SimilarityIndex
+from api.infra.storage.fuzzy import FuzzyTitleIndex
+
+CURSOR_FORMAT = 1
+DEFAULT_SORT = "id"
+PRICE_SORT = "price"
+# Ordem da busca aproximada: similaridade decrescente, depois id.
+RELEVANCE_SORT = "relevance"
+SORTABLE_COLUMNS = ("id", "title", "price", "rating", "quantity", "category")
+# Ordens montadas em todo load; as demais são construídas sob demanda e mantidas em LRU.
+PRESORTED = ("price", "-price", "-rating,title", "rating", "title")
+MAX_LAZY_SORT_INDEXES = 16
+
+
+def parse_sort(spec: Optional[str]) -> Tuple[Tuple[str, bool], ...]:
+    """Converte ``"-rating,price"`` em ``(("rating", True), ("price", False))``."""
+    keys = []
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        descending = part.startswith("-")
+        column = part.lstrip("+-")
+        if column not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort by '{column}'. Allowed fields: {', '.join(SORTABLE_COLUMNS)}")
+        if any(column == existing for existing, _ in keys):
+            raise ValueError(f"Field '{column}' appears more than once in sort")
+        keys.append((column, descending))
+        if column == "id":
+            # id é único: chaves depois dele nunca desempatam nada.
+            break
+
+    # O desempate por id crescente já é implícito em todo índice.
+    if keys and keys[-1] == ("id", False):
+        keys.pop()
+    return tuple(keys)
+
+
+def sort_name(keys: Sequence[Tuple[str, bool]]) -> str:
+    return ",".join(f"-{column}" if descending else column for column, descending in keys) or DEFAULT_SORT
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Posição de keyset: chave de ordenação e id do último livro entregue."""
+
+    version: int
+    sort: str
+    key: Tuple[Any, ...]
+    id: int
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    payload = {"f": CURSOR_FORMAT, "v": cursor.version, "s": cursor.sort, "k": list(cursor.key), "id": cursor.id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str) -> Cursor:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return Cursor(
+            version=int(payload["v"]),
+            sort=str(payload["s"]),
+            key=tuple(payload["k"]),
+            id=int(payload["id"]),
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class _Desc:
+    """Inverte a comparação de um valor para buscas binárias em chaves descendentes."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_Desc") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Desc) and self.value == other.value
+
+
+def _python_value(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def sort_codes(values: np.ndarray) -> np.ndarray:
+    """Valores numéricos com a mesma ordem da coluna (strings viram códigos ordenados)."""
+    if values.dtype.kind == "b":
+        return values.astype(np.int8)
+    if values.dtype.kind in "iuf":
+        return values
+    return pd.factorize(values, sort=True)[0]
+
+
+class SortIndex:
+    """Permutação das linhas ordenada por ``keys``, sempre com ``id`` como desempate.
+
+    ``perm[i]`` é a linha na posição ``i`` da ordem; ``rank`` é a inversa, o que
+    permite retomar uma página a partir de um id conhecido em O(1). Quando o id
+    não existe mais no snapshot, a posição é encontrada por busca binária na chave.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        keys: Sequence[Tuple[str, bool]],
+        df: pd.DataFrame,
+        ids: np.ndarray,
+        codes: Optional[Callable[[str], np.ndarray]] = None,
+    ):
+        self.name = name
+        self.keys = tuple(keys)
+        self._ids = ids
+        self._columns = [(df[column].to_numpy(), descending) for column, descending in self.keys]
+        codes = codes or (lambda column: sort_codes(df[column].to_numpy()))
+
+        # lexsort usa a última chave como primária.
+        lex = [ids]
+        for column, descending in reversed(self.keys):
+            column_codes = codes(column)
+            lex.append(-column_codes if descending else column_codes)
+
+        self.perm = np.lexsort(lex)
+        self.rank = np.empty_like(self.perm)
+        self.rank[self.perm] = np.arange(len(self.perm))
+
+    @property
+    def nbytes(self) -> int:
+        return self.perm.nbytes + self.rank.nbytes
+
+    def key_of(self, row: int) -> Tuple[Any, ...]:
+        return tuple(_python_value(values[row]) for values, _ in self._columns)
+
+    def _seek_key(self, position: int) -> Tuple[Any, ...]:
+        row = self.perm[position]
+        key = tuple(_Desc(values[row]) if descending else values[row] for values, descending in self._columns)
+        return key + (self._ids[row],)
+
+    def bisect_after(self, key: Sequence[Any], book_id: int) -> int:
+        if len(key) != len(self._columns):
+            raise ValueError("Cursor key does not match the sort index")
+        target = tuple(
+            _Desc(value) if descending else value for value, (_, descending) in zip(key, self._columns)
+        ) + (book_id,)
+        try:
+            return bisect.bisect_right(range(len(self.perm)), target, key=self._seek_key)
+        except TypeError as e:
+            raise ValueError("Cursor key does not match the sort index") from e
+
+    def page(self, mask: Optional[np.ndarray], start: int, skip: int, limit: int) -> Tuple[np.ndarray, bool]:
+        """Linhas da página a partir de ``start`` na ordem do índice e se há mais resultados depois dela."""
+        wanted = skip + limit + 1
+        if mask is None:
+            rows = self.perm[start + skip:start + wanted]
+        else:
+            rows = _first_matches(self.perm, mask, start, wanted)[skip:]
+        return rows[:limit], len(rows) > limit
+
+    def page_rows(self, rows: np.ndarray, start: int, skip: int, limit: int) -> Tuple[np.ndarray, bool]:
+        """Como ``page``, para um conjunto pequeno de candidatas: custo O(k log k) no tamanho do resultado."""
+        ranks = np.sort(self.rank[rows])
+        begin = int(np.searchsorted(ranks, start)) + skip
+        chosen = ranks[begin:begin + limit + 1]
+        return self.perm[chosen[:limit]], len(chosen) > limit
+
+    def page_span(self, lo: int, hi: int, start: int, skip: int, limit: int) -> Tuple[np.ndarray, bool]:
+        """Página de um resultado que ocupa as posições contíguas ``[lo, hi)`` deste índice."""
+        begin = max(start, lo) + skip
+        rows = self.perm[begin:min(begin + limit + 1, hi)]
+        return rows[:limit], len(rows) > limit
+
+
+def _first_matches(perm: np.ndarray, mask: np.ndarray, start: int, count: int) -> np.ndarray:
+    # Varre a permutação em blocos crescentes: páginas de filtros comuns tocam só o início.
+    found = []
+    n_found = 0
+    chunk = max(count * 4, 4096)
+    while start < len(perm) and n_found < count:
+        rows = perm[start:start + chunk]
+        hits = rows[mask[rows]]
+        found.append(hits)
+        n_found += len(hits)
+        start += chunk
+        chunk *= 2
+    if not found:
+        return perm[:0]
+    return np.concatenate(found)[:count]
+
+
+class PriceIndex:
+    """Linhas ordenadas por (preço, id), globalmente e agrupadas por categoria.
+
+    Faixas de preço viram dois ``searchsorted`` sobre o array ordenado; a
+    contagem é a diferença entre os offsets e as linhas são uma fatia, então
+    o custo depende do tamanho do resultado e não do catálogo.
+    """
+
+    def __init__(self, prices: np.ndarray, price_perm: np.ndarray, category_codes: np.ndarray, n_categories: int):
+        self.rows = price_perm
+        self.prices = prices[price_perm]
+
+        # argsort estável por categoria mantém a ordem de preço dentro de cada grupo.
+        order = np.argsort(category_codes[price_perm], kind="stable")
+        self.category_rows = price_perm[order]
+        self.category_prices = self.prices[order]
+        self.category_offsets = np.searchsorted(
+            category_codes[self.category_rows], np.arange(n_categories + 1)
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.prices.nbytes + self.category_rows.nbytes + self.category_prices.nbytes
+
+    @staticmethod
+    def _bounds(prices: np.ndarray, min_price: Optional[float], max_price: Optional[float]) -> Tuple[int, int]:
+        if min_price is None and max_price is None:
+            return 0, len(prices)
+        lo = int(np.searchsorted(prices, min_price, side="left")) if min_price is not None else 0
+        # NaN fica depois de +inf na ordenação: livros sem preço nunca entram numa faixa.
+        hi = int(np.searchsorted(prices, max_price if max_price is not None else np.inf, side="right"))
+        return lo, max(lo, hi)
+
+    def bounds(self, min_price: Optional[float], max_price: Optional[float]) -> Tuple[int, int]:
+        """Posições ``[lo, hi)`` da faixa na ordem global (a mesma do índice de ordenação ``price``)."""
+        return self._bounds(self.prices, min_price, max_price)
+
+    def _category_spans(self, min_price, max_price, categories: Sequence[int]):
+        for code in categories:
+            start, end = self.category_offsets[code], self.category_offsets[code + 1]
+            lo, hi = self._bounds(self.category_prices[start:end], min_price, max_price)
+            yield start + lo, start + hi
+
+    def count(
+        self, min_price: Optional[float], max_price: Optional[float], categories: Optional[Sequence[int]] = None
+    ) -> int:
+        if categories is None:
+            lo, hi = self.bounds(min_price, max_price)
+            return hi - lo
+        return sum(hi - lo for lo, hi in self._category_spans(min_price, max_price, categories))
+
+    def rows_in_range(
+        self, min_price: Optional[float], max_price: Optional[float], categories: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        if categories is None:
+            lo, hi = self.bounds(min_price, max_price)
+            return self.rows[lo:hi]
+        spans = [self.category_rows[lo:hi] for lo, hi in self._category_spans(min_price, max_price, categories)]
+        return np.concatenate(spans) if spans else self.rows[:0]
+
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(bits).sum(dtype=np.int64))
+    return int(_POPCOUNT_TABLE[bits].sum(dtype=np.int64))
+
+
+def unpack_bits(bits: np.ndarray, size: int) -> np.ndarray:
+    return np.unpackbits(bits, count=size).view(bool)
+
+
+def bits_contain(bits: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Testa o bit de cada linha de ``rows`` sem desempacotar o bitmap inteiro."""
+    return ((bits[rows >> 3] >> (7 - (rows & 7))) & 1).astype(bool)
+
+
+class BitmapIndex:
+    """Um bitmap por valor distinto da coluna, empacotado com ``np.packbits`` (1 bit por linha).
+
+    Filtros viram OR entre os valores aceitos e AND entre colunas, sempre sobre
+    ``N/8`` bytes; a contagem exata sai de um popcount.
+    """
+
+    def __init__(self, codes: np.ndarray, values: Sequence[Any]):
+        self.size = len(codes)
+        self.values = list(values)
+        self.bitmaps = [np.packbits(codes == code) for code in range(len(self.values))]
+        # Códigos compactos para contagens por valor (facets) com bincount.
+        self.codes = codes.astype(np.int32)
+
+    @classmethod
+    def from_column(cls, values: np.ndarray) -> "BitmapIndex":
+        codes, uniques = pd.factorize(values, sort=True)
+        return cls(codes, uniques)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(bitmap.nbytes for bitmap in self.bitmaps)
+
+    def codes_where(self, predicate: Callable[[Any], bool]) -> List[int]:
+        return [code for code, value in enumerate(self.values) if predicate(value)]
+
+    def union(self, codes: Sequence[int]) -> np.ndarray:
+        result = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        for code in codes:
+            result |= self.bitmaps[code]
+        return result
+
+    def count(self, code: int) -> int:
+        return popcount(self.bitmaps[code])
+
+    def value_counts(self, selection: Optional[np.ndarray] = None) -> np.ndarray:
+        """Quantas linhas da seleção (linhas ou máscara; ``None`` = todas) têm cada valor."""
+        codes = self.codes if selection is None else self.codes[selection]
+        return np.bincount(codes[codes >= 0], minlength=len(self.values))
+
+
+class BooksSnapshot:
+    """DataFrame carregado e índices derivados dele; um novo snapshot é criado a cada reload."""
+
+    def __init__(self, df: pd.DataFrame, version: int):
+        self.df = df
+        self.version = version
+        self.ids = df["id"].to_numpy(dtype=np.int64)
+
+        self._codes: Dict[str, np.ndarray] = {}
+
+        with timed_index_build("sort_id"):
+            self._id_index = SortIndex(DEFAULT_SORT, (), df, self.ids)
+            self._sorted_ids = self.ids[self._id_index.perm]
+
+        self._sort_indexes: Dict[str, SortIndex] = {DEFAULT_SORT: self._id_index}
+        for name in PRESORTED:
+            with timed_index_build(f"sort_{name}"):
+                self._sort_indexes[name] = SortIndex(name, parse_sort(name), df, self.ids, self._sort_codes)
+
+        self._lazy_indexes: "OrderedDict[str, SortIndex]" = OrderedDict()
+        self._lazy_lock = threading.Lock()
+
+        codes, categories = pd.factorize(df["category"].to_numpy(), sort=True)
+        self._codes["category"] = codes
+        self.categories = np.asarray(categories, dtype=object)
+        self.prices = df["price"].to_numpy(dtype=np.float64)
+
+        with timed_index_build("price"):
+            self.price_index = PriceIndex(
+                self.prices,
+                self.sort_index(PRICE_SORT).perm,
+                codes,
+                len(self.categories),
+            )
+
+        with timed_index_build("bitmaps"):
+            self.category_bitmaps = BitmapIndex(codes, self.categories)
+            self.rating_bitmaps = BitmapIndex.from_column(df["rating"].to_numpy())
+            self.stock_bitmaps = BitmapIndex.from_column(df["in_stock"].to_numpy())
+        self._catalog_facets: Dict[Tuple[float, ...], Dict[str, Dict[str, int]]] = {}
+
+        self._fuzzy: Optional[FuzzyTitleIndex] = None
+        self._fuzzy_lock = threading.Lock()
+        self._similarity: Optional[SimilarityIndex] = None
+        self._similarity_lock = threading.Lock()
+        self._ann: Optional[ANNIndex] = None
+        self._ann_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    @property
+    def index_nbytes(self) -> int:
+        return (
+            self._sorted_ids.nbytes
+            + sum(index.nbytes for index in self._sort_indexes.values())
+            + self.price_index.nbytes
+            + self.category_bitmaps.nbytes
+            + self.rating_bitmaps.nbytes
+            + self.stock_bitmaps.nbytes
+            + (self._fuzzy.nbytes if self._fuzzy is not None else 0)
+            + (self._similarity.nbytes if self._similarity is not None else 0)
+            + (self._ann.nbytes if self._ann is not None else 0)
+        )
+
+    def fuzzy_index(self) -> FuzzyTitleIndex:
+        """Índice de trigramas dos títulos, montado na primeira busca aproximada do snapshot."""
+        if self._fuzzy is None:
+            with self._fuzzy_lock:
+                if self._fuzzy is None:
+                    with timed_index_build("fuzzy_title"):
+                        self._fuzzy = FuzzyTitleIndex(self.df["title"])
+        return self._fuzzy
+
+    def similarity_index(self) -> SimilarityIndex:
+        """Índice de livros parecidos, montado na primeira recomendação do snapshot."""
+        if self._similarity is None:
+            titles = self.fuzzy_index()
+            with self._similarity_lock:
+                if self._similarity is None:
+                    with timed_index_build("similarity"):
+                        self._similarity = SimilarityIndex(self.df, titles)
+        return self._similarity
+
+    def ann_index(self) -> ANNIndex:
+        """Índice de vizinhos aproximados, montado na primeira recomendação aproximada do snapshot.
+
+        Sempre com ``DEFAULT_WEIGHTS``: consultas com outros pesos caem na busca exata.
+        """
+        if self._ann is None:
+            similarity = self.similarity_index()
+            with self._ann_lock:
+                if self._ann is None:
+                    with timed_index_build("ann"):
+                        self._ann = ANNIndex(similarity, DEFAULT_WEIGHTS)
+        return self._ann
+
+    def match_categories(self, query: str) -> np.ndarray:
+        """Códigos das categorias cujo nome contém ``query`` (mesma semântica do antigo ``str.contains``)."""
+        names = pd.Series(self.categories, dtype=object)
+        return np.flatnonzero(names.str.contains(query, case=False, na=False).to_numpy())
+
+    def filter_bits(
+        self,
+        categories: Optional[Sequence[int]] = None,
+        min_rating: Optional[int] = None,
+        in_stock: Optional[bool] = None,
+    ) -> Optional[np.ndarray]:
+        """AND dos bitmaps dos filtros informados; ``None`` quando nenhum foi informado."""
+        selected = []
+        if categories is not None:
+            selected.append(self.category_bitmaps.union(categories))
+        if min_rating is not None:
+            selected.append(self.rating_bitmaps.union(self.rating_bitmaps.codes_where(lambda r: r >= min_rating)))
+        if in_stock is not None:
+            selected.append(self.stock_bitmaps.union(self.stock_bitmaps.codes_where(lambda s: s == in_stock)))
+
+        if not selected:
+            return None
+        bits = selected[0]
+        for other in selected[1:]:
+            bits = bits & other
+        return bits
+
+    def facet_counts(self, selection: Optional[np.ndarray], price_buckets: Sequence[float]) -> Dict[str, Dict[str, int]]:
+        """Contagens por categoria, rating, estoque e faixa de preço dentro da seleção."""
+        if selection is None:
+            # Sem filtros o resultado é o catálogo inteiro: calculado uma vez por snapshot.
+            key = tuple(price_buckets)
+            facets = self._catalog_facets.get(key)
+            if facets is None:
+                facets = self._catalog_facets[key] = self._facet_counts(None, price_buckets)
+            return facets
+        return self._facet_counts(selection, price_buckets)
+
+    def _facet_counts(self, selection: Optional[np.ndarray], price_buckets: Sequence[float]) -> Dict[str, Dict[str, int]]:
+        categories = self.category_bitmaps.value_counts(selection)
+        ratings = self.rating_bitmaps.value_counts(selection)
+        stock = dict(zip(self.stock_bitmaps.values, self.stock_bitmaps.value_counts(selection).tolist()))
+
+        edges = np.asarray(sorted(price_buckets), dtype=np.float64)
+        prices = self.prices if selection is None else self.prices[selection]
+        buckets = np.bincount(
+            np.searchsorted(edges, prices[~np.isnan(prices)], side="right"), minlength=len(edges) + 1
+        )
+        labels = [f"{low:g}-{high:g}" for low, high in zip(np.concatenate(([0.0], edges[:-1])), edges)]
+        labels.append(f"{edges[-1]:g}+" if len(edges) else "0+")
+
+        order = sorted(np.flatnonzero(categories), key=lambda code: (-categories[code], self.categories[code]))
+        return {
+            "category": {str(self.categories[code]): int(categories[code]) for code in order},
+            "rating": {str(value): int(count) for value, count in zip(self.rating_bitmaps.values, ratings)},
+            "stock": {"in_stock": stock.get(True, 0), "out_of_stock": stock.get(False, 0)},
+            "price": dict(zip(labels, buckets.tolist())),
+        }
+
+    def _sort_codes(self, column: str) -> np.ndarray:
+        # Fatorar strings é o passo caro; os códigos são compartilhados entre índices.
+        codes = self._codes.get(column)
+        if codes is None:
+            codes = self._codes[column] = sort_codes(self.df[column].to_numpy())
+        return codes
+
+    def sort_index(self, name: str) -> SortIndex:
+        """Índice para uma ordem canônica (ver ``sort_name``); ordens fora de ``PRESORTED`` entram no LRU."""
+        index = self._sort_indexes.get(name)
+        if index is not None:
+            return index
+
+        with self._lazy_lock:
+            index = self._lazy_indexes.get(name)
+            if index is not None:
+                self._lazy_indexes.move_to_end(name)
+                return index
+
+        index = SortIndex(name, parse_sort(name), self.df, self.ids, self._sort_codes)
+        with self._lazy_lock:
+            self._lazy_indexes[name] = index
+            while len(self._lazy_indexes) > MAX_LAZY_SORT_INDEXES:
+                self._lazy_indexes.popitem(last=False)
+        return index
+
+    def row_for_id(self, book_id: int) -> Optional[int]:
+        position = int(np.searchsorted(self._sorted_ids, book_id))
+        if position < len(self._sorted_ids) and self._sorted_ids[position] == book_id:
+            return int(self._id_index.perm[position])
+        return None
+
+    def rows_for_ids(self, book_ids: np.ndarray) -> np.ndarray:
+        """Linha de cada id, na ordem recebida; -1 para ids inexistentes."""
+        positions = np.minimum(np.searchsorted(self._sorted_ids, book_ids), len(self._sorted_ids) - 1)
+        found = self._sorted_ids[positions] == book_ids
+        return np.where(found, self._id_index.perm[positions], -1)
+
+    def position_after(self, index: SortIndex, cursor: Cursor) -> int:
+        # No mesmo snapshot o id leva direto à posição; após um reload, busca pela chave.
+        if cursor.version == self.version:
+            row = self.row_for_id(cursor.id)
+            if row is not None:
+                return int(index.rank[row]) + 1
+        return index.bisect_after(cursor.key, cursor.id)
+
+    def cursor_for(self, index: SortIndex, row: int) -> Cursor:
+        return Cursor(version=self.version, sort=index.name, key=index.key_of(row), id=int(self.ids[row]))
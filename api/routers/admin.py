@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, Path, Query
+from fastapi.responses import PlainTextResponse
+
+from api.core.auth import get_current_active_user
+from api.core.config import get_settings
+from api.core.metrics import TimedRoute
+from api.core.profiler import (
+    SamplingProfiler,
+    acquire_profiling_slot,
+    profile_store,
+    release_profiling_slot,
+)
+from api.domain.auth.schemas import User
+from api.domain.common.exceptions import NotFoundError, ServiceBusyError
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(get_current_active_user)],
+    route_class=TimedRoute,
+)
+
+
+@router.get(
+    "/profile",
+    response_class=PlainTextResponse,
+    summary="CPU Profile",
+    description=(
+        "Executa um profiler por amostragem no worker durante N segundos e retorna as pilhas "
+        "no formato colapsado (compatível com flamegraph.pl / speedscope) (requer autenticação)"
+    ),
+)
+async def profile(
+    seconds: float = Query(5.0, gt=0, le=settings.profiling_max_seconds, description="Duração da coleta em segundos"),
+    interval_ms: float = Query(settings.profiling_interval_ms, ge=1, le=100, description="Intervalo entre amostras"),
+    include_idle: bool = Query(False, description="Inclui threads ociosas (event loop em select, workers esperando)"),
+    current_user: User = Depends(get_current_active_user),
+):
+    if not acquire_profiling_slot():
+        raise ServiceBusyError("A profiling session is already running")
+
+    logger.info(f"Profiling for {seconds}s requested by user: {current_user.username}")
+    profiler = SamplingProfiler(interval=interval_ms / 1000, include_idle=include_idle).start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+        release_profiling_slot()
+
+    summary = profiler.summary()
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "X-Profile-Samples": str(summary["samples"]),
+            "X-Profile-Duration": str(summary["duration_seconds"]),
+        },
+    )
+
+
+@router.get(
+    "/profiles",
+    summary="Request Profiles",
+    description="Lista os perfis capturados via header X-Profile (requer autenticação)",
+)
+async def list_profiles() -> List[Dict[str, Any]]:
+    return profile_store.list()
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_class=PlainTextResponse,
+    summary="Request Profile",
+    description="Retorna o perfil colapsado de uma requisição capturada via header X-Profile (requer autenticação)",
+)
+async def get_profile(
+    profile_id: str = Path(..., description="Valor do header X-Profile-Id da resposta"),
+):
+    entry = profile_store.get(profile_id)
+    if entry is None:
+        raise NotFoundError(f"Profile {profile_id} not found")
+    return PlainTextResponse(entry["collapsed"])
@@ -1,12 +1,17 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 
-from api.domain.auth.schemas import RefreshRequest, Token
+from api.core.auth import get_current_active_user, oauth2_scheme
+from api.core.metrics import TimedRoute
+from api.domain.auth.schemas import LogoutRequest, RefreshRequest, Token, User
 from api.domain.auth.service import AuthService
 
 router = APIRouter(
     prefix="/auth",
     tags=["authentication"],
+    route_class=TimedRoute,
 )
 
 
@@ -20,7 +25,7 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     service: AuthService = Depends(AuthService),
 ):
-    return service.login(form_data.username, form_data.password)
+    return await service.login(form_data.username, form_data.password)
 
 
 @router.post(
@@ -34,3 +39,17 @@ async def refresh_token(
     service: AuthService = Depends(AuthService),
 ):
     return service.refresh(body.refresh_token)
+
+
+@router.post(
+    "/logout",
+    summary="Logout",
+    description="Revoga o access token atual e, opcionalmente, o refresh token informado"
+)
+async def logout(
+    body: Optional[LogoutRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_active_user),
+    service: AuthService = Depends(AuthService),
+):
+    return service.logout(token, body.refresh_token if body else None)
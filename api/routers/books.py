@@ -1,9 +1,21 @@
-from fastapi import APIRouter, Depends, Query, Path
-from typing import Optional, List
+from fastapi import APIRouter, Depends, Query, Path, Response
+from typing import Any, Optional, List, Tuple
 
 from api.core.deps import get_books_service
-from api.domain.books.schemas import Book, BookList
+from api.core.metrics import TimedRoute, timed_stage
+from api.domain.books.schemas import (
+    Book,
+    BookBatchRequest,
+    BookBatchResult,
+    BookList,
+    BookSearchBatchRequest,
+    BookSearchBatchResult,
+    BookSearchResult,
+    parse_fields,
+    projected_adapter,
+)
 from api.domain.books.service import BooksService
+from api.domain.common.exceptions import InvalidInputError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,21 +24,56 @@ router = APIRouter(
     prefix="/books",
     tags=["books"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
+def book_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Campos dos livros na resposta, separados por vírgula (ex.: id,title,price); padrão: todos",
+    ),
+) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise InvalidInputError(str(e))
+
+
+def _respond(result: Any, model: Any, fields: Optional[Tuple[str, ...]]) -> Any:
+    """Sem ``fields`` a resposta segue pelo ``response_model`` da rota; com projeção, pelo modelo gerado para ela."""
+    if fields is None:
+        return result
+    adapter = projected_adapter(model, fields)
+    with timed_stage("response_validation"):
+        value = adapter.validate_python(result)
+    with timed_stage("model_dump"):
+        body = adapter.dump_json(value)
+    return Response(content=body, media_type="application/json")
+
+
+# Rotas com sort= são síncronas: rodam no threadpool, então a permutação de uma ordem fora de
+# PRESORTED (argsort do catálogo inteiro, montada no primeiro pedido) não trava o event loop.
 @router.get(
     "",
     response_model=BookList,
     summary="Lista todos os livros",
     description="Retorna uma lista paginada de todos os livros disponíveis na base de dados",
 )
-async def get_all_books(
+def get_all_books(
     page: int = Query(1, ge=1, description="Número da página"),
     page_size: int = Query(50, ge=1, le=100, description="Tamanho da página"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor da página anterior); quando informado, page é ignorado"),
+    sort: Optional[str] = Query(
+        None,
+        description="Ordenação: campos separados por vírgula, '-' para decrescente (ex.: -rating,price). "
+        "Campos: id, title, price, rating, quantity, category",
+    ),
+    fields: Optional[Tuple[str, ...]] = Depends(book_fields),
     service: BooksService = Depends(get_books_service),
 ):
-    return service.get_all_books(page=page, page_size=page_size)
+    result = service.get_all_books(page=page, page_size=page_size, cursor=cursor, sort=sort, fields=fields)
+    return _respond(result, BookList, fields)
 
 
 @router.get(
@@ -37,18 +84,38 @@ async def get_all_books(
 )
 async def get_book_by_id(
     book_id: int = Path(..., ge=1, description="ID do livro"),
+    fields: Optional[Tuple[str, ...]] = Depends(book_fields),
+    service: BooksService = Depends(get_books_service),
+):
+    return _respond(service.get_book_by_id(book_id=book_id, fields=fields), Book, fields)
+
+
+@router.post(
+    "/batch",
+    response_model=BookBatchResult,
+    summary="Obtém vários livros por ID",
+    description="Retorna os livros dos IDs informados em uma única chamada, na ordem da requisição, e lista os IDs não encontrados",
+)
+async def get_books_by_ids(
+    request: BookBatchRequest,
+    fields: Optional[Tuple[str, ...]] = Depends(book_fields),
     service: BooksService = Depends(get_books_service),
 ):
-    return service.get_book_by_id(book_id=book_id)
+    return _respond(service.get_books_by_ids(book_ids=request.ids, fields=fields), BookBatchResult, fields)
 
 
+# Síncronas pelo mesmo motivo, e também pelo índice de trigramas da primeira busca aproximada após um reload.
 @router.get(
     "/search",
-    response_model=BookList,
+    response_model=BookSearchResult,
     summary="Busca livros",
-    description="Busca livros por título e/ou categoria com paginação",
+    description=(
+        "Busca livros por título e/ou categoria com paginação. Com facets=true, retorna também "
+        "contagens do resultado por categoria, rating, estoque e faixa de preço. Com fuzzy=true, "
+        "o título tolera erros de digitação e o resultado vem ordenado por relevância"
+    ),
 )
-async def search_books(
+def search_books(
     title: Optional[str] = Query(None, description="Filtro por título (busca parcial)"),
     category: Optional[str] = Query(None, description="Filtro por categoria"),
     min_price: Optional[float] = Query(None, ge=0, description="Preço mínimo"),
@@ -57,9 +124,18 @@ async def search_books(
     in_stock: Optional[bool] = Query(None, description="Filtro por disponibilidade"),
     page: int = Query(1, ge=1, description="Número da página"),
     page_size: int = Query(50, ge=1, le=100, description="Tamanho da página"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor da página anterior); quando informado, page é ignorado"),
+    sort: Optional[str] = Query(
+        None,
+        description="Ordenação: campos separados por vírgula, '-' para decrescente (ex.: -rating,price). "
+        "Campos: id, title, price, rating, quantity, category; relevance apenas com fuzzy=true (padrão nesse caso)",
+    ),
+    facets: bool = Query(False, description="Inclui contagens por categoria, rating, estoque e faixa de preço"),
+    fuzzy: bool = Query(False, description="Busca aproximada no título, tolerante a erros de digitação"),
+    fields: Optional[Tuple[str, ...]] = Depends(book_fields),
     service: BooksService = Depends(get_books_service),
 ):
-    return service.search_books(
+    result = service.search_books(
         title=title,
         category=category,
         min_price=min_price,
@@ -68,7 +144,28 @@ async def search_books(
         in_stock=in_stock,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        sort=sort,
+        facets=facets,
+        fuzzy=fuzzy,
+        fields=fields,
     )
+    return _respond(result, BookSearchResult, fields)
+
+
+@router.post(
+    "/search/batch",
+    response_model=BookSearchBatchResult,
+    summary="Executa várias buscas",
+    description="Executa várias buscas (mesmos parâmetros de GET /books/search) em uma única chamada, retornando os resultados na ordem da requisição",
+)
+def search_books_batch(
+    request: BookSearchBatchRequest,
+    fields: Optional[Tuple[str, ...]] = Depends(book_fields),
+    service: BooksService = Depends(get_books_service),
+):
+    result = service.search_books_batch(queries=[query.model_dump() for query in request.queries], fields=fields)
+    return _respond(result, BookSearchBatchResult, fields)
 
 
 @router.get(
@@ -79,9 +176,10 @@ async def search_books(
 )
 async def get_top_rated_books(
     limit: int = Query(10, ge=1, le=100, description="Número de livros a retornar"),
+    fields: Optional[Tuple[str, ...]] = Depends(book_fields),
     service: BooksService = Depends(get_books_service),
 ):
-    return service.get_top_rated_books(limit=limit)
+    return _respond(service.get_top_rated_books(limit=limit, fields=fields), List[Book], fields)
 
 
 @router.get(
@@ -90,16 +188,27 @@ async def get_top_rated_books(
     summary="Filtra livros por faixa de preço",
     description="Retorna livros dentro de uma faixa de preço específica",
 )
-async def get_books_by_price_range(
+def get_books_by_price_range(
     min: float = Query(..., ge=0, description="Preço mínimo"),
     max: float = Query(..., ge=0, description="Preço máximo"),
     page: int = Query(1, ge=1, description="Número da página"),
     page_size: int = Query(50, ge=1, le=100, description="Tamanho da página"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor da página anterior); quando informado, page é ignorado"),
+    sort: Optional[str] = Query(
+        None,
+        description="Ordenação: campos separados por vírgula, '-' para decrescente (ex.: -rating,price). "
+        "Campos: id, title, price, rating, quantity, category",
+    ),
+    fields: Optional[Tuple[str, ...]] = Depends(book_fields),
     service: BooksService = Depends(get_books_service),
 ):
-    return service.get_books_by_price_range(
+    result = service.get_books_by_price_range(
         min_price=min,
         max_price=max,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        sort=sort,
+        fields=fields,
     )
+    return _respond(result, BookList, fields)
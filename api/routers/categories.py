@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 import logging
 
-from api.core.deps import get_categories_service
+from api.core.compression import snapshot_response
+from api.core.deps import get_books_database, get_categories_service
+from api.core.metrics import TimedRoute
 from api.domain.categories.schemas import CategoryList
 from api.domain.categories.service import CategoriesService
+from api.infra.storage.database import BooksDatabase
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +14,7 @@ router = APIRouter(
     prefix="/categories",
     tags=["categories"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
@@ -21,6 +25,8 @@ router = APIRouter(
     description="Retorna lista de todas as categorias de livros disponíveis com contagem"
 )
 async def get_all_categories(
+    request: Request,
     service: CategoriesService = Depends(get_categories_service),
+    db: BooksDatabase = Depends(get_books_database),
 ):
-    return service.list_categories()
+    return await snapshot_response(request, "categories", db, CategoryList, service.list_categories)
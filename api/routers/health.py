@@ -3,6 +3,7 @@ from datetime import datetime
 from api.domain.common.health_schemas import HealthCheck
 from api.infra.storage.database import get_database
 from api.core.config import get_settings
+from api.core.metrics import TimedRoute
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,6 +11,7 @@ settings = get_settings()
 
 router = APIRouter(
     tags=["health"],
+    route_class=TimedRoute,
 )
 
 
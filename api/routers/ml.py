@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, Body
+from fastapi import APIRouter, Depends, Body, Path, Query, Request
 from typing import List
 
 from api.core.auth import get_current_active_user
 
-from api.core.deps import get_ml_service
-from api.domain.ml.schemas import MLFeatures, MLPrediction, MLTrainingData
+from api.core.compression import snapshot_response
+from api.core.deps import get_books_database, get_ml_service
+from api.core.metrics import TimedRoute
+from api.domain.ml.schemas import (
+    MLFeatures,
+    MLPrediction,
+    MLTrainingData,
+    MoreLikeThisRequest,
+    MoreLikeThisResult,
+    SimilarBooks,
+)
 from api.domain.ml.service import MLService
+from api.infra.storage.database import BooksDatabase
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,6 +24,7 @@ router = APIRouter(
     prefix="/ml",
     tags=["machine-learning"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
@@ -24,9 +35,11 @@ router = APIRouter(
     description="Retorna dados formatados como features para modelos de Machine Learning"
 )
 async def get_ml_features(
+    request: Request,
     service: MLService = Depends(get_ml_service),
+    db: BooksDatabase = Depends(get_books_database),
 ):
-    return service.get_features()
+    return await snapshot_response(request, "ml_features", db, List[MLFeatures], service.get_features)
 
 
 @router.get(
@@ -36,9 +49,48 @@ async def get_ml_features(
     description="Retorna dataset completo formatado para treinamento de modelos ML"
 )
 async def get_training_data(
+    request: Request,
+    service: MLService = Depends(get_ml_service),
+    db: BooksDatabase = Depends(get_books_database),
+):
+    return await snapshot_response(request, "ml_training_data", db, MLTrainingData, service.get_training_data)
+
+
+# Rotas síncronas: rodam no threadpool, então a montagem dos índices na primeira consulta após um
+# reload (e o produto escalar contra o catálogo) não trava o event loop.
+@router.get(
+    "/similar/{book_id}",
+    response_model=SimilarBooks,
+    summary="Livros similares",
+    description=(
+        "Retorna os k livros mais parecidos com o livro informado, combinando TF-IDF do título "
+        "com preço, rating e categoria normalizados (as mesmas features de /ml/features). "
+        "Em catálogos grandes a busca usa um índice aproximado (IVF); exact=true força a busca exata"
+    ),
+)
+def get_similar_books(
+    book_id: int = Path(..., ge=1, description="ID do livro"),
+    k: int = Query(10, ge=1, le=100, description="Número de livros similares"),
+    exact: bool = Query(False, description="Força a busca exata sobre o catálogo inteiro"),
+    service: MLService = Depends(get_ml_service),
+):
+    return service.get_similar_books(book_id=book_id, k=k, exact=exact)
+
+
+@router.post(
+    "/more-like-this",
+    response_model=MoreLikeThisResult,
+    summary="Mais livros como estes",
+    description=(
+        "Retorna os k livros mais parecidos com um conjunto de livros (score médio em relação a todos eles), "
+        "excluindo os próprios livros de referência, e lista os IDs não encontrados"
+    ),
+)
+def get_more_like_this(
+    request: MoreLikeThisRequest,
     service: MLService = Depends(get_ml_service),
 ):
-    return service.get_training_data()
+    return service.get_more_like_this(book_ids=request.book_ids, k=request.k, exact=request.exact)
 
 
 @router.post(
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends, Path
+from typing import List
 from api.core.auth import get_current_active_user
 import logging
 
 from api.core.deps import get_scraping_service
+from api.core.metrics import TimedRoute
 from api.domain.auth.schemas import User
+from api.domain.scraping.schemas import ScrapeJobStatus
 from api.domain.scraping.service import ScrapingService
 
 logger = logging.getLogger(__name__)
@@ -13,30 +16,73 @@ router = APIRouter(
     tags=["scraping"],
     dependencies=[Depends(get_current_active_user)],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
 @router.post(
     "/trigger",
     summary="Trigger Scraping",
-    description="Inicia processo de scraping do site (requer autenticação)"
+    description=(
+        "Inicia processo de scraping do site em um processo separado (requer autenticação). "
+        "Se já houver um scraping em execução, retorna o job existente."
+    )
 )
 async def trigger_scraping(
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     service: ScrapingService = Depends(get_scraping_service),
 ):
     logger.info(f"Scraping triggered by user: {current_user.username}")
 
-    service.trigger_scraping(background_tasks)
+    job, created = service.trigger_scraping(triggered_by=current_user.username)
 
     return {
-        "status": "success",
-        "message": "Scraping task started in background",
-        "triggered_by": current_user.username
+        "status": "success" if created else "already_running",
+        "message": "Scraping task started in background" if created else "Scraping task already running",
+        "triggered_by": job["triggered_by"],
+        "job_id": job["job_id"],
+        "job": job,
     }
 
 
+@router.get(
+    "/jobs",
+    response_model=List[ScrapeJobStatus],
+    summary="List Scraping Jobs",
+    description="Lista os jobs de scraping recentes (requer autenticação)"
+)
+async def list_jobs(
+    service: ScrapingService = Depends(get_scraping_service),
+):
+    return service.list_jobs()
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=ScrapeJobStatus,
+    summary="Scraping Job Status",
+    description="Retorna progresso do job: páginas/s, livros encontrados e ETA (requer autenticação)"
+)
+async def get_job(
+    job_id: str = Path(..., description="ID do job de scraping"),
+    service: ScrapingService = Depends(get_scraping_service),
+):
+    return service.get_job(job_id)
+
+
+@router.post(
+    "/jobs/{job_id}/cancel",
+    response_model=ScrapeJobStatus,
+    summary="Cancel Scraping Job",
+    description="Solicita o cancelamento de um job de scraping em execução (requer autenticação)"
+)
+async def cancel_job(
+    job_id: str = Path(..., description="ID do job de scraping"),
+    service: ScrapingService = Depends(get_scraping_service),
+):
+    return service.cancel_job(job_id)
+
+
 @router.post(
     "/reload",
     summary="Reload Data",
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from typing import List
 import logging
 
-from api.core.deps import get_stats_service
+from api.core.compression import snapshot_response
+from api.core.deps import get_books_database, get_stats_service
+from api.core.metrics import TimedRoute
 from api.domain.stats.schemas import CategoryStats, StatsOverview
 from api.domain.stats.service import StatsService
+from api.infra.storage.database import BooksDatabase
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +15,7 @@ router = APIRouter(
     prefix="/stats",
     tags=["statistics"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
@@ -22,9 +26,11 @@ router = APIRouter(
     description="Retorna estatísticas gerais da coleção de livros"
 )
 async def get_stats_overview(
+    request: Request,
     service: StatsService = Depends(get_stats_service),
+    db: BooksDatabase = Depends(get_books_database),
 ):
-    return service.get_overview()
+    return await snapshot_response(request, "stats_overview", db, StatsOverview, service.get_overview)
 
 
 @router.get(
@@ -34,6 +40,10 @@ async def get_stats_overview(
     description="Retorna estatísticas detalhadas de cada categoria"
 )
 async def get_category_stats(
+    request: Request,
     service: StatsService = Depends(get_stats_service),
+    db: BooksDatabase = Depends(get_books_database),
 ):
-    return service.get_category_stats()
+    return await snapshot_response(
+        request, "stats_categories", db, List[CategoryStats], service.get_category_stats
+    )
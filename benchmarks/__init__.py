@@ -0,0 +1,3 @@
+"""
+Benchmarks e ferramentas de teste de performance
+"""
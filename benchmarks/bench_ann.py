@@ -0,0 +1,141 @@
+"""
+Benchmark do índice de vizinhos aproximados (IVF) contra a busca exata de similares.
+
+Para cada tamanho de catálogo sintético monta os índices de títulos, de
+similaridade e o aproximado, e consulta livros aleatórios ("similares a") e
+conjuntos de três livros parecidos ("mais como estes"). Reporta tempo de
+montagem e memória de cada índice e, para cada número de listas sondadas,
+latências p50/p95/p99, candidatos pontuados e recall@k. O recall considera
+empates: um vizinho aproximado conta como acerto se o score dele é pelo menos
+o k-ésimo score exato.
+
+Uso:
+    python -m benchmarks.bench_ann --rows 100000,300000 --queries 300 --probes 4,8,16,32 --output bench_ann.json
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from api.infra.ml.ann import ANNIndex
+from api.infra.ml.similarity import SimilarityIndex
+from api.infra.storage.fuzzy import FuzzyTitleIndex
+from benchmarks.bench_api import _percentiles
+from benchmarks.catalog_generator import CatalogGenerator
+
+
+def _timed(build):
+    started = time.perf_counter()
+    value = build()
+    return value, time.perf_counter() - started
+
+
+def _recall(approximate: np.ndarray, exact: np.ndarray) -> float:
+    if not len(exact):
+        return 1.0
+    return float(np.count_nonzero(approximate >= exact[-1] - 1e-9)) / len(exact)
+
+
+def _make_queries(similarity: SimilarityIndex, count: int, rng: np.random.Generator) -> Dict[str, List[List[int]]]:
+    single = [[int(row)] for row in rng.integers(0, len(similarity), count)]
+    # "Mais como estes": o livro e dois dos seus vizinhos exatos, como uma lista de favoritos coerente.
+    grouped = []
+    for (row,) in single:
+        neighbours, _ = similarity.similar([row], 5)
+        grouped.append([row] + [int(n) for n in rng.choice(neighbours, 2, replace=False)])
+    return {"similar": single, "more_like_this": grouped}
+
+
+def _evaluate(
+    similarity: SimilarityIndex, ann: ANNIndex, queries: List[List[int]], k: int, probes: Sequence[int]
+) -> Dict[str, Any]:
+    exact_ms, exact_scores = [], []
+    for rows in queries:
+        (_, scores), seconds = _timed(lambda: similarity.similar(rows, k))
+        exact_ms.append(seconds * 1000)
+        exact_scores.append(scores)
+
+    results: Dict[str, Any] = {"exact": {"latency_ms": _percentiles(exact_ms)}, "ann": {}}
+    for probe in probes:
+        latency_ms, candidates, recalls = [], [], []
+        for rows, expected in zip(queries, exact_scores):
+            (_, scores), seconds = _timed(lambda: ann.similar(rows, k, probes=probe))
+            latency_ms.append(seconds * 1000)
+            candidates.append(len(ann.candidates(rows, probe)))
+            recalls.append(_recall(scores, expected))
+        results["ann"][str(probe)] = {
+            "latency_ms": _percentiles(latency_ms),
+            "candidates": _percentiles(candidates),
+            "recall_at_k": round(float(np.mean(recalls)), 4),
+        }
+    return results
+
+
+def run_benchmark(rows: int, queries: int, k: int, probes: Sequence[int], seed: int) -> Dict[str, Any]:
+    print(f"Gerando catálogo sintético com {rows} livros...")
+    df = CatalogGenerator(seed=seed).generate(rows).reset_index(drop=True)
+
+    titles, titles_seconds = _timed(lambda: FuzzyTitleIndex(df["title"]))
+    similarity, similarity_seconds = _timed(lambda: SimilarityIndex(df, titles))
+    ann, ann_seconds = _timed(lambda: ANNIndex(similarity))
+    print(
+        f"Índices: títulos {titles_seconds:.2f}s, similaridade {similarity_seconds:.2f}s, "
+        f"aproximado {ann_seconds:.2f}s ({ann.nbytes / 1024 ** 2:.1f} MB, {ann.lists} listas)"
+    )
+
+    rng = np.random.default_rng(seed)
+    workload = _make_queries(similarity, queries, rng)
+    return {
+        "rows": rows,
+        "index": {
+            "fuzzy_title": {"build_seconds": round(titles_seconds, 3), "memory_bytes": int(titles.nbytes)},
+            "similarity": {"build_seconds": round(similarity_seconds, 3), "memory_bytes": int(similarity.nbytes)},
+            "ann": {"build_seconds": round(ann_seconds, 3), "memory_bytes": int(ann.nbytes), "lists": ann.lists},
+        },
+        **{name: _evaluate(similarity, ann, group, k, probes) for name, group in workload.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do índice de vizinhos aproximados")
+    parser.add_argument("--rows", default="100000,300000", help="Tamanhos de catálogo separados por vírgula")
+    parser.add_argument("--queries", type=int, default=200, help="Consultas por tamanho de catálogo")
+    parser.add_argument("--k", type=int, default=10, help="Vizinhos por consulta")
+    parser.add_argument("--probes", default="4,8,16,32", help="Listas sondadas, separadas por vírgula")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON para salvar os resultados")
+    args = parser.parse_args()
+
+    probes = [int(value) for value in args.probes.split(",")]
+    results = {
+        "created_at": datetime.utcnow().isoformat(),
+        "queries": args.queries,
+        "k": args.k,
+        "seed": args.seed,
+        "catalogs": [],
+    }
+    for rows in (int(value) for value in args.rows.split(",")):
+        catalog = run_benchmark(rows, args.queries, args.k, probes, args.seed)
+        results["catalogs"].append(catalog)
+        for name in ("similar", "more_like_this"):
+            exact = catalog[name]["exact"]["latency_ms"]
+            print(f"{name} exato: p50 {exact['p50']:.2f} ms, p95 {exact['p95']:.2f} ms, p99 {exact['p99']:.2f} ms")
+            for probe, stats in catalog[name]["ann"].items():
+                latency = stats["latency_ms"]
+                print(
+                    f"{name} aproximado ({probe} listas): p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+                    f"p99 {latency['p99']:.2f} ms, {stats['candidates']['p50']:.0f} candidatos, "
+                    f"recall@{args.k} {stats['recall_at_k']:.1%}"
+                )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Resultados salvos em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Benchmark e teste de carga dos endpoints da API.
+
+Executa todas as rotas principais em processo (ASGI, sem rede) e/ou contra um
+uvicorn local, com concorrência e tamanho de catálogo configuráveis. Reporta
+throughput, latências p50/p95/p99 e alocações por requisição, e salva os
+resultados em JSON para comparação entre commits.
+
+Uso:
+    python -m benchmarks.bench_api --rows 100000 --concurrency 16 --requests 300 --output bench_api.json
+    python -m benchmarks.bench_api --mode uvicorn --routes books_list,books_search
+    python -m benchmarks.bench_api --compare bench_api_main.json --output bench_api.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from benchmarks.catalog_generator import CatalogGenerator
+
+API_PREFIX = "/api/v1"
+LOGIN_FORM = {"username": "admin", "password": "secret"}
+
+
+@dataclass
+class RouteSpec:
+    name: str
+    method: str
+    path: Callable[[random.Random, int], str]
+    auth: bool = False
+    json_body: Optional[Any] = None
+    form_body: Optional[Dict[str, str]] = None
+    expected_status: int = 200
+    tags: List[str] = field(default_factory=list)
+
+
+ROUTES: List[RouteSpec] = [
+    RouteSpec("books_list", "GET", lambda rnd, n: f"/books?page={rnd.randint(1, max(n // 50, 1))}&page_size=50"),
+    RouteSpec(
+        "books_list_fields", "GET",
+        lambda rnd, n: f"/books?page={rnd.randint(1, max(n // 50, 1))}&page_size=50&fields=id,title,price",
+    ),
+    RouteSpec("books_by_id", "GET", lambda rnd, n: f"/books/{rnd.randint(1, n)}"),
+    RouteSpec(
+        "books_batch", "POST", lambda rnd, n: "/books/batch",
+        json_body={"ids": list(range(1, 201))},
+    ),
+    RouteSpec("books_search", "GET", lambda rnd, n: f"/books/search?title=love&min_rating={rnd.randint(1, 5)}&page_size=50"),
+    RouteSpec("books_search_fuzzy", "GET", lambda rnd, n: "/books/search?title=lvoe%20stroy&fuzzy=true&page_size=50"),
+    RouteSpec("books_search_category", "GET", lambda rnd, n: "/books/search?category=fiction&in_stock=true&max_price=30"),
+    RouteSpec(
+        "books_search_batch", "POST", lambda rnd, n: "/books/search/batch",
+        json_body={"queries": [{"title": "love", "page_size": 10}, {"category": "fiction", "in_stock": True}, {"min_rating": 4, "max_price": 30}]},
+    ),
+    RouteSpec("books_top_rated", "GET", lambda rnd, n: "/books/top-rated?limit=20"),
+    RouteSpec("books_price_range", "GET", lambda rnd, n: f"/books/price-range?min={rnd.randint(10, 40)}&max=50&page_size=50"),
+    RouteSpec("categories", "GET", lambda rnd, n: "/categories"),
+    RouteSpec("stats_overview", "GET", lambda rnd, n: "/stats/overview"),
+    RouteSpec("stats_categories", "GET", lambda rnd, n: "/stats/categories"),
+    RouteSpec("ml_features", "GET", lambda rnd, n: "/ml/features", tags=["heavy"]),
+    RouteSpec("ml_training_data", "GET", lambda rnd, n: "/ml/training-data", tags=["heavy"]),
+    RouteSpec("ml_similar", "GET", lambda rnd, n: f"/ml/similar/{rnd.randint(1, n)}?k=10"),
+    RouteSpec("ml_similar_exact", "GET", lambda rnd, n: f"/ml/similar/{rnd.randint(1, n)}?k=10&exact=true"),
+    RouteSpec(
+        "ml_more_like_this", "POST", lambda rnd, n: "/ml/more-like-this",
+        json_body={"book_ids": [1, 2, 3], "k": 10},
+    ),
+    RouteSpec("ml_stats", "GET", lambda rnd, n: "/ml/stats"),
+    RouteSpec(
+        "ml_predictions", "POST", lambda rnd, n: "/ml/predictions", auth=True,
+        json_body=[{"book_id": i, "prediction": 4.0, "confidence": 0.9, "model_version": "bench"} for i in range(1, 51)],
+    ),
+    RouteSpec("auth_login", "POST", lambda rnd, n: "/auth/login", form_body=LOGIN_FORM, tags=["cpu"]),
+]
+
+
+def _percentiles(latencies_ms: List[float]) -> Dict[str, float]:
+    if not latencies_ms:
+        return {}
+    values = np.asarray(latencies_ms)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "mean": round(float(values.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(values.max()), 3),
+    }
+
+
+async def _send(client: httpx.AsyncClient, route: RouteSpec, rnd: random.Random, rows: int, token: Optional[str]):
+    headers = {"Authorization": f"Bearer {token}"} if route.auth and token else None
+    return await client.request(
+        route.method,
+        API_PREFIX + route.path(rnd, rows),
+        json=route.json_body,
+        data=route.form_body,
+        headers=headers,
+    )
+
+
+async def _load_route(
+    client: httpx.AsyncClient,
+    route: RouteSpec,
+    rows: int,
+    total_requests: int,
+    concurrency: int,
+    warmup: int,
+    token: Optional[str],
+    seed: int,
+) -> Dict[str, Any]:
+    rnd = random.Random(seed)
+    for _ in range(warmup):
+        await _send(client, route, rnd, rows, token)
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = total_requests
+    response_bytes = 0
+
+    async def worker():
+        nonlocal remaining, errors, response_bytes
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await _send(client, route, rnd, rows, token)
+                ok = response.status_code == route.expected_status
+                response_bytes += len(response.content)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors += 1
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total_requests))))
+    wall = time.perf_counter() - wall_start
+
+    return {
+        "route": route.name,
+        "requests": len(latencies),
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_ms": _percentiles(latencies),
+        "avg_response_bytes": int(response_bytes / len(latencies)) if latencies else 0,
+    }
+
+
+async def _measure_allocations(
+    client: httpx.AsyncClient, route: RouteSpec, rows: int, samples: int, token: Optional[str], seed: int
+) -> Dict[str, float]:
+    rnd = random.Random(seed)
+    peaks = []
+
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await _send(client, route, rnd, rows, token)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "peak_kb_per_request": round(float(np.mean(peaks)) / 1024, 2) if peaks else 0.0,
+        "max_peak_kb": round(float(np.max(peaks)) / 1024, 2) if peaks else 0.0,
+    }
+
+
+async def _login(client: httpx.AsyncClient) -> Optional[str]:
+    response = await client.post(API_PREFIX + "/auth/login", data=LOGIN_FORM)
+    if response.status_code != 200:
+        print(f"⚠️  Login falhou ({response.status_code}); rotas autenticadas vão falhar")
+        return None
+    return response.json()["access_token"]
+
+
+async def _run_routes(client, routes, rows, args, mode: str, measure_allocations: bool) -> List[Dict[str, Any]]:
+    token = await _login(client)
+    results = []
+    for idx, route in enumerate(routes):
+        result = await _load_route(
+            client, route, rows, args.requests, args.concurrency, args.warmup, token, args.seed + idx
+        )
+        result["mode"] = mode
+        if measure_allocations:
+            result["allocations"] = await _measure_allocations(
+                client, route, rows, args.alloc_samples, token, args.seed + idx
+            )
+        results.append(result)
+        latency = result["latency_ms"]
+        print(
+            f"[{mode}] {route.name:<24} {result['throughput_rps']:>9.1f} req/s  "
+            f"p50 {latency.get('p50', 0):>8.2f}ms  p95 {latency.get('p95', 0):>8.2f}ms  "
+            f"p99 {latency.get('p99', 0):>8.2f}ms  erros {result['errors']}"
+        )
+    return results
+
+
+def _silence_stdout_logging() -> None:
+    # Mantém o custo de formatação dos logs, mas descarta a saída no console.
+    from api.core.logger import get_output_handlers
+
+    devnull = open(os.devnull, "w")
+    for handler in get_output_handlers():
+        if isinstance(handler, logging.StreamHandler) and getattr(handler, "stream", None) is sys.stdout:
+            handler.setStream(devnull)
+
+
+async def run_inprocess(routes, rows, args) -> List[Dict[str, Any]]:
+    import main
+
+    _silence_stdout_logging()
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await _run_routes(client, routes, rows, args, "inprocess", not args.no_allocations)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(routes, rows, args) -> List[Dict[str, Any]]:
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--workers", str(args.workers)],
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    if (await client.get(API_PREFIX + "/health")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("uvicorn não respondeu ao health check")
+                await asyncio.sleep(0.2)
+
+            return await _run_routes(client, routes, rows, args, "uvicorn", False)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    previous = {(r["mode"], r["route"]): r for r in baseline.get("results", [])}
+    print(f"\nComparação com {baseline.get('meta', {}).get('git_commit')} (variação %, negativo = mais rápido)")
+    for result in current["results"]:
+        old = previous.get((result["mode"], result["route"]))
+        if not old:
+            continue
+        deltas = []
+        for key in ("p50", "p95", "p99"):
+            old_value = old["latency_ms"].get(key)
+            new_value = result["latency_ms"].get(key)
+            if old_value:
+                deltas.append(f"{key} {(new_value - old_value) / old_value * 100:+6.1f}%")
+        print(f"[{result['mode']}] {result['route']:<24} " + "  ".join(deltas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos endpoints da API")
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn", "both"], default="inprocess")
+    parser.add_argument("--rows", type=int, default=100_000, help="Tamanho do catálogo sintético")
+    parser.add_argument("--data-path", default=None, help="Usa um catálogo existente em vez de gerar um")
+    parser.add_argument("--routes", default=None, help="Rotas separadas por vírgula (padrão: todas)")
+    parser.add_argument("--skip-tags", default="", help="Ignora rotas com as tags informadas (ex.: heavy,cpu)")
+    parser.add_argument("--requests", type=int, default=200, help="Requisições medidas por rota")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn (modo uvicorn)")
+    parser.add_argument("--alloc-samples", type=int, default=20)
+    parser.add_argument("--no-allocations", action="store_true", help="Não mede alocações por requisição")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON para salvar os resultados")
+    parser.add_argument("--compare", default=None, help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    routes = ROUTES
+    if args.routes:
+        selected = {name.strip() for name in args.routes.split(",")}
+        unknown = selected - {route.name for route in ROUTES}
+        if unknown:
+            parser.error(f"Rotas desconhecidas: {', '.join(sorted(unknown))}")
+        routes = [route for route in ROUTES if route.name in selected]
+    skip_tags = {tag.strip() for tag in args.skip_tags.split(",") if tag.strip()}
+    routes = [route for route in routes if not skip_tags.intersection(route.tags)]
+
+    with tempfile.TemporaryDirectory(prefix="bench_api_") as tmp_dir:
+        if args.data_path:
+            data_path = args.data_path
+        else:
+            data_path = str(Path(tmp_dir) / f"books_{args.rows}.csv")
+            print(f"Gerando catálogo sintético com {args.rows} livros...")
+            CatalogGenerator(seed=args.seed).write(args.rows, data_path)
+
+        # Settings são lidas na importação de main, então o caminho precisa estar no ambiente antes.
+        os.environ["DATA_PATH"] = data_path
+        rows = args.rows if not args.data_path else sum(1 for _ in open(data_path, encoding="utf-8")) - 1
+
+        results: List[Dict[str, Any]] = []
+        if args.mode in ("inprocess", "both"):
+            results += asyncio.run(run_inprocess(routes, rows, args))
+        if args.mode in ("uvicorn", "both"):
+            results += asyncio.run(run_uvicorn(routes, rows, args))
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": rows,
+            "data_path": args.data_path,
+            "concurrency": args.concurrency,
+            "requests_per_route": args.requests,
+            "uvicorn_workers": args.workers,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare_results(report, json.load(f))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📊 Resultados salvos em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
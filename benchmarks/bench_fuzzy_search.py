@@ -0,0 +1,137 @@
+"""
+Benchmark da busca aproximada de títulos (índice de trigramas).
+
+Gera um catálogo sintético, monta o índice e consulta títulos do próprio
+catálogo com erros de digitação injetados (troca, remoção, inserção ou
+transposição de letras). Reporta tempo de montagem e memória do índice,
+latências p50/p95/p99, palavras candidatas, tamanho do resultado e recall
+(o livro de origem aparece no resultado), comparando com ``str.contains``.
+
+Uso:
+    python -m benchmarks.bench_fuzzy_search --rows 300000 --queries 500 --output bench_fuzzy.json
+"""
+import argparse
+import json
+import random
+import string
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from api.infra.storage.fuzzy import FuzzyTitleIndex, max_edits, tokenize
+from benchmarks.bench_api import _percentiles
+from benchmarks.catalog_generator import CatalogGenerator
+
+
+def _typo(word: str, rnd: random.Random) -> str:
+    position = rnd.randrange(len(word))
+    letter = rnd.choice(string.ascii_lowercase)
+    kind = rnd.choice(["substitute", "delete", "insert", "transpose"])
+    if kind == "transpose" and position < len(word) - 1:
+        return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+    if kind == "delete":
+        return word[:position] + word[position + 1:]
+    if kind == "insert":
+        return word[:position] + letter + word[position:]
+    return word[:position] + letter + word[position + 1:]
+
+
+def make_queries(titles: pd.Series, count: int, words: int, rnd: random.Random) -> List[Tuple[int, str]]:
+    """Pares (linha de origem, consulta) com um erro em uma das palavras que o toleram."""
+    queries = []
+    while len(queries) < count:
+        row = rnd.randrange(len(titles))
+        tokens = tokenize(str(titles.iloc[row]))
+        start = rnd.randrange(max(len(tokens) - words + 1, 1))
+        tokens = tokens[start:start + words]
+        editable = [i for i, token in enumerate(tokens) if max_edits(token) > 0]
+        if not editable:
+            continue
+        target = rnd.choice(editable)
+        tokens[target] = _typo(tokens[target], rnd)
+        queries.append((row, " ".join(tokens)))
+    return queries
+
+
+def run_benchmark(rows: int, queries: int, words: int, seed: int) -> Dict[str, Any]:
+    print(f"Gerando catálogo sintético com {rows} livros...")
+    titles = CatalogGenerator(seed=seed).generate(rows)["title"].reset_index(drop=True)
+
+    started = time.perf_counter()
+    index = FuzzyTitleIndex(titles)
+    build_seconds = time.perf_counter() - started
+    print(
+        f"Índice: {build_seconds:.2f}s, {index.nbytes / 1024 ** 2:.1f} MB, "
+        f"{len(index.vocabulary)} palavras distintas"
+    )
+
+    rnd = random.Random(seed)
+    fuzzy_ms, baseline_ms, candidates, sizes = [], [], [], []
+    fuzzy_hits = baseline_hits = 0
+    for row, query in make_queries(titles, queries, words, rnd):
+        candidates.append(sum(len(index.similar_words(word)) for word in tokenize(query)))
+
+        started = time.perf_counter()
+        found, _ = index.search(query)
+        fuzzy_ms.append((time.perf_counter() - started) * 1000)
+        sizes.append(len(found))
+        position = np.searchsorted(found, row)
+        fuzzy_hits += bool(position < len(found) and found[position] == row)
+
+        started = time.perf_counter()
+        matches = titles.str.contains(query, case=False, na=False, regex=False).to_numpy()
+        baseline_ms.append((time.perf_counter() - started) * 1000)
+        baseline_hits += bool(matches[row])
+
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "rows": rows,
+        "queries": queries,
+        "words_per_query": words,
+        "seed": seed,
+        "index": {
+            "build_seconds": round(build_seconds, 3),
+            "memory_bytes": int(index.nbytes),
+            "vocabulary": len(index.vocabulary),
+        },
+        "fuzzy": {
+            "latency_ms": _percentiles(fuzzy_ms),
+            "recall": round(fuzzy_hits / queries, 4),
+            "candidate_words": _percentiles(candidates),
+            "result_size": _percentiles(sizes),
+        },
+        "contains": {
+            "latency_ms": _percentiles(baseline_ms),
+            "recall": round(baseline_hits / queries, 4),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da busca aproximada de títulos")
+    parser.add_argument("--rows", type=int, default=100_000, help="Tamanho do catálogo sintético")
+    parser.add_argument("--queries", type=int, default=300, help="Consultas com erro de digitação")
+    parser.add_argument("--words", type=int, default=2, help="Palavras do título usadas em cada consulta")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON para salvar os resultados")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.queries, args.words, args.seed)
+    for name in ("fuzzy", "contains"):
+        latency = results[name]["latency_ms"]
+        print(
+            f"{name}: p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+            f"p99 {latency['p99']:.2f} ms, recall {results[name]['recall']:.1%}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Resultados salvos em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Benchmark de throughput do scraper contra o servidor espelho local.
+
+Cada execução roda em um processo separado, de modo que tempo de CPU e pico de
+memória reflitam apenas o engine medido (o espelho roda no processo pai).
+
+Uso:
+    python -m benchmarks.bench_scraper --archive benchmarks/fixtures/books_toscrape.json.gz \\
+        --latency-ms 20 --repeat 3 --output bench_scraper.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import queue
+import resource
+import sys
+import time
+import traceback
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import requests
+
+from api.infra.scraping.scraper import BooksScraper
+from benchmarks.scraper_mirror import DEFAULT_ARCHIVE, RESET_PATH, STATS_PATH, MirrorServer, load_archive
+
+
+def _run_books_scraper(base_url: str) -> int:
+    scraper = BooksScraper(base_url, page_delay=0, category_delay=0)
+    return len(scraper.scrape_all_books())
+
+
+# Novos engines (ex.: versões assíncronas ou com parser mais rápido) devem ser
+# registrados aqui: recebem a URL base e retornam o número de livros extraídos.
+ENGINES: Dict[str, Callable[[str], int]] = {
+    "books_scraper": _run_books_scraper,
+}
+
+
+def _engine_process(engine: str, base_url: str, trace_memory: bool, results) -> None:
+    logging.disable(logging.INFO)
+
+    if trace_memory:
+        tracemalloc.start()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        books = ENGINES[engine](base_url)
+    except Exception:
+        results.put({"error": traceback.format_exc()})
+        return
+    cpu_seconds = time.process_time() - cpu_start
+    wall_seconds = time.perf_counter() - wall_start
+
+    traced_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        max_rss_kb //= 1024
+
+    results.put({
+        "books": books,
+        "wall_seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "peak_rss_mb": round(max_rss_kb / 1024, 2),
+        "peak_traced_mb": round(traced_peak / 1024 / 1024, 2) if traced_peak is not None else None,
+    })
+
+
+# Intervalo entre verificações de que o processo do engine ainda está vivo.
+POLL_SECONDS = 1.0
+
+
+def _wait_result(process, results, engine: str, timeout: float) -> Dict[str, any]:
+    """Resultado do processo do engine; falha se ele morrer sem reportar, travar ou levantar exceção."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            result = results.get(timeout=min(POLL_SECONDS, max(deadline - time.monotonic(), 0.01)))
+            break
+        except queue.Empty:
+            if not process.is_alive():
+                # O resultado pode ter chegado entre o timeout e a verificação.
+                try:
+                    result = results.get(timeout=POLL_SECONDS)
+                    break
+                except queue.Empty:
+                    raise RuntimeError(
+                        f"Engine {engine} exited with code {process.exitcode} without reporting results"
+                    )
+            if time.monotonic() >= deadline:
+                process.terminate()
+                process.join()
+                raise TimeoutError(f"Engine {engine} did not finish within {timeout:.0f}s")
+
+    if "error" in result:
+        raise RuntimeError(f"Engine {engine} failed:\n{result['error']}")
+    return result
+
+
+def run_engine(engine: str, base_url: str, trace_memory: bool = False, timeout: float = 1800.0) -> Dict[str, any]:
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+
+    requests.get(base_url + RESET_PATH, timeout=5)
+    process = ctx.Process(target=_engine_process, args=(engine, base_url, trace_memory, results))
+    process.start()
+    try:
+        result = _wait_result(process, results, engine, timeout)
+    finally:
+        process.join(timeout=POLL_SECONDS * 5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+    mirror_stats = requests.get(base_url + STATS_PATH, timeout=5).json()
+
+    wall = result["wall_seconds"]
+    return {
+        "engine": engine,
+        **result,
+        "pages": mirror_stats["requests"],
+        "errors_injected": mirror_stats["errors_injected"],
+        "pages_per_second": round(mirror_stats["requests"] / wall, 2) if wall else 0.0,
+        "books_per_second": round(result["books"] / wall, 2) if wall else 0.0,
+        "cpu_utilization": round(result["cpu_seconds"] / wall, 3) if wall else 0.0,
+    }
+
+
+def run_benchmark(
+    archive_path: str,
+    engines: List[str],
+    repeat: int = 1,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = 42,
+    trace_memory: bool = False,
+    timeout: float = 1800.0,
+) -> Dict[str, any]:
+    archive = load_archive(archive_path)
+    mirror = MirrorServer(archive, latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate, seed=seed)
+    base_url = mirror.start()
+
+    runs = []
+    try:
+        for engine in engines:
+            for iteration in range(1, repeat + 1):
+                result = run_engine(engine, base_url, trace_memory=trace_memory, timeout=timeout)
+                result["iteration"] = iteration
+                runs.append(result)
+                print(
+                    f"{engine} #{iteration}: {result['pages_per_second']:.2f} páginas/s, "
+                    f"{result['books_per_second']:.2f} livros/s, CPU {result['cpu_seconds']:.2f}s, "
+                    f"pico RSS {result['peak_rss_mb']:.1f} MB"
+                )
+    finally:
+        mirror.stop()
+
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "archive": archive_path,
+        "archive_pages": len(archive["pages"]),
+        "mirror": {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "error_rate": error_rate, "seed": seed},
+        "runs": runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do scraper contra o espelho local")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE)
+    parser.add_argument("--engines", default=",".join(ENGINES), help=f"Engines separados por vírgula ({', '.join(ENGINES)})")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--trace-memory", action="store_true", help="Mede pico de alocações Python com tracemalloc")
+    parser.add_argument("--timeout", type=float, default=1800.0, help="Tempo máximo de cada execução, em segundos")
+    parser.add_argument("--output", default=None, help="Arquivo JSON para salvar os resultados")
+    args = parser.parse_args()
+
+    engines = [name.strip() for name in args.engines.split(",") if name.strip()]
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        parser.error(f"Engines desconhecidos: {', '.join(unknown)}")
+
+    results = run_benchmark(
+        args.archive,
+        engines,
+        repeat=args.repeat,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        trace_memory=args.trace_memory,
+        timeout=args.timeout,
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Resultados salvos em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Gerador determinístico de catálogos sintéticos para testes de escala.
+
+Produz o mesmo schema do scraper (data/books.csv), com vocabulário de títulos,
+distribuição de categorias (Zipf), preços, ratings e estoque realistas.
+A saída é determinística para a mesma seed e número de linhas, qualquer que seja o chunk size.
+
+Uso:
+    python -m benchmarks.catalog_generator --rows 1000000 --output data/books_1m.csv
+    python -m benchmarks.catalog_generator --rows 10000000 --output data/books_10m.parquet
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    "id", "title", "price", "price_text", "rating", "in_stock", "quantity",
+    "availability_text", "image_url", "book_url", "category",
+]
+
+# Ordenadas por popularidade no books.toscrape.com; a distribuição é Zipf sobre esta ordem.
+CATEGORIES = [
+    "Default", "Nonfiction", "Sequential Art", "Add a comment", "Fiction", "Young Adult",
+    "Fantasy", "Romance", "Mystery", "Food and Drink", "Childrens", "Historical Fiction",
+    "Poetry", "Classics", "Music", "Science Fiction", "Womens Fiction", "History",
+    "Thriller", "Horror", "Science", "Travel", "Philosophy", "Humor", "Art", "Psychology",
+    "Religion", "Spirituality", "Autobiography", "Contemporary", "Christian Fiction",
+    "Biography", "New Adult", "Business", "Health", "Sports and Games", "Self Help",
+    "Politics", "Christian", "Paranormal", "Cultural", "Suspense", "Short Stories",
+    "Historical", "Novels", "Adult Fiction", "Erotica", "Academic", "Parenting", "Crime",
+]
+
+# Proporções observadas no catálogo real (ratings 1 a 5).
+RATING_WEIGHTS = [0.226, 0.196, 0.203, 0.179, 0.196]
+
+LEADING_WORDS = ["The", "A", "My", "Our"]
+CONNECTORS = ["of", "and", "in", "the", "for", "with", "from", "to", "on", "of the"]
+
+VOCABULARY = [
+    "Love", "Life", "Secret", "World", "Night", "House", "Girl", "Time", "Story", "Book",
+    "Dark", "Last", "Little", "Heart", "History", "Guide", "Art", "Man", "Death", "Light",
+    "Lost", "Year", "City", "War", "Day", "Woman", "Dead", "Blood", "Wild", "Family",
+    "Home", "Kingdom", "Shadow", "King", "Queen", "Moon", "Sun", "Star", "Stars", "Fire",
+    "Water", "Road", "River", "Sea", "Mountain", "Garden", "Dream", "Dreams", "Memory",
+    "Journey", "Travel", "Adventure", "Mystery", "Murder", "Crime", "Truth", "Lies",
+    "Song", "Music", "Poems", "Letters", "Diary", "Chronicles", "Tales", "Legends",
+    "Empire", "Republic", "Revolution", "Science", "Mind", "Soul", "Spirit", "God",
+    "Faith", "Power", "Money", "Business", "Success", "Habits", "Happiness", "Cooking",
+    "Kitchen", "Bread", "Wine", "Coffee", "Chocolate", "Food", "Body", "Health", "Yoga",
+    "Children", "Boy", "Father", "Mother", "Daughter", "Son", "Sister", "Brother",
+    "Friends", "Lovers", "Stranger", "Ghost", "Witch", "Dragon", "Magic", "Sword",
+    "Throne", "Crown", "Glass", "Iron", "Gold", "Silver", "Stone", "Bone", "Ashes",
+    "Winter", "Summer", "Spring", "Autumn", "Storm", "Rain", "Snow", "Ocean", "Island",
+    "Paris", "London", "America", "Africa", "Japan", "Himalayas", "Tuscan", "Ararat",
+    "Modern", "Ancient", "Hidden", "Forgotten", "Broken", "Beautiful", "Perfect",
+    "Complete", "Essential", "Illustrated", "Unofficial", "Unexpected", "Impossible",
+    "Great", "Small", "Big", "Red", "Black", "White", "Blue", "Green", "Golden", "Silent",
+    "Forever", "Always", "Never", "Beyond", "Between", "Under", "Over", "Without",
+    "Rise", "Fall", "Return", "Escape", "Quest", "Game", "Games", "Rules", "Lessons",
+    "Economics", "Democracy", "Freedom", "Nature", "Animals", "Cat", "Dog", "Horse",
+    "Bird", "Wolf", "Bear", "Tiger", "Design", "Photography", "Painting", "Architecture",
+    "Novel",
+    "Comics", "Hero", "Heroes", "Villain", "Legacy", "Origin", "Future", "Past",
+    "Tomorrow", "Yesterday", "Today", "Midnight", "Morning", "Evening", "Eternity",
+]
+
+LEADING_WORD_RATE = 0.3
+CONNECTOR_RATE = 0.3
+SERIES_SUFFIX_RATE = 0.15
+DEFAULT_CHUNK_SIZE = 250_000
+# Linhas sorteadas com a mesma seed (derivada do índice do bloco); os chunks são fatias da sequência de blocos.
+BLOCK_ROWS = 16_384
+IMAGE_BASE = "https://books.toscrape.com/media/cache"
+BOOK_BASE = "https://books.toscrape.com/catalogue"
+
+
+def _zipf_weights(n: int, exponent: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+class CatalogGenerator:
+    def __init__(
+        self,
+        seed: int = 42,
+        in_stock_ratio: float = 0.9,
+        category_skew: float = 1.0,
+        word_skew: float = 1.1,
+        min_price: float = 10.0,
+        max_price: float = 60.0,
+    ):
+        self.seed = seed
+        self.in_stock_ratio = in_stock_ratio
+        self.min_price = min_price
+        self.max_price = max_price
+
+        self.words = np.array(VOCABULARY, dtype=object)
+        self.word_weights = _zipf_weights(len(self.words), word_skew)
+        self.categories = np.array(CATEGORIES, dtype=object)
+        self.category_weights = _zipf_weights(len(CATEGORIES), category_skew)
+
+    def _chunk(self, rng: np.random.Generator, start_id: int, size: int) -> pd.DataFrame:
+        ids = np.arange(start_id, start_id + size, dtype=np.int64)
+
+        lengths = np.clip(rng.geometric(1 / 3.5, size=size), 1, 12)
+        max_len = int(lengths.max())
+        word_idx = rng.choice(len(self.words), size=(size, max_len), p=self.word_weights)
+        connector_idx = np.where(
+            rng.random((size, max_len)) < CONNECTOR_RATE,
+            rng.integers(0, len(CONNECTORS), size=(size, max_len)),
+            -1,
+        )
+        leading_idx = np.where(
+            rng.random(size) < LEADING_WORD_RATE,
+            rng.integers(0, len(LEADING_WORDS), size=size),
+            -1,
+        )
+        series = rng.random(size) < SERIES_SUFFIX_RATE
+        series_num = rng.integers(1, 12, size=size)
+
+        titles = []
+        words = self.words
+        for row, connectors, length, leading, is_series, num in zip(
+            word_idx.tolist(), connector_idx.tolist(), lengths.tolist(),
+            leading_idx.tolist(), series.tolist(), series_num.tolist(),
+        ):
+            parts = [LEADING_WORDS[leading]] if leading >= 0 else []
+            for pos in range(length):
+                if pos and connectors[pos] >= 0:
+                    parts.append(CONNECTORS[connectors[pos]])
+                parts.append(words[row[pos]])
+            title = " ".join(parts)
+            if is_series:
+                title = f"{title} (Book #{num})"
+            titles.append(title)
+
+        slugs = pd.Series(titles).str.lower().str.replace(r"[^a-z0-9]+", "-", regex=True).str.strip("-")
+
+        cents = rng.integers(int(self.min_price * 100), int(self.max_price * 100), size=size)
+        prices = cents / 100.0
+        ratings = rng.choice(np.arange(1, 6), size=size, p=RATING_WEIGHTS)
+        in_stock = rng.random(size) < self.in_stock_ratio
+        quantity = np.where(in_stock, np.clip(rng.geometric(0.15, size=size), 1, 22), 0)
+        categories = self.categories[rng.choice(len(self.categories), size=size, p=self.category_weights)]
+        hashes = rng.integers(0, 2**63, size=(size, 2), dtype=np.int64)
+        image_hashes = [f"{a:016x}{b:016x}" for a, b in hashes.tolist()]
+
+        return pd.DataFrame({
+            "id": ids,
+            "title": titles,
+            "price": prices,
+            "price_text": [f"£{c // 100}.{c % 100:02d}" for c in cents],
+            "rating": ratings,
+            "in_stock": in_stock,
+            "quantity": quantity,
+            "availability_text": np.where(in_stock, "In stock", "Out of stock"),
+            "image_url": [f"{IMAGE_BASE}/{h[:2]}/{h[2:4]}/{h}.jpg" for h in image_hashes],
+            "book_url": [f"{BOOK_BASE}/{slug}_{book_id}/index.html" for slug, book_id in zip(slugs, ids)],
+            "category": categories,
+        }, columns=COLUMNS)
+
+    def _block(self, block: int, rows: int) -> pd.DataFrame:
+        start = block * BLOCK_ROWS
+        # Equivale a SeedSequence(seed).spawn(n)[block], sem depender de quantos blocos existem.
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(block,)))
+        return self._chunk(rng, start + 1, min(BLOCK_ROWS, rows - start))
+
+    def iter_chunks(self, rows: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """Chunks de ``chunk_size`` linhas (o último pode ser menor); com ``rows=0``, um único chunk vazio."""
+        if rows <= 0:
+            yield pd.DataFrame(columns=COLUMNS)
+            return
+
+        pending = []
+        pending_rows = 0
+        for block in range((rows + BLOCK_ROWS - 1) // BLOCK_ROWS):
+            pending.append(self._block(block, rows))
+            pending_rows += len(pending[-1])
+            while pending_rows >= chunk_size:
+                merged = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+                yield merged.iloc[:chunk_size].reset_index(drop=True)
+                rest = merged.iloc[chunk_size:].reset_index(drop=True)
+                pending, pending_rows = ([rest] if len(rest) else []), len(rest)
+        if pending:
+            yield pd.concat(pending, ignore_index=True)
+
+    def generate(self, rows: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
+        return pd.concat(self.iter_chunks(rows, chunk_size), ignore_index=True)
+
+    def write(self, rows: int, output: str, chunk_size: int = DEFAULT_CHUNK_SIZE, fmt: Optional[str] = None) -> int:
+        path = Path(output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fmt = fmt or ("parquet" if path.suffix == ".parquet" else "csv")
+
+        if fmt == "parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise RuntimeError("Formato parquet requer pyarrow. Execute: pip install pyarrow")
+
+            writer = None
+            try:
+                for chunk in self.iter_chunks(rows, chunk_size):
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+        elif fmt == "csv":
+            for idx, chunk in enumerate(self.iter_chunks(rows, chunk_size)):
+                chunk.to_csv(path, mode="w" if idx == 0 else "a", header=idx == 0, index=False, encoding="utf-8")
+        else:
+            raise ValueError(f"Formato não suportado: {fmt}")
+
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera catálogos sintéticos de livros para testes de escala")
+    parser.add_argument("--rows", type=int, default=100_000, help="Número de livros (ex.: 10000 a 10000000)")
+    parser.add_argument("--output", required=True, help="Arquivo de saída (.csv ou .parquet)")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--in-stock-ratio", type=float, default=0.9)
+    parser.add_argument("--category-skew", type=float, default=1.0, help="Expoente Zipf das categorias")
+    args = parser.parse_args()
+
+    generator = CatalogGenerator(
+        seed=args.seed,
+        in_stock_ratio=args.in_stock_ratio,
+        category_skew=args.category_skew,
+    )
+
+    start = time.perf_counter()
+    generator.write(args.rows, args.output, chunk_size=args.chunk_size, fmt=args.format)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {args.rows} livros gerados em {elapsed:.1f}s: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Gravação do site books.toscrape.com em um arquivo de fixture e servidor
+espelho local que reproduz as páginas gravadas.
+
+Uso:
+    python -m benchmarks.scraper_mirror record --output benchmarks/fixtures/books_toscrape.json.gz
+    python -m benchmarks.scraper_mirror serve --archive benchmarks/fixtures/books_toscrape.json.gz \\
+        --port 8001 --latency-ms 50 --jitter-ms 10 --error-rate 0.01
+"""
+import argparse
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from api.infra.scraping.scraper import BooksScraper
+
+DEFAULT_ARCHIVE = "benchmarks/fixtures/books_toscrape.json.gz"
+STATS_PATH = "/__mirror__/stats"
+RESET_PATH = "/__mirror__/reset"
+
+
+class RecordingSession(requests.Session):
+    def __init__(self):
+        super().__init__()
+        self.pages: Dict[str, Dict[str, any]] = {}
+
+    def request(self, method, url, *args, **kwargs):
+        response = super().request(method, url, *args, **kwargs)
+        if method.upper() == "GET":
+            self.pages[urlsplit(url).path] = {
+                "status": response.status_code,
+                "content_type": response.headers.get("Content-Type", "text/html"),
+                "body": base64.b64encode(response.content).decode("ascii"),
+            }
+        return response
+
+
+def record_site(base_url: str, output: str) -> int:
+    scraper = BooksScraper(base_url)
+    session = RecordingSession()
+    session.headers.update(scraper.session.headers)
+    scraper.session = session
+
+    df = scraper.scrape_all_books()
+
+    archive = {
+        "base_url": base_url,
+        "recorded_at": datetime.utcnow().isoformat(),
+        "total_books": len(df),
+        "pages": session.pages,
+    }
+
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(output, "wt", encoding="utf-8") as f:
+        json.dump(archive, f)
+
+    return len(session.pages)
+
+
+def load_archive(path: str) -> Dict[str, any]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        archive = json.load(f)
+
+    archive["pages"] = {
+        page_path: {**page, "body": base64.b64decode(page["body"])}
+        for page_path, page in archive["pages"].items()
+    }
+    return archive
+
+
+class MirrorServer:
+    """Servidor HTTP local que responde com as páginas do arquivo gravado."""
+
+    def __init__(
+        self,
+        archive: Dict[str, any],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.pages = archive["pages"]
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.reset_stats()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {"requests": 0, "pages_served": 0, "bytes_served": 0, "errors_injected": 0, "not_found": 0}
+
+    def _next_delay_and_error(self):
+        with self._lock:
+            delay = self.latency_ms + (self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0)
+            inject_error = self.error_rate > 0 and self._random.random() < self.error_rate
+        return max(delay, 0.0) / 1000, inject_error
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def _make_handler(self):
+        mirror = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+
+                if path == STATS_PATH:
+                    with mirror._lock:
+                        body = json.dumps(mirror.stats).encode()
+                    return self._send(200, body, "application/json")
+                if path == RESET_PATH:
+                    mirror.reset_stats()
+                    return self._send(200, b"{}", "application/json")
+
+                mirror._count("requests")
+                delay, inject_error = mirror._next_delay_and_error()
+                if delay:
+                    time.sleep(delay)
+
+                if inject_error:
+                    mirror._count("errors_injected")
+                    return self._send(503, b"Service Unavailable (injected)", "text/plain")
+
+                page = mirror.pages.get(path)
+                if page is None:
+                    mirror._count("not_found")
+                    return self._send(404, b"Not Found", "text/plain")
+
+                mirror._count("pages_served")
+                mirror._count("bytes_served", len(page["body"]))
+                self._send(page["status"], page["body"], page["content_type"])
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="scraper-mirror", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixture e servidor espelho do books.toscrape.com")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="Grava o site em um arquivo de fixture")
+    record.add_argument("--base-url", default=BooksScraper.BASE_URL)
+    record.add_argument("--output", default=DEFAULT_ARCHIVE)
+
+    serve = subparsers.add_parser("serve", help="Serve o arquivo gravado localmente")
+    serve.add_argument("--archive", default=DEFAULT_ARCHIVE)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8001)
+    serve.add_argument("--latency-ms", type=float, default=0.0, help="Latência fixa por requisição")
+    serve.add_argument("--jitter-ms", type=float, default=0.0, help="Variação aleatória da latência")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas 503 injetadas")
+    serve.add_argument("--seed", type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        total_pages = record_site(args.base_url, args.output)
+        print(f"✅ {total_pages} páginas gravadas em: {args.output}")
+        return
+
+    mirror = MirrorServer(
+        load_archive(args.archive),
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    print(f"Espelho disponível em: {mirror.base_url} ({len(mirror.pages)} páginas)")
+    print("Pressione CTRL+C para parar")
+    try:
+        mirror.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mirror.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import uuid
 from fastapi import FastAPI, Request
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
@@ -9,16 +10,31 @@ from pathlib import Path
 
 from prometheus_fastapi_instrumentator import Instrumentator
 
+from api.core.compression import CompressionMiddleware
 from api.core.config import get_settings
 from api.core.exception_handlers import register_exception_handlers
-from api.routers import books, categories, stats, health, auth, ml, scraping
+from api.routers import admin, books, categories, stats, health, auth, ml, scraping
+from api.infra.scraping.jobs import get_job_manager
 from api.infra.storage.database import get_database
-from api.core.logger import setup_logging, request_id_var, user_var
+from api.core.metrics import TimedJSONResponse
+from api.core.logger import AccessLogSampler, setup_logging, request_id_var, user_var
+from api.core.password_verifier import get_password_verifier
+from api.core.profiler import RequestProfilerMiddleware
+from api.core.rate_limit import RateLimitMiddleware
+from api.core.tracing import TracingMiddleware, get_tracer
 setup_logging()
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+access_log_sampler = AccessLogSampler(
+    default_rate=settings.access_log_sample_rate,
+    route_rates=settings.access_log_route_sample_rates,
+    status_rates=settings.access_log_status_sample_rates,
+    slow_ms=settings.access_log_slow_ms,
+    path_prefix=f"/api/{settings.api_version}",
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -34,10 +50,15 @@ async def lifespan(app: FastAPI):
         logger.info(f"Data loaded: {len(db.df)} books available")
     else:
         logger.warning("No data available. Please run scraping first.")
+    db.watch(settings.data_watch_interval_seconds)
     
     yield
     
     logger.info("Shutting down Books API...")
+    db.stop_watching()
+    get_job_manager().shutdown()
+    get_password_verifier().shutdown()
+    get_tracer().shutdown()
 
 
 app = FastAPI(
@@ -45,6 +66,7 @@ app = FastAPI(
     description=settings.api_description,
     version=settings.api_version,
     lifespan=lifespan,
+    default_response_class=Default(TimedJSONResponse),
     docs_url=f"/api/{settings.api_version}/docs",
     redoc_url=f"/api/{settings.api_version}/redoc",
     openapi_url=f"/api/{settings.api_version}/openapi.json",
@@ -58,6 +80,12 @@ Instrumentator().instrument(app).expose(
     include_in_schema=False,
 )
 
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(RequestProfilerMiddleware)
+app.add_middleware(TracingMiddleware)
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+# Último adicionado = mais externo: respostas 429 do rate limit também levam os headers de CORS.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -77,6 +105,24 @@ async def log_requests(request: Request, call_next):
 
     try:
         response = await call_next(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        # Sem INFO habilitado nenhum registro é montado.
+        if logger.isEnabledFor(logging.INFO):
+            sample_rate = access_log_sampler.sample(request.url.path, response.status_code, duration_ms)
+            if sample_rate is not None:
+                logger.info(
+                    "request_completed",
+                    extra={
+                        "request_id": request_id,
+                        "method": request.method,
+                        "path": request.url.path,
+                        "status_code": response.status_code,
+                        "duration_ms": round(duration_ms, 2),
+                        "user": user_var.get(),
+                        "sample_rate": sample_rate,
+                    },
+                )
     except Exception:
         duration_ms = (time.perf_counter() - start) * 1000
 
@@ -91,20 +137,6 @@ async def log_requests(request: Request, call_next):
         )
         raise
     finally:
-        duration_ms = (time.perf_counter() - start) * 1000
-
-        logger.info(
-            "request_completed",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "duration_ms": round(duration_ms, 2),
-                "user": user_var.get(),
-            },
-        )
-        
         user_var.reset(user_token)
         request_id_var.reset(request_id_token)
 
@@ -137,6 +169,7 @@ app.include_router(stats.router, prefix=api_prefix)
 app.include_router(auth.router, prefix=api_prefix)
 app.include_router(ml.router, prefix=api_prefix)
 app.include_router(scraping.router, prefix=api_prefix)
+app.include_router(admin.router, prefix=api_prefix)
 
 
 if __name__ == "__main__":
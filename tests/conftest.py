@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+# Os testes de API não devem esbarrar no limite de requisições nem depender de Redis.
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+
+@pytest.fixture(scope="session")
+def catalog():
+    from benchmarks.catalog_generator import CatalogGenerator
+
+    return CatalogGenerator(seed=7).generate(3000).reset_index(drop=True)
+
+
+@pytest.fixture(scope="session")
+def catalog_csv(catalog, tmp_path_factory):
+    path = tmp_path_factory.mktemp("data") / "books.csv"
+    catalog.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(scope="session")
+def books_db(catalog_csv):
+    from api.infra.storage.database import BooksDatabase
+
+    return BooksDatabase(str(catalog_csv))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _stop_log_listener():
+    yield
+    # O listener escreve no stdout capturado pelo pytest, que é fechado ao fim da sessão.
+    from api.core.logger import shutdown_logging
+
+    shutdown_logging()
@@ -0,0 +1,51 @@
+import random
+
+from api.core.logger import AccessLogSampler
+
+
+def make_sampler() -> AccessLogSampler:
+    return AccessLogSampler(
+        default_rate=0.5,
+        route_rates={"/books": 0.1, "/books/search": 0.2},
+        status_rates={"4xx": 1.0, "2xx": 0.3},
+        slow_ms=500,
+        path_prefix="/api/v1",
+    )
+
+
+def test_errors_and_slow_requests_are_always_logged():
+    sampler = make_sampler()
+    assert sampler.rate_for("/api/v1/books", 503, 1.0) == 1.0
+    assert sampler.rate_for("/api/v1/books", 200, 500.0) == 1.0
+
+
+def test_most_specific_route_rate_wins_for_successes():
+    sampler = make_sampler()
+    assert sampler.rate_for("/api/v1/books/search", 200, 1.0) == 0.2
+    assert sampler.rate_for("/api/v1/books/1", 200, 1.0) == 0.1
+    assert sampler.rate_for("/api/v1/stats/overview", 200, 1.0) == 0.3
+    assert sampler.rate_for("/api/v1/stats/overview", 301, 1.0) == 0.5
+
+
+def test_client_errors_use_status_class_rate():
+    assert make_sampler().rate_for("/api/v1/books/1", 404, 1.0) == 1.0
+
+
+def test_sample_returns_applied_rate_or_none(monkeypatch):
+    sampler = AccessLogSampler(default_rate=0.25, status_rates={"3xx": 0.0})
+    monkeypatch.setattr(random, "random", lambda: 0.2)
+    assert sampler.sample("/x", 200, 1.0) == 0.25
+    monkeypatch.setattr(random, "random", lambda: 0.3)
+    assert sampler.sample("/x", 200, 1.0) is None
+    assert sampler.sample("/x", 304, 1.0) is None
+    assert sampler.sample("/x", 500, 1.0) == 1.0
+
+
+def test_route_rates_match_path_segments_not_substrings():
+    sampler = make_sampler()
+    assert sampler.rate_for("/api/v1/books", 200, 1.0) == 0.1
+    assert sampler.rate_for("/api/v1/ml/books-similar", 200, 1.0) == 0.3
+    assert sampler.rate_for("/api/v1/booksx", 200, 1.0) == 0.3
+    assert sampler.rate_for("/api/v1/books/searchx", 200, 1.0) == 0.1
+    # Rotas fora do prefixo da API (ex.: /metrics) casam pelo caminho completo.
+    assert AccessLogSampler(route_rates={"/metrics": 0.0}, path_prefix="/api/v1").rate_for("/metrics", 200, 1.0) == 0.0
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from api.infra.ml.ann import ANNIndex
+from api.infra.ml.similarity import DEFAULT_WEIGHTS, SimilarityIndex
+from api.infra.storage.fuzzy import FuzzyTitleIndex
+from api.infra.storage.indexes import BooksSnapshot
+
+
+@pytest.fixture(scope="module")
+def similarity(catalog):
+    return SimilarityIndex(catalog, FuzzyTitleIndex(catalog["title"]))
+
+
+@pytest.fixture(scope="module")
+def ann(similarity):
+    return ANNIndex(similarity)
+
+
+def test_lists_partition_the_catalog(ann, similarity):
+    assert sorted(ann.order.tolist()) == list(range(len(similarity)))
+    assert ann.offsets[0] == 0 and ann.offsets[-1] == len(similarity)
+
+
+def test_probing_every_list_matches_exact_search(ann, similarity):
+    for row in (0, 17, 1234):
+        exact_rows, exact_scores = similarity.similar([row], 10)
+        rows, scores = ann.similar([row], 10, probes=ann.lists)
+        np.testing.assert_allclose(scores, exact_scores)
+        assert row not in rows
+
+
+def test_recall_is_reasonable_with_default_probes(ann, similarity):
+    rng = np.random.default_rng(1)
+    recalls = []
+    for row in rng.integers(0, len(similarity), 50):
+        _, exact_scores = similarity.similar([int(row)], 10)
+        _, scores = ann.similar([int(row)], 10)
+        recalls.append(np.mean(scores >= exact_scores[-1] - 1e-9))
+    assert np.mean(recalls) >= 0.8
+
+
+def test_other_weights_fall_back_to_exact_search(ann, similarity):
+    weights = {"title": 1.0}
+    exact = similarity.similar([3], 10, weights)
+    approximate = ann.similar([3], 10, weights, probes=1)
+    np.testing.assert_array_equal(approximate[0], exact[0])
+
+
+def test_more_like_this_excludes_seed_books(ann):
+    rows, _ = ann.similar([1, 2, 3], 10)
+    assert not {1, 2, 3} & set(rows.tolist())
+
+
+def test_snapshot_builds_ann_with_default_weights(catalog):
+    snapshot = BooksSnapshot(catalog, 1)
+    index = snapshot.ann_index()
+    assert index is snapshot.ann_index()
+    assert index.weights == DEFAULT_WEIGHTS
+
+
+def test_more_like_this_route(client):
+    response = client.post("/api/v1/ml/more-like-this", json={"book_ids": [1, 2, 2, 999999], "k": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["book_ids"] == [1, 2] and body["missing"] == [999999]
+    assert len(body["results"]) == 5
+    assert not {1, 2} & {book["id"] for book in body["results"]}
+
+    assert client.post("/api/v1/ml/more-like-this", json={"book_ids": [999999]}).status_code == 404
+    assert client.post("/api/v1/ml/more-like-this", json={"book_ids": []}).status_code == 422
+    assert client.post("/api/v1/ml/more-like-this", json={"book_ids": list(range(1, 60))}).status_code == 400
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from api.core import auth
+from api.core.auth import UserStore
+
+HASHED = "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW"
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+    real_hash = auth.get_password_hash
+
+    def counting_hash(password):
+        calls.append(password)
+        return real_hash(password)
+
+    monkeypatch.setattr(auth, "get_password_hash", counting_hash)
+    return calls
+
+
+def users_from(entries: str, monkeypatch) -> UserStore:
+    monkeypatch.setattr(auth.settings, "auth_users", entries)
+    return UserStore()
+
+
+def test_users_are_loaded_on_first_use():
+    loads = []
+    store = UserStore(loader=lambda: loads.append(1) or {"alice": {"username": "alice", "hashed_password": HASHED}})
+    assert loads == []
+
+    assert store.get("alice")["hashed_password"] == HASHED
+    assert store.get("nobody") is None
+    assert loads == [1]
+
+
+def test_plaintext_password_is_hashed_on_first_get(monkeypatch, hash_calls):
+    store = users_from("alice:wonderland:Alice:alice@example.com", monkeypatch)
+    assert store.needs_hashing("alice")
+    assert hash_calls == []
+
+    user = store.get("alice")
+    assert "plain_password" not in user
+    assert auth.verify_password("wonderland", user["hashed_password"])
+    assert not store.needs_hashing("alice")
+
+    store.get("alice")
+    assert hash_calls == ["wonderland"]
+
+
+def test_prehashed_password_is_used_as_is(monkeypatch, hash_calls):
+    store = users_from(f"bob:{HASHED}:Bob:bob@example.com", monkeypatch)
+    assert not store.needs_hashing("bob")
+    assert store.get("bob")["hashed_password"] == HASHED
+    assert not store.needs_hashing("nobody")
+    assert hash_calls == []
+
+
+def test_get_model_caches_one_frozen_instance(monkeypatch):
+    store = users_from(f"bob:{HASHED}:Bob:bob@example.com", monkeypatch)
+    user = store.get_model("bob")
+    assert store.get_model("bob") is user
+    assert store.get_model("nobody") is None
+    with pytest.raises(ValidationError):
+        user.disabled = True
+
+
+def test_reset_reloads_users_and_clears_token_cache(monkeypatch):
+    store = users_from(f"bob:{HASHED}:Bob:bob@example.com", monkeypatch)
+    user = store.get_model("bob")
+    auth.token_cache.put("token", user, exp=time.time() + 60)
+
+    monkeypatch.setattr(auth.settings, "auth_users", f"carol:{HASHED}:Carol:carol@example.com")
+    store.reset()
+
+    assert auth.token_cache.peek("token") is None
+    assert store.get_model("bob") is None
+    assert store.get_model("carol").email == "carol@example.com"
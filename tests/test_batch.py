@@ -0,0 +1,77 @@
+from api.core.config import get_settings
+
+
+def test_batch_lookup_keeps_request_order_and_reports_missing(client):
+    response = client.post("/api/v1/books/batch", json={"ids": [5, 3, 999_999, 5, 1]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [book["id"] for book in body["books"]] == [5, 3, 1]
+    assert body["missing"] == [999_999]
+    assert body["books"][0] == client.get("/api/v1/books/5").json()
+
+
+def test_batch_lookup_matches_database_rows(books_db, catalog):
+    ids = catalog["id"].sample(50, random_state=1).tolist() + [-1]
+    result = books_db.get_books_by_ids(ids)
+    assert [book["id"] for book in result["books"]] == ids[:-1]
+    assert result["missing"] == [-1]
+    expected = catalog.set_index("id").loc[ids[:-1], "title"].tolist()
+    assert [book["title"] for book in result["books"]] == expected
+
+
+def test_batch_lookup_limits(client):
+    too_many = list(range(1, get_settings().batch_max_ids + 2))
+    assert client.post("/api/v1/books/batch", json={"ids": too_many}).status_code == 400
+    assert client.post("/api/v1/books/batch", json={"ids": []}).status_code == 422
+
+
+def test_search_batch_matches_individual_searches(client):
+    queries = [
+        {"title": "the", "page_size": 3},
+        {"category": "fic", "min_rating": 4, "sort": "-price", "page_size": 2},
+        {"min_price": 10, "max_price": 12, "page": 2, "page_size": 2},
+        {"title": "gardn", "fuzzy": True, "facets": True, "page_size": 2},
+    ]
+    response = client.post("/api/v1/books/search/batch", json={"queries": queries})
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert len(results) == len(queries)
+    for query, result in zip(queries, results):
+        assert result == client.get("/api/v1/books/search", params=query).json()
+
+
+def test_search_batch_reports_failing_query(client):
+    queries = [{"title": "the"}, {"sort": "password"}]
+    response = client.post("/api/v1/books/search/batch", json={"queries": queries})
+    assert response.status_code == 400
+    assert response.json()["message"].startswith("Query 1:")
+    too_many = [{"title": "a"}] * (get_settings().batch_max_queries + 1)
+    assert client.post("/api/v1/books/search/batch", json={"queries": too_many}).status_code == 400
+
+
+def counting(calls, name, fn):
+    def wrapper(*args, **kwargs):
+        calls.append(name)
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def test_batch_search_evaluates_each_filter_once(books_db, monkeypatch):
+    snapshot = books_db._snapshot
+    calls = []
+    for name in ("filter_bits", "match_categories"):
+        monkeypatch.setattr(snapshot, name, counting(calls, name, getattr(snapshot, name)))
+
+    queries = [
+        {"category": "fic", "min_rating": 3, "skip": 0, "limit": 5},
+        {"category": "fic", "min_rating": 3, "skip": 5, "limit": 5, "sort": "-price"},
+        {"category": "fic", "min_rating": 3, "facets": True},
+        {"category": "fic", "min_rating": 4},
+    ]
+    search = books_db.batch_search()
+    results = [search(**query) for query in queries]
+    assert calls == ["match_categories", "filter_bits", "filter_bits"]
+
+    monkeypatch.undo()
+    assert results == [books_db.search_books(**query) for query in queries]
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from benchmarks.catalog_generator import BLOCK_ROWS, COLUMNS, CatalogGenerator
+
+
+def test_zero_rows_is_an_empty_catalog(tmp_path):
+    generator = CatalogGenerator(seed=1)
+    empty = generator.generate(0)
+    assert empty.empty
+    assert list(empty.columns) == COLUMNS
+
+    path = tmp_path / "books.csv"
+    generator.write(0, str(path))
+    assert list(pd.read_csv(path).columns) == COLUMNS
+
+
+def test_output_does_not_depend_on_chunk_size():
+    generator = CatalogGenerator(seed=1)
+    rows = BLOCK_ROWS + 1_000
+    expected = generator.generate(rows, chunk_size=rows)
+
+    for chunk_size in (999, BLOCK_ROWS, BLOCK_ROWS + 7):
+        chunks = list(generator.iter_chunks(rows, chunk_size))
+        assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+    assert expected["id"].tolist() == list(range(1, rows + 1))
@@ -0,0 +1,110 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from api.core.compression import CompressionMiddleware, SnapshotPayloadCache, negotiate, snapshot_response
+import api.core.compression as compression
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0, identity", None),
+        ("", None),
+        ("*", compression.ENCODINGS[0]),
+        ("deflate", None),
+    ],
+)
+def test_negotiate(header, expected):
+    assert negotiate(header) == expected
+
+
+def test_middleware_compresses_large_json_only():
+    app = FastAPI()
+
+    @app.get("/big")
+    def big():
+        return JSONResponse({"items": ["x" * 10] * 500})
+
+    @app.get("/small")
+    def small():
+        return JSONResponse({"ok": True})
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, levels={"gzip": 6})
+    client = TestClient(app)
+
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["items"][0] == "x" * 10
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.data_version = 1
+        self.items = ["a"] * 400
+        self.calls = 0
+
+    def produce(self):
+        self.calls += 1
+        return {"items": list(self.items)}
+
+
+@pytest.fixture
+def snapshot_app(monkeypatch):
+    monkeypatch.setattr(compression, "_payload_cache", SnapshotPayloadCache())
+    db = FakeDatabase()
+    app = FastAPI()
+
+    @app.get("/snapshot")
+    async def route(request: Request):
+        return await snapshot_response(request, "snapshot", db, dict, db.produce)
+
+    return TestClient(app), db
+
+
+def test_snapshot_response_is_built_once_and_revalidates(snapshot_app):
+    client, db = snapshot_app
+    first = client.get("/snapshot", headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200
+    assert first.headers["content-encoding"] == "gzip"
+    etag = first.headers["etag"]
+
+    again = client.get("/snapshot", headers={"Accept-Encoding": "identity"})
+    assert again.json() == first.json()
+    assert db.calls == 1
+
+    not_modified = client.get("/snapshot", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    db.data_version, db.items = 2, ["b"] * 400
+    changed = client.get("/snapshot", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["items"][0] == "b"
+
+
+def test_reload_during_build_does_not_cache_under_old_version(snapshot_app):
+    client, db = snapshot_app
+    original = db.produce
+
+    def produce_with_reload():
+        body = original()
+        if db.data_version == 1:
+            # Reload no meio da montagem: os bytes não podem ir para o cache da versão 1.
+            db.data_version, db.items = 2, ["b"] * 400
+        return body
+
+    db.produce = produce_with_reload
+    response = client.get("/snapshot")
+    cached = compression.get_payload_cache().peek("snapshot", 1)
+    assert cached is None
+    assert json.loads(response.content)["items"][0] == "b"
@@ -0,0 +1,109 @@
+import shutil
+
+import pytest
+
+from api.infra.storage.database import BooksDatabase
+from api.infra.storage.indexes import Cursor, decode_cursor, encode_cursor
+
+
+def test_data_version_is_derived_from_content(books_db, catalog_csv, tmp_path):
+    copy = tmp_path / "copy.csv"
+    shutil.copy(catalog_csv, copy)
+
+    assert books_db.data_version > 0
+    # Outro worker (ou réplica) com os mesmos dados chega à mesma versão.
+    assert BooksDatabase(str(copy)).data_version == books_db.data_version
+    assert books_db._snapshot.version == books_db.data_version
+
+
+def test_data_version_changes_with_content_and_survives_identical_reload(catalog, tmp_path):
+    path = tmp_path / "books.csv"
+    catalog.to_csv(path, index=False)
+    db = BooksDatabase(str(path))
+    first = db.data_version
+
+    db.reload_data()
+    assert db.data_version == first
+
+    catalog.assign(price=catalog["price"] + 1).to_csv(path, index=False)
+    db.reload_data()
+    assert db.data_version not in (0, first)
+
+
+def test_missing_file_has_version_zero(tmp_path):
+    assert BooksDatabase(str(tmp_path / "missing.csv")).data_version == 0
+
+
+def test_cursor_from_another_worker_resumes_by_position(books_db, catalog_csv, tmp_path):
+    copy = tmp_path / "copy.csv"
+    shutil.copy(catalog_csv, copy)
+    other = BooksDatabase(str(copy))
+
+    first = books_db.get_all_books(limit=10, sort="-price")
+    cursor = first["next_cursor"]
+    assert cursor.version == other.data_version
+    snapshot = other._snapshot
+    index = snapshot.sort_index("-price")
+    # Mesma versão: a posição vem direto do id, e bate com a busca pela chave.
+    assert snapshot.position_after(index, cursor) == index.bisect_after(cursor.key, cursor.id) == 10
+
+
+def walk(fetch, limit=97):
+    """Percorre todas as páginas pelo cursor e devolve os ids na ordem entregue."""
+    ids, after = [], None
+    while True:
+        page = fetch(limit=limit, after=after)
+        ids.extend(book["id"] for book in page["books"])
+        after = page["next_cursor"]
+        if after is None:
+            return ids
+
+
+def test_cursor_round_trip():
+    cursor = Cursor(version=123456789012, sort="-rating,title", key=(5, "A"), id=42)
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_cursor_walk_visits_every_book_once_in_order(books_db, catalog):
+    assert walk(books_db.get_all_books) == sorted(catalog["id"])
+
+
+def test_cursor_walk_with_filters_matches_offset_pages(books_db):
+    def fetch(**kwargs):
+        return books_db.search_books(category="fic", min_rating=3, sort="-price", **kwargs)
+
+    offset_ids = [book["id"] for book in fetch(limit=10_000)["books"]]
+    assert walk(fetch, limit=13) == offset_ids
+
+
+def test_cursor_survives_reload_without_skipping_or_repeating(catalog, tmp_path):
+    path = tmp_path / "books.csv"
+    catalog.to_csv(path, index=False)
+    db = BooksDatabase(str(path))
+
+    first = db.get_all_books(limit=100, sort="price")
+    seen = [book["id"] for book in first["books"]]
+    # Um scraping novo remove o último livro entregue e outros ainda não visitados.
+    removed = {seen[-1], *catalog.sort_values(["price", "id"])["id"].iloc[500:510]}
+    catalog[~catalog["id"].isin(removed)].to_csv(path, index=False)
+    db.reload_data()
+    assert first["next_cursor"].version != db.data_version
+
+    rest = []
+    after = first["next_cursor"]
+    while after is not None:
+        page = db.get_all_books(limit=100, after=after, sort="price")
+        rest.extend(book["id"] for book in page["books"])
+        after = page["next_cursor"]
+
+    expected = catalog[~catalog["id"].isin(removed)].sort_values(["price", "id"])["id"].tolist()
+    assert expected[:99] == seen[:-1]
+    assert rest == expected[99:]
+
+
+def test_invalid_cursor_is_a_client_error(client):
+    response = client.get("/api/v1/books", params={"cursor": "garbage"})
+    assert response.status_code == 400
+    assert response.json()["error"] == "invalid_input"
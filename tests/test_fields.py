@@ -0,0 +1,55 @@
+import pytest
+
+from api.domain.books.schemas import parse_fields
+
+ENDPOINTS = [
+    ("get", "/api/v1/books", {"page_size": 3}),
+    ("get", "/api/v1/books/5", {}),
+    ("get", "/api/v1/books/search", {"title": "the", "page_size": 3}),
+    ("get", "/api/v1/books/top-rated", {"limit": 3}),
+    ("get", "/api/v1/books/price-range", {"min": 10, "max": 20, "page_size": 3}),
+    ("post", "/api/v1/books/batch", {"json": {"ids": [1, 2]}}),
+    ("post", "/api/v1/books/search/batch", {"json": {"queries": [{"title": "the", "page_size": 2}]}}),
+]
+
+
+def books_in(body):
+    if isinstance(body, list):
+        return body
+    if "results" in body:
+        return [book for result in body["results"] for book in result["books"]]
+    if "books" in body:
+        return body["books"]
+    return [body]
+
+
+def call(client, method, path, options, **params):
+    if method == "get":
+        return client.get(path, params={**options, **params})
+    return client.post(path, params=params, **options)
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields("price, id,price") == ("id", "price")
+    with pytest.raises(ValueError):
+        parse_fields("id,password")
+
+
+@pytest.mark.parametrize("method,path,options", ENDPOINTS)
+def test_projection_returns_only_requested_fields(client, method, path, options):
+    full = call(client, method, path, options).json()
+    projected = call(client, method, path, options, fields="title,id").json()
+
+    assert books_in(projected) == [{"id": book["id"], "title": book["title"]} for book in books_in(full)]
+    if isinstance(full, dict) and "books" in full:
+        # Metadados da página (total, cursor, missing) não são afetados pela projeção.
+        assert {key: value for key, value in projected.items() if key != "books"} == {
+            key: value for key, value in full.items() if key != "books"
+        }
+
+
+def test_unknown_field_is_a_client_error(client):
+    response = client.get("/api/v1/books", params={"fields": "id,secret"})
+    assert response.status_code == 400
+    assert "secret" in response.json()["message"]
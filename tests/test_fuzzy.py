@@ -0,0 +1,93 @@
+import inspect
+
+import numpy as np
+import pytest
+
+from api.infra.storage.fuzzy import FuzzyTitleIndex, bounded_edit_distance, max_edits, tokenize
+
+
+def osa_distance(a: str, b: str) -> int:
+    """Referência sem limite da distância OSA (edições e transposições de letras vizinhas)."""
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def brute_force_search(titles, query):
+    words = tokenize(query)
+    hits = {}
+    for row, title in enumerate(titles):
+        title_words = tokenize(title)
+        best = []
+        for word in words:
+            similarities = [
+                1.0 - osa_distance(word, candidate) / max(len(word), len(candidate))
+                for candidate in title_words
+                if osa_distance(word, candidate) <= max_edits(word)
+            ]
+            if not similarities:
+                break
+            best.append(max(similarities))
+        else:
+            if words:
+                hits[row] = sum(best) / len(words)
+    return hits
+
+
+@pytest.fixture(scope="module")
+def fuzzy(catalog):
+    return FuzzyTitleIndex(catalog["title"])
+
+
+@pytest.mark.parametrize(
+    "a,b", [("garden", "gardne"), ("london", "lodnon"), ("kitten", "sitting"), ("", "abc"), ("secret", "secret")]
+)
+def test_bounded_edit_distance_matches_reference(a, b):
+    distance = osa_distance(a, b)
+    for bound in range(4):
+        assert bounded_edit_distance(a, b, bound) == (distance if distance <= bound else bound + 1)
+
+
+@pytest.mark.parametrize("query", ["Garden", "gardne london", "lvoe", "secrte guide", "of the", "queen lfie", "zzzz"])
+def test_search_matches_brute_force(fuzzy, catalog, query):
+    rows, scores = fuzzy.search(query)
+    expected = brute_force_search(catalog["title"].tolist(), query)
+
+    assert rows.tolist() == sorted(expected)
+    np.testing.assert_allclose(scores, [expected[row] for row in rows.tolist()])
+
+
+def test_typos_find_the_intended_title(books_db, catalog):
+    title = catalog["title"].iloc[0]
+    typo = " ".join(word[1] + word[0] + word[2:] if len(word) > 3 else word for word in title.split())
+    result = books_db.search_books(title=typo, fuzzy=True, limit=5, sort="relevance")
+
+    assert result["books"][0]["title"] == title
+
+
+def test_relevance_cursor_walk_matches_single_page(books_db):
+    def fetch(**kwargs):
+        return books_db.search_books(title="gardn", fuzzy=True, sort="relevance", **kwargs)
+
+    single = [book["id"] for book in fetch(limit=10_000)["books"]]
+    ids, after = [], None
+    while True:
+        page = fetch(limit=7, after=after)
+        ids.extend(book["id"] for book in page["books"])
+        after = page["next_cursor"]
+        if after is None:
+            break
+    assert ids == single and len(single) > 7
+
+
+@pytest.mark.parametrize("path", ["/books/search", "/books/search/batch"])
+def test_search_routes_run_in_the_threadpool(path):
+    # A primeira busca aproximada após um reload monta o índice; em rota async isso travaria o event loop.
+    from api.routers import books
+
+    route = next(route for route in books.router.routes if route.path == path)
+    assert not inspect.iscoroutinefunction(route.endpoint)
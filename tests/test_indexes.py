@@ -0,0 +1,205 @@
+import inspect
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.infra.storage.database import DEFAULT_PRICE_BUCKETS
+from api.infra.storage.indexes import (
+    MAX_LAZY_SORT_INDEXES,
+    bits_contain,
+    parse_sort,
+    popcount,
+    sort_name,
+    unpack_bits,
+)
+
+SORTS = ["id", "price", "-price", "-rating,title", "rating", "title", "-quantity,category", "category,-price", "-id"]
+
+
+def pandas_order(df: pd.DataFrame, spec: str) -> list:
+    """Referência: ``sort_values`` estável pelas chaves, com id crescente como desempate."""
+    keys = parse_sort(spec)
+    columns = [column for column, _ in keys] + ["id"]
+    ascending = [not descending for _, descending in keys] + [True]
+    return df.sort_values(columns, ascending=ascending, kind="mergesort")["id"].tolist()
+
+
+def test_parse_sort():
+    assert parse_sort("-rating, price") == (("rating", True), ("price", False))
+    assert parse_sort("price,id,title") == (("price", False),)
+    assert parse_sort(None) == ()
+    assert sort_name(parse_sort("+price,-rating")) == "price,-rating"
+    with pytest.raises(ValueError):
+        parse_sort("secret")
+    with pytest.raises(ValueError):
+        parse_sort("price,-price")
+
+
+@pytest.mark.parametrize("spec", SORTS)
+def test_sort_orders_match_pandas(books_db, catalog, spec):
+    name = sort_name(parse_sort(spec))
+    result = books_db.get_all_books(limit=len(catalog), sort=name)
+    assert [book["id"] for book in result["books"]] == pandas_order(catalog, spec)
+
+
+def test_lazy_sort_indexes_are_bounded(books_db):
+    snapshot = books_db._snapshot
+    for column in ("quantity", "category", "title", "price", "rating"):
+        for other in ("id", "-quantity", "-title", "-price"):
+            if column not in other:
+                snapshot.sort_index(sort_name(parse_sort(f"{column},{other}")))
+    assert len(snapshot._lazy_indexes) <= MAX_LAZY_SORT_INDEXES
+
+
+def test_top_rated_uses_rating_then_title(books_db, catalog):
+    top = [book["id"] for book in books_db.get_top_rated_books(limit=20)]
+    assert top == pandas_order(catalog, "-rating,title")[:20]
+
+
+@pytest.mark.parametrize("path", ["/books", "/books/price-range", "/books/search", "/books/search/batch"])
+def test_sortable_routes_run_in_the_threadpool(path):
+    # Ordens fora de PRESORTED são montadas no primeiro pedido; em rota async isso travaria o event loop.
+    from api.routers import books
+
+    route = next(route for route in books.router.routes if route.path == path)
+    assert not inspect.iscoroutinefunction(route.endpoint)
+
+
+def test_invalid_sort_is_a_client_error(client):
+    response = client.get("/api/v1/books", params={"sort": "password"})
+    assert response.status_code == 400
+
+
+PRICE_RANGES = [(10.0, 12.0), (0.0, 100.0), (35.31, 35.31), (59.0, 10.0), (None, 20.0), (45.5, None)]
+
+
+def pandas_price_mask(df: pd.DataFrame, min_price, max_price) -> pd.Series:
+    mask = pd.Series(True, index=df.index)
+    if min_price is not None:
+        mask &= df["price"] >= min_price
+    if max_price is not None:
+        mask &= df["price"] <= max_price
+    return mask
+
+
+@pytest.mark.parametrize("min_price,max_price", PRICE_RANGES)
+def test_price_index_matches_pandas(books_db, catalog, min_price, max_price):
+    price_index = books_db._snapshot.price_index
+    expected = catalog[pandas_price_mask(catalog, min_price, max_price)]
+
+    assert price_index.count(min_price, max_price) == len(expected)
+    assert sorted(catalog["id"].to_numpy()[price_index.rows_in_range(min_price, max_price)]) == sorted(expected["id"])
+
+
+@pytest.mark.parametrize("min_price,max_price", PRICE_RANGES)
+def test_price_index_per_category_matches_pandas(books_db, catalog, min_price, max_price):
+    snapshot = books_db._snapshot
+    codes = snapshot.match_categories("fic")
+    expected = catalog[
+        pandas_price_mask(catalog, min_price, max_price) & catalog["category"].isin(snapshot.categories[codes])
+    ]
+
+    rows = snapshot.price_index.rows_in_range(min_price, max_price, codes)
+    assert snapshot.price_index.count(min_price, max_price, codes) == len(expected)
+    assert sorted(snapshot.ids[rows]) == sorted(expected["id"])
+
+
+@pytest.mark.parametrize("sort", ["price", "id", "-rating,title"])
+def test_price_range_pages_match_pandas(books_db, catalog, sort):
+    expected = catalog[pandas_price_mask(catalog, 20.0, 30.0)]
+    result = books_db.get_books_by_price_range(20.0, 30.0, skip=5, limit=40, sort=sort)
+
+    assert result["total"] == len(expected)
+    assert [book["id"] for book in result["books"]] == pandas_order(expected, sort)[5:45]
+
+
+def pandas_search(df: pd.DataFrame, title=None, category=None, min_price=None, max_price=None, min_rating=None, in_stock=None):
+    """Referência dos filtros de ``search_books`` com operações do pandas sobre o catálogo inteiro."""
+    mask = pandas_price_mask(df, min_price, max_price)
+    if title:
+        mask &= df["title"].str.contains(title, case=False, regex=True)
+    if category:
+        mask &= df["category"].str.contains(category, case=False, regex=True)
+    if min_rating is not None:
+        mask &= df["rating"] >= min_rating
+    if in_stock is not None:
+        mask &= df["in_stock"] == in_stock
+    return df[mask]
+
+
+def test_bitmaps_match_pandas(books_db, catalog):
+    snapshot = books_db._snapshot
+    size = len(snapshot)
+    codes = snapshot.match_categories("fic")
+    bits = snapshot.filter_bits(categories=codes, min_rating=4, in_stock=False)
+    expected = catalog["category"].isin(snapshot.categories[codes]) & (catalog["rating"] >= 4) & ~catalog["in_stock"]
+
+    np.testing.assert_array_equal(unpack_bits(bits, size), expected.to_numpy())
+    assert popcount(bits) == int(expected.sum())
+    rows = np.arange(size)
+    np.testing.assert_array_equal(bits_contain(bits, rows), expected.to_numpy())
+    assert snapshot.filter_bits() is None
+
+
+SEARCHES = [
+    {"category": "fic"},
+    {"min_rating": 4},
+    {"in_stock": False},
+    {"category": "o", "min_rating": 2, "in_stock": True},
+    {"title": "love", "min_rating": 5},
+    {"title": "the", "category": "his"},
+    {"category": "fic", "min_price": 20.0, "max_price": 40.0},
+    {"min_price": 50.0, "min_rating": 3, "in_stock": True},
+    {"title": "garden", "min_price": 10.0, "max_price": 30.0, "category": "a", "in_stock": True},
+    {"category": "no such category"},
+]
+
+
+@pytest.mark.parametrize("filters", SEARCHES)
+@pytest.mark.parametrize("sort", ["id", "-price", "-rating,title"])
+def test_search_matches_pandas(books_db, catalog, filters, sort):
+    expected = pandas_search(catalog, **filters)
+    result = books_db.search_books(**filters, skip=3, limit=25, sort=sort)
+
+    assert result["total"] == len(expected)
+    assert [book["id"] for book in result["books"]] == pandas_order(expected, sort)[3:28]
+
+
+CATALOG_RATINGS = (1, 2, 3, 4, 5)
+
+
+def pandas_facets(df: pd.DataFrame, buckets=DEFAULT_PRICE_BUCKETS) -> dict:
+    edges = [0.0, *buckets, np.inf]
+    labels = [f"{low:g}-{high:g}" for low, high in zip(edges[:-2], edges[1:-1])] + [f"{buckets[-1]:g}+"]
+    counts = df["category"].value_counts()
+    return {
+        "category": {name: int(counts[name]) for name in sorted(counts.index, key=lambda name: (-counts[name], name))},
+        "rating": {str(rating): int((df["rating"] == rating).sum()) for rating in sorted(CATALOG_RATINGS)},
+        "stock": {"in_stock": int(df["in_stock"].sum()), "out_of_stock": int((~df["in_stock"]).sum())},
+        "price": pd.cut(df["price"], edges, right=False, labels=labels).value_counts().reindex(labels).astype(int).to_dict(),
+    }
+
+
+@pytest.mark.parametrize("filters", [{}, *SEARCHES])
+def test_facets_match_pandas(books_db, catalog, filters):
+    result = books_db.search_books(**filters, limit=5, facets=True)
+    assert result["facets"] == pandas_facets(pandas_search(catalog, **filters))
+
+
+def test_facets_with_custom_price_buckets(books_db, catalog):
+    result = books_db.search_books(min_rating=3, limit=1, facets=True, price_buckets=(25.0, 15.0))
+    expected = pandas_search(catalog, min_rating=3)
+    assert result["facets"]["price"] == {
+        "0-15": int((expected["price"] < 15).sum()),
+        "15-25": int(((expected["price"] >= 15) & (expected["price"] < 25)).sum()),
+        "25+": int((expected["price"] >= 25).sum()),
+    }
+
+
+def test_search_route_returns_facets(client):
+    response = client.get("/api/v1/books/search", params={"category": "fic", "facets": "true", "page_size": 1})
+    assert response.status_code == 200
+    facets = response.json()["facets"]
+    assert sum(facets["category"].values()) == response.json()["total"]
+    assert set(facets) == {"category", "rating", "stock", "price"}
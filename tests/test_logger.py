@@ -0,0 +1,93 @@
+import logging
+import queue
+import time
+
+from prometheus_client import REGISTRY
+
+from api.core.logger import BatchingQueueListener, BoundedQueueHandler, SizeAndTimeRotatingFileHandler
+
+
+def make_record(message: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, message, None, None)
+
+
+class BatchRecorder(logging.Handler):
+    def __init__(self, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+        self.batches = []
+        self._pending = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+        self._pending += 1
+
+    def flush(self) -> None:
+        self.batches.append(self._pending)
+        self._pending = 0
+
+
+def test_full_queue_drops_and_counts_records():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2))
+    before = REGISTRY.get_sample_value("log_records_dropped_total", {"level": "WARNING"}) or 0.0
+
+    for n in range(3):
+        handler.handle(make_record(f"record {n}", logging.WARNING))
+
+    assert handler.queue.qsize() == 2
+    assert REGISTRY.get_sample_value("log_records_dropped_total", {"level": "WARNING"}) == before + 1
+
+
+def test_listener_drains_in_batches_and_respects_handler_levels():
+    log_queue = queue.Queue()
+    for n in range(10):
+        log_queue.put(make_record(f"record {n}", logging.WARNING if n % 2 else logging.INFO))
+    everything, warnings = BatchRecorder(), BatchRecorder(logging.WARNING)
+
+    listener = BatchingQueueListener(log_queue, everything, warnings, batch_size=4)
+    listener.start()
+    listener.stop()
+
+    assert everything.messages == [f"record {n}" for n in range(10)]
+    assert warnings.messages == [f"record {n}" for n in range(1, 10, 2)]
+    # Um flush por lote; o sentinela pode chegar sozinho em um último lote vazio.
+    assert [size for size in everything.batches if size] == [4, 4, 2]
+
+
+def test_listener_stop_is_idempotent():
+    listener = BatchingQueueListener(queue.Queue(), BatchRecorder())
+    listener.stop()
+    listener.start()
+    listener.stop()
+    listener.stop()
+
+
+def test_rotates_when_size_is_reached(tmp_path):
+    path = tmp_path / "api.log"
+    handler = SizeAndTimeRotatingFileHandler(path, max_bytes=100, interval_seconds=3600, backup_count=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    # O tamanho é conferido antes de escrever: o terceiro registro vai para um arquivo novo.
+    for n in range(3):
+        handler.emit(make_record(f"{n}" * 59))
+    handler.close()
+
+    assert path.read_text().splitlines() == ["2" * 59]
+    assert (tmp_path / "api.log.1").read_text().splitlines() == ["0" * 59, "1" * 59]
+
+
+def test_rotates_when_interval_elapses(tmp_path, monkeypatch):
+    path = tmp_path / "api.log"
+    handler = SizeAndTimeRotatingFileHandler(path, max_bytes=0, interval_seconds=60, backup_count=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.emit(make_record("before"))
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    handler.emit(make_record("after"))
+    handler.emit(make_record("same interval"))
+    handler.close()
+
+    assert (tmp_path / "api.log.1").read_text().splitlines() == ["before"]
+    assert path.read_text().splitlines() == ["after", "same interval"]
+    assert handler.rollover_at == now + 61 + 60
@@ -0,0 +1,90 @@
+from typing import List, Optional
+
+import pytest
+from fastapi import APIRouter, FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from api.core.metrics import SERIALIZATION_SECONDS, TimedRoute
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    note: Optional[str] = None
+
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/async", response_model=List[Item], response_model_exclude_none=True)
+async def async_items():
+    return [{"id": 1, "name": "a"}, {"id": 2, "name": "b", "note": "x"}]
+
+
+@router.get("/sync", response_model=Item, status_code=201)
+def sync_item():
+    return {"id": 3, "name": "c"}
+
+
+@router.get("/invalid", response_model=Item)
+async def invalid_item():
+    return {"id": "not a number", "name": "d"}
+
+
+@router.get("/raw", response_model=Item)
+async def raw_item():
+    return Response(content=b'{"id":4}', media_type="application/json")
+
+
+@router.get("/plain")
+async def plain():
+    return {"ok": True}
+
+
+@pytest.fixture(scope="module")
+def app_client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def stage_count(stage: str) -> float:
+    for metric in SERIALIZATION_SECONDS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels["stage"] == stage:
+                return sample.value
+    return 0.0
+
+
+def test_response_model_stages_are_timed(app_client):
+    before = {stage: stage_count(stage) for stage in ("response_validation", "model_dump")}
+    response = app_client.get("/async")
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1, "name": "a"}, {"id": 2, "name": "b", "note": "x"}]
+    for stage, count in before.items():
+        assert stage_count(stage) == count + 1
+
+
+def test_sync_route_keeps_status_code(app_client):
+    response = app_client.get("/sync")
+    assert response.status_code == 201
+    assert response.json() == {"id": 3, "name": "c", "note": None}
+
+
+def test_invalid_response_is_a_server_error(app_client):
+    assert app_client.get("/invalid").status_code == 500
+
+
+def test_responses_and_routes_without_model_pass_through(app_client):
+    before = stage_count("model_dump")
+    assert app_client.get("/raw").json() == {"id": 4}
+    assert app_client.get("/plain").json() == {"ok": True}
+    assert stage_count("model_dump") == before
+
+
+def test_openapi_keeps_response_model(app_client):
+    schema = app_client.get("/openapi.json").json()
+    assert schema["paths"]["/sync"]["get"]["responses"]["201"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/Item"
+    }
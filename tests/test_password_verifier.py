@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from api.core.password_verifier import PasswordVerifier
+from api.domain.common.exceptions import ServiceBusyError
+
+
+def test_concurrency_is_capped_at_max_workers():
+    verifier = PasswordVerifier("secret", max_workers=2, max_queue=10)
+    lock = threading.Lock()
+    running = peak = 0
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return True
+
+    async def run():
+        return await asyncio.gather(*(verifier.run(work) for _ in range(6)))
+
+    assert asyncio.run(run()) == [True] * 6
+    assert peak == 2
+    assert verifier.stats()["in_flight"] == 0
+    verifier.shutdown()
+
+
+def test_full_queue_raises_service_busy():
+    verifier = PasswordVerifier("secret", max_workers=1, max_queue=1)
+    release = threading.Event()
+    blocked = lambda: release.wait(5)
+
+    async def run():
+        # Um em execução e um na fila: o terceiro é recusado sem esperar.
+        admitted = [asyncio.ensure_future(verifier.run(blocked)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceBusyError):
+            await verifier.run(blocked)
+        release.set()
+        return await asyncio.gather(*admitted)
+
+    assert asyncio.run(run()) == [True, True]
+    verifier.shutdown()
+
+
+def test_credential_cache_hits_misses_and_expires():
+    verifier = PasswordVerifier("secret", cache_ttl_seconds=0.2)
+    calls = []
+
+    def bcrypt_check(plain, hashed):
+        calls.append(plain)
+        return plain == "right"
+
+    async def verify(password):
+        return await verifier.verify("admin", password, "$2b$hash", bcrypt_check)
+
+    assert asyncio.run(verify("right"))
+    assert asyncio.run(verify("right"))
+    assert calls == ["right"]
+
+    # Senha errada nunca é servida do cache, nem entra nele.
+    assert not asyncio.run(verify("wrong"))
+    assert not asyncio.run(verify("wrong"))
+    assert calls == ["right", "wrong", "wrong"]
+    assert verifier.stats()["cached_credentials"] == 1
+
+    time.sleep(0.25)
+    assert asyncio.run(verify("right"))
+    assert calls[-1] == "right" and len(calls) == 4
+    verifier.shutdown()
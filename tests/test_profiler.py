@@ -0,0 +1,50 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.core.auth import create_access_token
+from api.core.profiler import RequestProfilerMiddleware, profile_store
+
+
+@pytest.fixture(scope="module")
+def profiled_client():
+    app = FastAPI()
+
+    @app.get("/work")
+    def work():
+        return {"total": sum(range(10_000))}
+
+    middleware = RequestProfilerMiddleware(app)
+    middleware.enabled = True
+    return TestClient(middleware)
+
+
+def bearer(username="admin") -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+
+def test_profile_requires_authenticated_user(profiled_client):
+    assert "x-profile-id" not in profiled_client.get("/work", headers={"X-Profile": "1"}).headers
+    invalid = {"X-Profile": "1", "Authorization": "Bearer not-a-token"}
+    assert "x-profile-id" not in profiled_client.get("/work", headers=invalid).headers
+    unknown = {"X-Profile": "1", **bearer("nobody")}
+    assert "x-profile-id" not in profiled_client.get("/work", headers=unknown).headers
+
+
+def test_profile_id_is_generated_by_the_server(profiled_client):
+    headers = {"X-Profile": "1", "X-Request-ID": "client-chosen", **bearer()}
+    first = profiled_client.get("/work", headers=headers).headers["x-profile-id"]
+    second = profiled_client.get("/work", headers=headers).headers["x-profile-id"]
+
+    assert first != second
+    assert "client-chosen" not in (first, second)
+    entry = profile_store.get(first)
+    assert entry["path"] == "/work"
+    assert entry["overlapping_requests"] == 0
+    assert profile_store.get("client-chosen") is None
+
+
+def test_requests_without_header_are_not_profiled(profiled_client):
+    response = profiled_client.get("/work", headers=bearer())
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
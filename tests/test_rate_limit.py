@@ -0,0 +1,85 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+
+from api.core.rate_limit import MemoryRateLimitBackend, RateLimiter, RateLimitMiddleware
+
+
+def make_limiter(**kwargs) -> RateLimiter:
+    options = dict(
+        backend=MemoryRateLimitBackend(max_keys=100),
+        limit=5,
+        window_seconds=60,
+        route_costs={"/books/search": 3, "/books/search/batch": 10, "/auth/login": 5},
+        exempt_paths=["/health", "/metrics"],
+        path_prefix="/api/v1",
+    )
+    options.update(kwargs)
+    return RateLimiter(**options)
+
+
+def scope(path="/api/v1/books", client=("10.0.0.1", 1234), headers=()):
+    return {"type": "http", "path": path, "client": client, "headers": list(headers)}
+
+
+def test_costs_match_route_path_not_substring():
+    limiter = make_limiter()
+    assert limiter.cost_for("/api/v1/books/search") == ("/books/search", 3)
+    assert limiter.cost_for("/api/v1/books/search/batch") == ("/books/search/batch", 10)
+    assert limiter.cost_for("/api/v1/books/searchx") == ("default", 1)
+    assert limiter.cost_for("/api/v1/books/1/auth/login") == ("default", 1)
+
+
+def test_exempt_paths_match_route_path_not_substring():
+    limiter = make_limiter()
+    assert limiter.is_exempt("/api/v1/health")
+    assert limiter.is_exempt("/metrics")
+    assert not limiter.is_exempt("/api/v1/books/search?title=/health")
+    assert not limiter.is_exempt("/api/v1/books/health-guides")
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies():
+    limiter = make_limiter()
+    forged = scope(headers=[(b"x-forwarded-for", b"1.2.3.4")])
+    assert limiter.client_ip(forged) == "10.0.0.1"
+
+
+def test_forwarded_for_uses_trusted_hop():
+    limiter = make_limiter(trusted_proxy_hops=1)
+    proxied = scope(headers=[(b"x-forwarded-for", b"6.6.6.6, 1.2.3.4")])
+    assert limiter.client_ip(proxied) == "1.2.3.4"
+
+
+def test_budget_is_enforced_per_client():
+    limiter = make_limiter()
+
+    async def run():
+        results = [await limiter.check(scope("/api/v1/books/search")) for _ in range(2)]
+        other = await limiter.check(scope("/api/v1/books/search", client=("10.0.0.2", 1)))
+        return results, other
+
+    (first, second), other = asyncio.run(run())
+    assert first[1].allowed and not second[1].allowed
+    assert second[1].retry_after > 0
+    assert other[1].allowed
+
+
+def test_rate_limited_response_carries_cors_headers():
+    app = FastAPI()
+
+    @app.get("/api/v1/books")
+    def books():
+        return []
+
+    app.add_middleware(RateLimitMiddleware, limiter=make_limiter(limit=1))
+    app.add_middleware(CORSMiddleware, allow_origins=["*"])
+    client = TestClient(app)
+
+    headers = {"Origin": "http://example.com"}
+    assert client.get("/api/v1/books", headers=headers).status_code == 200
+    limited = client.get("/api/v1/books", headers=headers)
+    assert limited.status_code == 429
+    assert limited.headers["access-control-allow-origin"] == "*"
+    assert "retry-after" in limited.headers
@@ -0,0 +1,108 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from api.core.auth import create_access_token, create_refresh_token
+from api.core.revocation import BloomFilter, TokenDenyList
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+
+
+def test_revoked_token_is_reported_until_it_expires():
+    deny_list = TokenDenyList(max_entries=10)
+    deny_list.revoke("a", time.time() + 60)
+    deny_list.revoke("expired", time.time() - 1)
+
+    assert deny_list.is_revoked("a")
+    assert not deny_list.is_revoked("expired")
+    assert not deny_list.is_revoked("other")
+
+
+def test_full_list_never_unrevokes_a_live_token():
+    deny_list = TokenDenyList(max_entries=3)
+    now = time.time()
+    for i in range(10):
+        deny_list.revoke(f"jti-{i}", now + 60 + i)
+
+    assert all(deny_list.is_revoked(f"jti-{i}") for i in range(10))
+    assert deny_list.max_entries >= 10
+
+
+def test_full_list_prunes_only_expired_entries(monkeypatch):
+    deny_list = TokenDenyList(max_entries=2)
+    now = time.time()
+    deny_list.revoke("short", now + 1)
+    deny_list.revoke("long", now + 100)
+
+    monkeypatch.setattr(time, "time", lambda: now + 2)
+    deny_list.revoke("new", now + 100)
+
+    assert deny_list.max_entries == 2
+    assert not deny_list.is_revoked("short")
+    assert deny_list.is_revoked("long") and deny_list.is_revoked("new")
+
+
+def test_stale_heap_entry_does_not_drop_rerevoked_token(monkeypatch):
+    deny_list = TokenDenyList(max_entries=10)
+    now = time.time()
+    deny_list.revoke("a", now + 1)
+    deny_list.revoke("a", now + 100)
+
+    monkeypatch.setattr(time, "time", lambda: now + 2)
+    deny_list.revoke("b", now + 100)
+
+    assert deny_list.is_revoked("a")
+
+
+def test_refresh_token_rotates_and_cannot_be_reused(client):
+    refresh_token = create_refresh_token({"sub": "admin"})
+    first = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert first.status_code == 200
+    assert first.json()["refresh_token"] != refresh_token
+
+    reused = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert reused.status_code == 401
+
+    rotated = client.post("/api/v1/auth/refresh", json={"refresh_token": first.json()["refresh_token"]})
+    assert rotated.status_code == 200
+
+
+def test_logout_revokes_cached_access_token_and_refresh_token(client):
+    access_token = create_access_token({"sub": "admin"})
+    refresh_token = create_refresh_token({"sub": "admin"})
+    headers = {"Authorization": f"Bearer {access_token}"}
+    # Primeiro uso coloca o token no cache de tokens verificados.
+    assert client.get("/api/v1/scraping/jobs", headers=headers).status_code == 200
+
+    logout = client.post("/api/v1/auth/logout", headers=headers, json={"refresh_token": refresh_token})
+    assert logout.status_code == 200
+
+    assert client.get("/api/v1/scraping/jobs", headers=headers).status_code == 401
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token}).status_code == 401
+
+
+def test_invalid_refresh_token_at_logout_revokes_nothing(client):
+    access_token = create_access_token({"sub": "admin"})
+    headers = {"Authorization": f"Bearer {access_token}"}
+    other_users_refresh = create_refresh_token({"sub": "testuser"})
+
+    for refresh_token in ("not-a-token", access_token, other_users_refresh):
+        logout = client.post("/api/v1/auth/logout", headers=headers, json={"refresh_token": refresh_token})
+        assert logout.status_code == 401
+    assert client.get("/api/v1/scraping/jobs", headers=headers).status_code == 200
+
+
+def test_logout_with_expired_access_token_is_a_client_error():
+    from api.domain.auth.service import AuthService
+    from api.domain.common.exceptions import InvalidCredentialsError
+
+    expired = create_access_token({"sub": "admin"}, expires_delta=timedelta(seconds=-1))
+    with pytest.raises(InvalidCredentialsError):
+        AuthService().logout(expired)
@@ -0,0 +1,141 @@
+import base64
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+import requests
+
+from api.infra.scraping.scraper import BooksScraper
+from benchmarks.scraper_mirror import DEFAULT_ARCHIVE, STATS_PATH, MirrorServer, load_archive
+
+CATEGORY = "/catalogue/category/books/poetry_23/index.html"
+BOOK = "/catalogue/a-light-in-the-attic_1000/index.html"
+
+
+def product_pod(slug: str, title: str, price: str, rating: str, availability: str) -> str:
+    # Mesma marcação das páginas de catálogo do books.toscrape.com.
+    return f"""
+    <article class="product_pod">
+      <div class="image_container">
+        <a href="../../../{slug}/index.html"><img src="../../../../media/cache/{slug}.jpg" alt="{title}" class="thumbnail"></a>
+      </div>
+      <p class="star-rating {rating}"><i class="icon-star"></i></p>
+      <h3><a href="../../../{slug}/index.html" title="{title}">{title[:10]}...</a></h3>
+      <div class="product_price">
+        <p class="price_color">{price}</p>
+        <p class="instock availability"><i class="icon-ok"></i> {availability}</p>
+      </div>
+    </article>"""
+
+
+PAGES = {
+    "/index.html": """
+    <ul class="nav nav-list">
+      <li><a href="catalogue/category/books_1/index.html">Books</a>
+        <ul><li><a href="catalogue/category/books/poetry_23/index.html">Poetry</a></li></ul>
+      </li>
+    </ul>""",
+    CATEGORY: "<ol class='row'>"
+    + product_pod("a-light-in-the-attic_1000", "A Light in the Attic", "£51.77", "Three", "In stock")
+    + product_pod("olio_984", "Olio", "£23.88", "One", "In stock")
+    + "</ol><ul class='pager'><li class='next'><a href='page-2.html'>next</a></li></ul>",
+    "/catalogue/category/books/poetry_23/page-2.html": "<ol class='row'>"
+    + product_pod("the-black-maria_991", "The Black Maria", "£52.15", "Five", "Out of stock")
+    + "</ol>",
+    BOOK: """
+    <div id="product_description" class="sub-header"><h2>Product Description</h2></div>
+    <p>It's hard to imagine a world without A Light in the Attic.</p>
+    <table class="table table-striped">
+      <tr><th>UPC</th><td>a897fe39b1053632</td></tr>
+      <tr><th>Product Type</th><td>Books</td></tr>
+      <tr><th>Price (excl. tax)</th><td>£51.77</td></tr>
+      <tr><th>Price (incl. tax)</th><td>£51.77</td></tr>
+      <tr><th>Tax</th><td>£0.00</td></tr>
+      <tr><th>Availability</th><td>In stock (22 available)</td></tr>
+      <tr><th>Number of reviews</th><td>0</td></tr>
+    </table>""",
+}
+
+
+@pytest.fixture(scope="module")
+def archive(tmp_path_factory):
+    # Gravado no mesmo formato de record_site e lido por load_archive, como no benchmark.
+    path = tmp_path_factory.mktemp("mirror") / "books_toscrape.json.gz"
+    pages = {
+        page_path: {
+            "status": 200,
+            "content_type": "text/html; charset=utf-8",
+            "body": base64.b64encode(f"<html><body>{html}</body></html>".encode()).decode("ascii"),
+        }
+        for page_path, html in PAGES.items()
+    }
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump({"base_url": BooksScraper.BASE_URL, "pages": pages}, f)
+    return load_archive(str(path))
+
+
+@pytest.fixture
+def mirror(archive):
+    server = MirrorServer(archive)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_catalogue_page_parses_with_scraper_selectors(mirror):
+    books = BooksScraper(mirror.base_url).scrape_page(mirror.base_url + CATEGORY)
+
+    assert [(book["title"], book["price"], book["rating"], book["in_stock"]) for book in books] == [
+        ("A Light in the Attic", 51.77, 3, True),
+        ("Olio", 23.88, 1, True),
+    ]
+    assert books[0]["book_url"] == mirror.base_url + BOOK
+
+
+def test_book_page_parses_with_scraper_selectors(mirror):
+    details = BooksScraper(mirror.base_url).scrape_book_details(mirror.base_url + BOOK)
+
+    assert details["upc"] == "a897fe39b1053632"
+    assert details["price_incl_tax"] == "£51.77"
+    assert details["number_of_reviews"] == 0
+    assert details["description"].startswith("It's hard to imagine")
+
+
+def test_full_scrape_follows_categories_and_pagination(mirror):
+    df = BooksScraper(mirror.base_url, page_delay=0, category_delay=0).scrape_all_books()
+
+    assert df["title"].tolist() == ["A Light in the Attic", "Olio", "The Black Maria"]
+    assert set(df["category"]) == {"Poetry"}
+    assert df["id"].tolist() == [1, 2, 3]
+    assert mirror.stats["pages_served"] == 3
+    assert requests.get(mirror.base_url + STATS_PATH).json()["not_found"] == 0
+
+
+def test_injected_errors_and_unknown_pages_are_counted(archive):
+    server = MirrorServer(archive, error_rate=1.0, seed=1)
+    server.start()
+    try:
+        assert BooksScraper(server.base_url).scrape_page(server.base_url + CATEGORY) == []
+        assert server.stats["errors_injected"] == 1
+        server.error_rate = 0.0
+        assert requests.get(server.base_url + "/missing.html").status_code == 404
+        assert server.stats["not_found"] == 1
+    finally:
+        server.stop()
+
+
+@pytest.mark.skipif(not Path(DEFAULT_ARCHIVE).exists(), reason="fixture gravada ausente (python -m benchmarks.scraper_mirror record)")
+def test_recorded_archive_parses_with_scraper_selectors():
+    server = MirrorServer(load_archive(DEFAULT_ARCHIVE))
+    server.start()
+    try:
+        scraper = BooksScraper(server.base_url)
+        categories = scraper.get_all_categories()
+        assert categories
+
+        books = scraper.scrape_page(categories[0]["url"])
+        assert books and all(book["title"] and book["price"] > 0 for book in books)
+        assert scraper.scrape_book_details(books[0]["book_url"])["upc"]
+    finally:
+        server.stop()
@@ -0,0 +1,130 @@
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from api.infra.scraping.jobs import (
+    COMPLETED,
+    FAILED,
+    HAS_FCNTL,
+    RUNNING,
+    ScrapeJob,
+    ScrapeJobManager,
+    ScrapeLock,
+    SharedJobState,
+)
+from api.infra.storage.database import BooksDatabase
+from api.infra.scraping.scraper import BooksScraper
+
+pytestmark = pytest.mark.skipif(not HAS_FCNTL, reason="flock indisponível nesta plataforma")
+
+
+def test_lock_is_exclusive_across_open_files(tmp_path):
+    path = str(tmp_path / "books.csv.lock")
+    first, second = ScrapeLock(path), ScrapeLock(path)
+
+    assert first.acquire({"job_id": "a"})
+    assert not second.acquire({"job_id": "b"})
+    assert second.holder() == {"job_id": "a"}
+
+    first.release()
+    assert second.holder() == {}
+    assert second.acquire({"job_id": "b"})
+    second.release()
+
+
+def test_start_reports_job_running_in_another_process(tmp_path):
+    output = str(tmp_path / "books.csv")
+    other = ScrapeLock(f"{output}.lock")
+    assert other.acquire({"job_id": "elsewhere", "triggered_by": "admin", "pid": 1, "started_at": "2026-01-01T00:00:00"})
+
+    manager = ScrapeJobManager("http://127.0.0.1:9", output)
+    job, created = manager.start(triggered_by="testuser")
+
+    assert not created
+    assert (job.id, job.status, job.triggered_by, job.pid) == ("elsewhere", RUNNING, "admin", 1)
+    assert manager.list_jobs() == []
+    other.release()
+
+
+def test_job_of_another_process_can_be_polled_and_cancelled(tmp_path):
+    output = str(tmp_path / "books.csv")
+    owner_lock, owner_state = ScrapeLock(f"{output}.lock"), SharedJobState(f"{output}.job.json")
+    assert owner_lock.acquire({"job_id": "elsewhere"})
+    job = ScrapeJob(id="elsewhere", triggered_by="admin", status=RUNNING, started_at=datetime.utcnow(), pages_fetched=7)
+    owner_state.write(job)
+
+    manager = ScrapeJobManager("http://127.0.0.1:9", output)
+    running, created = manager.start(triggered_by="testuser")
+    assert not created
+    assert (running.id, running.pages_fetched) == ("elsewhere", 7)
+    assert manager.get("elsewhere").status == RUNNING
+    assert [listed.id for listed in manager.list_jobs()] == ["elsewhere"]
+    assert manager.get("unknown") is None
+
+    assert manager.cancel("elsewhere").cancel_requested
+    assert owner_state.cancel_requested("elsewhere")
+
+    job.status, job.finished_at = COMPLETED, datetime.utcnow()
+    owner_state.write(job)
+    owner_lock.release()
+    assert manager.get("elsewhere").status == COMPLETED
+
+
+def test_job_whose_owner_died_is_reported_failed(tmp_path):
+    output = str(tmp_path / "books.csv")
+    SharedJobState(f"{output}.job.json").write(ScrapeJob(id="orphan", triggered_by="admin", status=RUNNING))
+
+    job = ScrapeJobManager("http://127.0.0.1:9", output).get("orphan")
+    assert job.status == FAILED
+    assert job.error
+
+
+def test_job_state_is_visible_to_other_managers(tmp_path):
+    output = str(tmp_path / "books.csv")
+    owner, other = ScrapeJobManager("http://127.0.0.1:9", output), ScrapeJobManager("http://127.0.0.1:9", output)
+
+    job, created = owner.start(triggered_by="testuser")
+    assert created
+    deadline = time.monotonic() + 60
+    while other.get(job.id).is_active and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+    # Nada extraído de um host inacessível: o estado final chega ao outro processo e o lock fica livre.
+    assert other.get(job.id).status == FAILED
+    assert other.start(triggered_by="testuser")[0].id != job.id
+    other.shutdown()
+
+
+def test_reload_if_changed_picks_up_a_replaced_file(tmp_path, catalog):
+    path = tmp_path / "books.csv"
+    catalog.head(10).to_csv(path, index=False)
+    db = BooksDatabase(str(path))
+    version = db.data_version
+
+    assert not db.reload_if_changed()
+    catalog.head(10).to_csv(path, index=False)
+    assert not db.reload_if_changed()
+    assert db.data_version == version
+
+    catalog.head(20).to_csv(tmp_path / "books.csv.tmp", index=False)
+    (tmp_path / "books.csv.tmp").replace(path)
+    assert db.reload_if_changed()
+    assert db.total_books == 20
+    assert db.data_version != version
+
+
+@pytest.mark.parametrize("name", ["books.csv", "books.parquet"])
+def test_scraper_saves_in_the_format_of_the_path(tmp_path, catalog, name):
+    path = tmp_path / name
+    BooksScraper(base_url="http://127.0.0.1:9").save(catalog.head(20), str(path))
+
+    read = pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+    pd.testing.assert_frame_equal(read, catalog.head(20), check_dtype=False)
+
+
+def test_temporary_file_uses_the_destination_format(tmp_path, catalog):
+    path = tmp_path / "books.parquet.tmp"
+    BooksScraper(base_url="http://127.0.0.1:9").save(catalog.head(5), str(path), fmt="parquet")
+    assert len(pd.read_parquet(path)) == 5
@@ -0,0 +1,55 @@
+import re
+
+import numpy as np
+
+from api.infra.ml.similarity import DEFAULT_WEIGHTS, SimilarityIndex
+from api.infra.storage.fuzzy import TOKEN_PATTERN, FuzzyTitleIndex
+
+
+def _dense_tfidf(titles):
+    tokens = [set(re.findall(TOKEN_PATTERN, str(title).lower())) for title in titles]
+    vocabulary = {word: i for i, word in enumerate(sorted(set().union(*tokens)))}
+    matrix = np.zeros((len(tokens), len(vocabulary)))
+    for row, words in enumerate(tokens):
+        for word in words:
+            matrix[row, vocabulary[word]] = 1.0
+    idf = np.log((1 + len(tokens)) / (1 + matrix.sum(axis=0))) + 1.0
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def test_title_scores_match_dense_tfidf(catalog):
+    index = SimilarityIndex(catalog, FuzzyTitleIndex(catalog["title"]))
+    dense = _dense_tfidf(catalog["title"])
+    for row in range(0, len(catalog), 97):
+        np.testing.assert_allclose(index.title_scores(row), dense @ dense[row], atol=1e-5)
+
+
+def test_scores_for_matches_full_scores(catalog):
+    index = SimilarityIndex(catalog, FuzzyTitleIndex(catalog["title"]))
+    rng = np.random.default_rng(0)
+    for row in rng.integers(0, len(catalog), 20):
+        candidates = rng.choice(len(catalog), 200, replace=False)
+        np.testing.assert_allclose(
+            index.scores_for(int(row), candidates), index.scores(int(row))[candidates], atol=1e-9
+        )
+
+
+def test_similar_excludes_query_and_is_sorted(catalog):
+    index = SimilarityIndex(catalog, FuzzyTitleIndex(catalog["title"]))
+    rows, scores = index.similar([5], 10, DEFAULT_WEIGHTS)
+    assert len(rows) == 10 and 5 not in rows
+    assert np.all(np.diff(scores) <= 0)
+    assert scores[0] == index.scores(5)[rows[0]]
+
+
+def test_similar_route(client):
+    response = client.get("/api/v1/ml/similar/1", params={"k": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["book_id"] == 1 and len(body["results"]) == 5
+    assert all(book["id"] != 1 for book in body["results"])
+
+    assert client.get("/api/v1/ml/similar/999999").status_code == 404
+    assert client.get("/api/v1/ml/similar/1", params={"k": 1000}).status_code == 422
@@ -0,0 +1,47 @@
+import time
+
+from api.core import auth
+from api.core.token_cache import VerifiedTokenCache
+from api.domain.auth.schemas import UserInDB
+
+USER = UserInDB(username="admin", hashed_password="x")
+
+
+def test_entry_never_outlives_token_exp(monkeypatch):
+    cache = VerifiedTokenCache(ttl_seconds=300)
+    now = time.time()
+    cache.put("token", USER, exp=now + 10, jti="a")
+    assert cache.get("token").user is USER
+
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_expired_token_is_not_cached():
+    cache = VerifiedTokenCache()
+    cache.put("token", USER, exp=time.time() - 1)
+    assert cache.get("token") is None
+
+
+def test_lru_bound():
+    cache = VerifiedTokenCache(max_entries=2)
+    exp = time.time() + 60
+    cache.put("a", USER, exp)
+    cache.put("b", USER, exp)
+    cache.get("a")
+    cache.put("c", USER, exp)
+
+    assert cache.peek("a") is not None and cache.peek("c") is not None
+    assert cache.peek("b") is None
+
+
+def test_get_current_user_uses_cache_after_first_verification(monkeypatch):
+    token = auth.create_access_token({"sub": "admin"})
+    assert auth.user_from_token(token).username == "admin"
+
+    def fail(_token):
+        raise AssertionError("token decoded again")
+
+    monkeypatch.setattr(auth, "decode_token", fail)
+    assert auth.user_from_token(token).username == "admin"
@@ -0,0 +1,176 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from api.core.tracing import (
+    NOOP_SPAN,
+    SPAN_KIND_SERVER,
+    STATUS_ERROR,
+    BatchSpanProcessor,
+    OTLPHttpSpanExporter,
+    Span,
+    Tracer,
+    TracingMiddleware,
+    current_traceparent,
+    parse_traceparent,
+    to_otlp_json,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class RecordingExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def exporter():
+    return RecordingExporter()
+
+
+@pytest.fixture
+def tracer(exporter):
+    tracer = Tracer(BatchSpanProcessor(exporter, flush_interval=0.05))
+    yield tracer
+    tracer.shutdown()
+
+
+def counter(name: str) -> float:
+    return REGISTRY.get_sample_value(name) or 0.0
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (f"00-{TRACE_ID}-{PARENT_ID}-01", (TRACE_ID, PARENT_ID, True)),
+        (f"00-{TRACE_ID}-{PARENT_ID}-00", (TRACE_ID, PARENT_ID, False)),
+        (f" 00-{TRACE_ID}-{PARENT_ID}-03 ", (TRACE_ID, PARENT_ID, True)),
+        (None, None),
+        ("", None),
+        (f"00-{TRACE_ID}-{PARENT_ID}", None),
+        (f"00-{TRACE_ID[:-1]}-{PARENT_ID}-01", None),
+        (f"00-{TRACE_ID}-{PARENT_ID}-zz", None),
+    ],
+)
+def test_parse_traceparent(value, expected):
+    assert parse_traceparent(value) == expected
+
+
+def test_remote_parent_is_continued_by_child_spans(tracer, exporter):
+    with tracer.start_span("request", traceparent=f"00-{TRACE_ID}-{PARENT_ID}-01") as root:
+        with tracer.start_span("query") as child:
+            assert current_traceparent() == f"00-{TRACE_ID}-{child.span_id}-01"
+    assert current_traceparent() is None
+    tracer.shutdown()
+
+    assert (root.trace_id, root.parent_id) == (TRACE_ID, PARENT_ID)
+    assert (child.trace_id, child.parent_id) == (TRACE_ID, root.span_id)
+    assert [span.name for span in exporter.spans] == ["query", "request"]
+
+
+@pytest.mark.parametrize(
+    "sample_rate,traceparent",
+    [(1.0, f"00-{TRACE_ID}-{PARENT_ID}-00"), (0.0, None)],
+)
+def test_unsampled_decision_is_inherited(exporter, sample_rate, traceparent):
+    tracer = Tracer(BatchSpanProcessor(exporter, flush_interval=0.05), sample_rate=sample_rate)
+    with tracer.start_span("request", traceparent=traceparent) as root:
+        with tracer.start_span("query") as child:
+            assert current_traceparent() is None
+    tracer.shutdown()
+
+    assert root is NOOP_SPAN and child is NOOP_SPAN
+    assert exporter.spans == []
+
+
+def test_errors_mark_the_span(tracer, exporter):
+    with pytest.raises(ValueError):
+        with tracer.start_span("query"):
+            raise ValueError("boom")
+    tracer.shutdown()
+    assert (exporter.spans[0].status, exporter.spans[0].status_message) == (STATUS_ERROR, "ValueError: boom")
+
+
+def test_otlp_json_shape():
+    root = Span("GET /books", TRACE_ID, None, SPAN_KIND_SERVER, {"ok": True, "count": 3, "ratio": 0.5, "path": "/books"})
+    child = Span("query", TRACE_ID, root.span_id, 1, {})
+    child.set_error(RuntimeError("db down"))
+    root.end_ns = child.end_ns = root.start_ns + 10
+
+    payload = to_otlp_json([root, child], "books-api")
+    resource = payload["resourceSpans"][0]
+    assert resource["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "books-api"}}]
+    first, second = resource["scopeSpans"][0]["spans"]
+
+    assert "parentSpanId" not in first
+    assert first["kind"] == SPAN_KIND_SERVER
+    assert first["startTimeUnixNano"] == str(root.start_ns)
+    assert first["attributes"] == [
+        {"key": "ok", "value": {"boolValue": True}},
+        {"key": "count", "value": {"intValue": "3"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "path", "value": {"stringValue": "/books"}},
+    ]
+    assert first["status"] == {"code": 0}
+    assert second["parentSpanId"] == root.span_id
+    assert second["status"] == {"code": STATUS_ERROR, "message": "RuntimeError: db down"}
+
+
+def test_full_queue_drops_spans():
+    exporting, release = threading.Event(), threading.Event()
+
+    class BlockingExporter:
+        def export(self, spans):
+            exporting.set()
+            release.wait(5)
+
+    processor = BatchSpanProcessor(BlockingExporter(), max_queue=1, flush_interval=0.05)
+    span = Span("query", TRACE_ID, None, 1, {})
+    before = counter("tracing_spans_dropped_total")
+
+    # O primeiro span prende a thread de exportação; o segundo ocupa a fila e os demais são descartados.
+    processor.submit(span)
+    assert exporting.wait(5)
+    for _ in range(4):
+        processor.submit(span)
+
+    assert counter("tracing_spans_dropped_total") == before + 3
+    release.set()
+    processor.shutdown()
+
+
+def test_exporter_failures_are_counted():
+    processor = BatchSpanProcessor(OTLPHttpSpanExporter("http://127.0.0.1:9", "books-api", timeout=1), flush_interval=0.05)
+    before = counter("tracing_spans_export_failed_total")
+    for _ in range(3):
+        processor.submit(Span("query", TRACE_ID, None, 1, {}))
+    processor.shutdown()
+
+    assert counter("tracing_spans_export_failed_total") == before + 3
+
+
+def test_middleware_continues_the_caller_trace(tracer, exporter):
+    app = FastAPI()
+
+    @app.get("/books/{book_id}")
+    def book(book_id: int):
+        return {"id": book_id}
+
+    middleware = TracingMiddleware(app)
+    middleware.tracer = tracer
+    response = TestClient(middleware).get("/books/1", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+    assert response.status_code == 200
+    tracer.shutdown()
+
+    (span,) = exporter.spans
+    assert (span.trace_id, span.parent_id, span.kind) == (TRACE_ID, PARENT_ID, SPAN_KIND_SERVER)
+    assert span.name == "GET /books/{book_id}"
+    assert span.attributes["http.status_code"] == 200